@@ -1,6 +1,12 @@
 from django.apps import AppConfig
+from django.db.models.signals import pre_migrate
 
 
 class FitnessConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.fitness'
+
+    def ready(self):
+        from apps.fitness import signals
+
+        pre_migrate.connect(signals.create_postgres_extensions, sender=self)
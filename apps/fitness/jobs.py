@@ -0,0 +1,29 @@
+# apps/fitness/jobs.py
+# Background job handlers, discovered by apps.jobs at startup.
+
+from uuid import UUID
+
+from apps.fitness.services.program_clone_service import (
+    CLONE_FOR_CLIENTS_JOB,
+    CLONE_PROGRAMS_JOB,
+    ProgramCloneService,
+)
+from apps.jobs.registry import job_handler
+
+
+@job_handler(CLONE_PROGRAMS_JOB)
+def clone_programs(job):
+    copies = ProgramCloneService.clone_programs(
+        job.created_by, [UUID(pk) for pk in job.payload['program_ids']]
+    )
+    return {'program_ids': [str(copy.id) for copy in copies]}
+
+
+@job_handler(CLONE_FOR_CLIENTS_JOB)
+def clone_program_for_clients(job):
+    copies = ProgramCloneService.clone_program_for_clients(
+        job.created_by,
+        UUID(job.payload['program_id']),
+        [UUID(pk) for pk in job.payload['client_ids']],
+    )
+    return {'programs': {str(client_id): str(copy.id) for client_id, copy in copies.items()}}
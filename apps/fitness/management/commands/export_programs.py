@@ -0,0 +1,43 @@
+import sys
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.fitness.services.program_exchange_service import FORMATS, ProgramExchangeService
+from config.utils.exceptions import AppException
+
+
+class Command(BaseCommand):
+    help = (
+        "Stream programs (sessions, workout exercises, exercise references) to a "
+        "file as NDJSON or MessagePack. Memory stays flat whatever the count."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--owner', required=True, help="Email of the user whose programs are exported")
+        parser.add_argument('--output', help="Output file (default: stdout)")
+        parser.add_argument('--format', choices=list(FORMATS), default='ndjson')
+        parser.add_argument('--ids', nargs='*', default=[], help="Only these program ids")
+        parser.add_argument('--batch-size', type=int, default=200)
+
+    def handle(self, *args, **options):
+        owner = get_user_model().objects.filter(email=options['owner']).first()
+        if not owner:
+            raise CommandError(f"No user with email {options['owner']}")
+
+        handle = open(options['output'], 'wb') if options['output'] else sys.stdout.buffer
+        records = 0
+        try:
+            for chunk in ProgramExchangeService.export_programs(
+                owner, options['ids'], options['format'], options['batch_size']
+            ):
+                handle.write(chunk)
+                records += 1
+        except AppException as e:
+            raise CommandError(str(e))
+        finally:
+            if options['output']:
+                handle.close()
+
+        # The header is a record too
+        self.stderr.write(self.style.SUCCESS(f"Exported {max(records - 1, 0)} programs"))
@@ -0,0 +1,123 @@
+import csv
+import json
+import os
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.fitness.services.exercise_import_service import ExerciseImporter
+from config.utils.exceptions import AppException
+
+
+class Command(BaseCommand):
+    help = (
+        "Stream an exercise library (CSV or JSONL) into the catalog in bulk batches. "
+        "Progress is checkpointed after every committed batch; re-running the same "
+        "command resumes after the last one."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help="CSV or JSONL file")
+        parser.add_argument('--owner', required=True, help="Email of the user owning the exercises")
+        parser.add_argument('--format', choices=['csv', 'jsonl'], help="Defaults to the file extension")
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument('--public', action='store_true', help="Default is_public for rows without the column")
+        parser.add_argument('--checkpoint', help="Checkpoint file (default: <path>.checkpoint)")
+        parser.add_argument('--restart', action='store_true', help="Ignore an existing checkpoint")
+        parser.add_argument('--max-errors', type=int, default=100, help="Abort after this many rejected rows")
+
+    # ---------------------------
+    # Input
+    # ---------------------------
+    def _rows(self, handle, fmt):
+        """CSV rows as dicts, JSONL rows as undecoded lines (see _decode)."""
+        if fmt == 'csv':
+            yield from csv.DictReader(handle)
+            return
+        for line in handle:
+            line = line.strip()
+            if line:
+                yield line
+
+    def _decode(self, row):
+        """Decoded inside the per-row error handling, so a bad line is one rejected row."""
+        if isinstance(row, dict):
+            return row
+        row = json.loads(row)
+        if not isinstance(row, dict):
+            raise ValueError("row is not a JSON object")
+        return row
+
+    # ---------------------------
+    # Checkpoint
+    # ---------------------------
+    def _load_checkpoint(self, path, source):
+        if not os.path.exists(path):
+            return 0
+        with open(path) as handle:
+            state = json.load(handle)
+        if state.get('source') != source:
+            raise CommandError(f"Checkpoint {path} belongs to {state.get('source')}; use --restart")
+        return state['row']
+
+    def _save_checkpoint(self, path, source, row, created):
+        tmp = f'{path}.tmp'
+        with open(tmp, 'w') as handle:
+            json.dump({'source': source, 'row': row, 'created': created}, handle)
+        os.replace(tmp, path)
+
+    def handle(self, *args, **options):
+        path = options['path']
+        source = os.path.abspath(path)
+        fmt = options['format'] or ('jsonl' if path.endswith(('.jsonl', '.ndjson')) else 'csv')
+        batch_size = options['batch_size']
+        checkpoint = options['checkpoint'] or f'{path}.checkpoint'
+
+        owner = get_user_model().objects.filter(email=options['owner']).first()
+        if not owner:
+            raise CommandError(f"No user with email {options['owner']}")
+
+        resume_after = 0 if options['restart'] else self._load_checkpoint(checkpoint, source)
+        if resume_after:
+            self.stdout.write(f"Resuming after row {resume_after}")
+
+        importer = ExerciseImporter(owner=owner, source=source, is_public=options['public'])
+
+        started = time.monotonic()
+        created = errors = 0
+        batch = []
+        last_row = checkpointed = resume_after
+
+        def flush():
+            nonlocal created, batch, checkpointed
+            if batch:
+                created += importer.write(batch)
+                batch = []
+            self._save_checkpoint(checkpoint, source, last_row, created)
+            checkpointed = last_row
+
+            elapsed = time.monotonic() - started
+            rate = (last_row - resume_after) / elapsed if elapsed else 0
+            self.stdout.write(f"row {last_row}: {created} created, {errors} rejected ({rate:.0f} rows/s)")
+
+        with open(path, newline='', encoding='utf-8') as handle:
+            for row_number, row in enumerate(self._rows(handle, fmt), start=1):
+                if row_number <= resume_after:
+                    continue
+                try:
+                    batch.append(importer.build(self._decode(row), row_number))
+                except (AppException, ValueError) as e:
+                    errors += 1
+                    self.stderr.write(f"row {row_number}: {e}")
+                    if errors > options['max_errors']:
+                        raise CommandError(f"Too many rejected rows; resume point is row {checkpointed}")
+                last_row = row_number
+
+                if len(batch) >= batch_size:
+                    flush()
+
+        flush()
+        self.stdout.write(self.style.SUCCESS(
+            f"Imported {created} exercises in {time.monotonic() - started:.1f}s ({errors} rejected)"
+        ))
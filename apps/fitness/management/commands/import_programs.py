@@ -0,0 +1,36 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.fitness.services.program_exchange_service import FORMATS, ProgramExchangeService
+from config.utils.exceptions import AppException
+
+
+class Command(BaseCommand):
+    help = (
+        "Stream an export_programs file into private copies owned by --owner, "
+        "bulk-inserting a batch of programs per transaction."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help="NDJSON or MessagePack export")
+        parser.add_argument('--owner', required=True, help="Email of the user receiving the programs")
+        parser.add_argument('--format', choices=list(FORMATS), help="Defaults to the file extension")
+        parser.add_argument('--batch-size', type=int, default=100)
+
+    def handle(self, *args, **options):
+        path = options['path']
+        fmt = options['format'] or ('msgpack' if path.endswith(('.msgpack', '.mpk')) else 'ndjson')
+
+        owner = get_user_model().objects.filter(email=options['owner']).first()
+        if not owner:
+            raise CommandError(f"No user with email {options['owner']}")
+
+        with open(path, 'rb') as handle:
+            try:
+                created = ProgramExchangeService.import_programs(
+                    owner, ProgramExchangeService.decode(handle, fmt), options['batch_size']
+                )
+            except AppException as e:
+                raise CommandError(str(e))
+
+        self.stdout.write(self.style.SUCCESS(f"Imported {created} programs"))
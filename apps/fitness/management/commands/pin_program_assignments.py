@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from apps.fitness.services.program_version_service import ProgramVersionService
+
+
+class Command(BaseCommand):
+    help = (
+        "Pin assignments created before program versioning to the current "
+        "version of their program. Until then clients read the live program."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=200)
+
+    def handle(self, *args, **options):
+        count = ProgramVersionService.pin_missing(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f"Pinned {count} assignments"))
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from apps.fitness.services.sync_service import SYNC_TOMBSTONE_RETENTION, SyncService
+
+
+class Command(BaseCommand):
+    help = (
+        f"Delete sync tombstones older than {SYNC_TOMBSTONE_RETENTION.days} days "
+        "(clients with older cursors get a full resync)"
+    )
+
+    def handle(self, *args, **options):
+        count = SyncService.prune()
+        self.stdout.write(self.style.SUCCESS(f"Pruned {count} tombstones"))
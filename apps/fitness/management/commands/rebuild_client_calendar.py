@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from apps.fitness.models.workout import ProgramAssignment
+from apps.fitness.services.client_calendar_service import ClientCalendarService
+
+
+class Command(BaseCommand):
+    help = "Rebuild the scheduled sessions of active assignments (pinning a version where missing)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--client', help="Only this client's assignments (user id)")
+
+    def handle(self, *args, **options):
+        assignments = ProgramAssignment.objects.filter(is_active=True)
+        if options['client']:
+            assignments = assignments.filter(client_id=options['client'])
+
+        count = ClientCalendarService.rebuild(assignments)
+        self.stdout.write(self.style.SUCCESS(f"Rescheduled {count} assignments"))
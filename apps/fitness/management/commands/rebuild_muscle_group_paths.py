@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from apps.fitness.models.workout import MuscleGroup
+from apps.fitness.services.exercise_facet_service import EXERCISE_CATALOG_VERSION
+from apps.fitness.services.taxonomy_cache import TaxonomyCache
+
+
+class Command(BaseCommand):
+    help = "Recompute materialized muscle group paths from the parent hierarchy"
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            count = MuscleGroup.rebuild_paths()
+            # bulk_update sends no signals
+            TaxonomyCache.invalidate(MuscleGroup)
+            transaction.on_commit(EXERCISE_CATALOG_VERSION.bump)
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt paths for {count} muscle groups"))
@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+
+from apps.fitness.models.workout_log import WorkoutLog
+from apps.fitness.services.training_rollup_service import TrainingRollupService
+
+
+class Command(BaseCommand):
+    help = "Recompute the training volume rollups and personal records from the performed sets"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--client', help="Only this client (user id)")
+        parser.add_argument('--batch-size', type=int, default=200, help="Clients per transaction")
+
+    def handle(self, *args, **options):
+        if options['client']:
+            client_ids = [options['client']]
+        else:
+            client_ids = list(WorkoutLog.objects.values_list('client_id', flat=True).distinct().order_by())
+
+        size = options['batch_size']
+        count = 0
+        for offset in range(0, len(client_ids), size):
+            count += TrainingRollupService.rebuild(client_ids[offset:offset + size])
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt the rollups of {count} clients"))
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from apps.fitness.services.exercise_service import ExerciseService
+
+
+class Command(BaseCommand):
+    help = "Recompute the full-text search vector of every exercise"
+
+    def handle(self, *args, **options):
+        updated = ExerciseService.refresh_search_vectors()
+        self.stdout.write(self.style.SUCCESS(f"Refreshed search vectors for {updated} exercises"))
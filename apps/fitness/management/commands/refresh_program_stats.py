@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand
+
+from apps.fitness.models.workout import WorkoutProgram
+from apps.fitness.services.program_marketplace_service import ProgramMarketplaceService
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute the denormalized marketplace stats (assignment, session and "
+        "rating counters) of every program, in id-ordered batches."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        programs = WorkoutProgram.objects.order_by('id').values_list('id', flat=True)
+
+        total = 0
+        last_id = None
+        while True:
+            page = programs.filter(id__gt=last_id) if last_id else programs
+            ids = list(page[:batch_size])
+            if not ids:
+                break
+            total += ProgramMarketplaceService.refresh_stats(ids)
+            last_id = ids[-1]
+
+        self.stdout.write(self.style.SUCCESS(f"Refreshed stats of {total} programs"))
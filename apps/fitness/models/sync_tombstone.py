@@ -0,0 +1,41 @@
+from django.conf import settings
+from django.db import models
+
+
+class SyncTombstone(models.Model):
+    """
+    A deleted (or, for assignments, deactivated) row, kept so offline
+    clients learn about it on their next delta sync. Pruned after
+    SYNC_TOMBSTONE_RETENTION; older sync cursors get a full resync.
+    """
+
+    class Kind(models.TextChoices):
+        PROGRAM = "program", "Program"
+        SESSION = "session", "Session"
+        WORKOUT_EXERCISE = "workout_exercise", "Workout exercise"
+        EXERCISE = "exercise", "Exercise"
+        ASSIGNMENT = "assignment", "Assignment"
+
+    kind = models.CharField(max_length=20, choices=Kind.choices)
+    object_id = models.CharField(max_length=64)
+    # Program the row belonged to; not a foreign key, the program may be gone too
+    program_id = models.UUIDField(null=True, blank=True)
+    # Who must hear about it even when the program is out of their scope
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name='sync_tombstones'
+    )
+    deleted_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['user', 'deleted_at'], name='tombstone_user_recent'),
+            models.Index(fields=['program_id', 'deleted_at'], name='tombstone_program_recent'),
+            models.Index(fields=['deleted_at'], name='tombstone_deleted_at'),
+        ]
+
+    def __str__(self):
+        return f"{self.kind} {self.object_id} deleted {self.deleted_at}"
@@ -7,6 +7,12 @@
 # •	WorkoutExercise = how that exercise is performed in this session
 
 from django.db import models
+from django.core.exceptions import ValidationError
+from django.core.validators import MaxValueValidator, MinValueValidator
+from django.db.models import TextField
+from django.db.models.functions import Cast, Concat, Substr
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVector, SearchVectorField
 from uuid import uuid4
 from django.utils.text import slugify
 from django.conf import settings
@@ -79,7 +85,25 @@ class Equipment(models.Model):
         return self.title
 
 
+class MuscleGroupQuerySet(models.QuerySet):
+
+    def subtree(self, root_ids):
+        """Groups under any of `root_ids` (roots included), one indexed prefix scan each."""
+        paths = MuscleGroup.objects.filter(id__in=root_ids).values_list('path', flat=True)
+        condition = models.Q()
+        for path in paths:
+            condition |= models.Q(path__startswith=path)
+        return self.filter(condition) if condition else self.none()
+
+
 class MuscleGroup(models.Model):
+    """
+    Hierarchy kept twice: `parent` (adjacency list) is the source of truth and
+    `path` ("legs/quads/") is the materialized copy used for subtree queries.
+    `path` is maintained on save, including every descendant when a group moves.
+    """
+    PATH_SEPARATOR = '/'
+
     id = models.CharField(max_length=24, primary_key=True)
     title = models.CharField(max_length=255)
     parent = models.ForeignKey(
@@ -88,6 +112,57 @@ class MuscleGroup(models.Model):
         on_delete=models.CASCADE,
         related_name='subgroups'
     )
+    path = models.CharField(max_length=255, blank=True, db_index=True, editable=False)
+    depth = models.PositiveSmallIntegerField(default=0, editable=False)
+
+    objects = MuscleGroupQuerySet.as_manager()
+
+    def save(self, *args, **kwargs):
+        parent_path, parent_depth = '', -1
+        if self.parent_id:
+            parent_path, parent_depth = MuscleGroup.objects.filter(
+                pk=self.parent_id
+            ).values_list('path', 'depth').get()
+
+        separator = self.PATH_SEPARATOR
+        if f'{separator}{self.pk}{separator}' in f'{separator}{parent_path}':
+            raise ValidationError("A muscle group cannot be moved under its own subtree")
+
+        old = MuscleGroup.objects.filter(pk=self.pk).values_list('path', 'depth').first()
+
+        self.path = f'{parent_path}{self.pk}{separator}'
+        self.depth = parent_depth + 1
+        if kwargs.get('update_fields') is not None:
+            kwargs['update_fields'] = {*kwargs['update_fields'], 'path', 'depth'}
+        super().save(*args, **kwargs)
+
+        if old and old[0] and old[0] != self.path:
+            old_path, old_depth = old
+            MuscleGroup.objects.filter(
+                path__startswith=old_path
+            ).exclude(pk=self.pk).update(
+                path=Concat(models.Value(self.path), Substr('path', len(old_path) + 1)),
+                depth=models.F('depth') + (self.depth - old_depth),
+            )
+
+    @classmethod
+    def rebuild_paths(cls):
+        """Recompute every path from the adjacency list (backfill / repair)."""
+        groups = {group.pk: group for group in cls.objects.all()}
+
+        def resolve(group, seen=()):
+            if group.pk in seen:
+                raise ValidationError(f"Cycle detected at muscle group {group.pk}")
+            parent = groups.get(group.parent_id)
+            if parent is None:
+                return f'{group.pk}{cls.PATH_SEPARATOR}'
+            return f'{resolve(parent, (*seen, group.pk))}{group.pk}{cls.PATH_SEPARATOR}'
+
+        for group in groups.values():
+            group.path = resolve(group)
+            group.depth = group.path.count(cls.PATH_SEPARATOR) - 1
+        cls.objects.bulk_update(groups.values(), ['path', 'depth'])
+        return len(groups)
 
     def __str__(self):
         return self.title
@@ -104,7 +179,27 @@ class TrainingSystem(models.Model):
 # --------------------------------
 # Exercise Models
 
+EXERCISE_SEARCH_CONFIG = 'english'
+
+
+def exercise_search_vector():
+    """Weighted document for full-text search: name > slug > instructions."""
+    return (
+        SearchVector('name', weight='A', config=EXERCISE_SEARCH_CONFIG)
+        + SearchVector('slug', weight='B', config=EXERCISE_SEARCH_CONFIG)
+        + SearchVector(Cast('instructions', TextField()), weight='C', config=EXERCISE_SEARCH_CONFIG)
+    )
+
+
 class Exercise(models.Model):
+    SEARCH_FIELDS = ('name', 'slug', 'instructions')
+
+    class Meta:
+        indexes = [
+            GinIndex(fields=['search_vector'], name='exercise_search_vector_gin'),
+            GinIndex(fields=['name'], name='exercise_name_trgm', opclasses=['gin_trgm_ops']),
+            models.Index(fields=['name', 'id'], name='exercise_name_keyset'),
+        ]
 
     id = models.UUIDField(primary_key=True, default=uuid4, editable=False)
     name = models.CharField(max_length=255, blank=True, default='')
@@ -151,24 +246,29 @@ class Exercise(models.Model):
     is_multiple_exercise = models.BooleanField(default=False)
     popularity = models.PositiveIntegerField(default=0)
     is_verified = models.BooleanField(default=False)
+    search_vector = SearchVectorField(null=True, editable=False)
 
     def save(self, *args, **kwargs):
         if not self.slug:
             self.slug = slugify(self.name)
         super().save(*args, **kwargs)
 
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None or set(update_fields) & set(self.SEARCH_FIELDS):
+            Exercise.objects.filter(pk=self.pk).update(search_vector=exercise_search_vector())
+
     def __str__(self):
         return self.name
 
 
 class ExerciseImage(models.Model):
     exercise = models.ForeignKey(Exercise, on_delete=models.CASCADE, related_name='images')
-    image_file = models.FileField(upload_to=exercise_image_upload_to)
+    image_file = models.FileField(upload_to=exercise_image_upload_to, max_length=255)
 
 
 class ExerciseVideo(models.Model):
     exercise = models.ForeignKey(Exercise, on_delete=models.CASCADE, related_name='videos')
-    video_file = models.FileField(upload_to=exercise_video_upload_to)
+    video_file = models.FileField(upload_to=exercise_video_upload_to, max_length=255)
 
 
 class ExerciseMuscleGroup(models.Model):
@@ -193,7 +293,31 @@ class ExerciseMuscleGroup(models.Model):
 # --------------------------------
 # Workout Program Models
 
+# Programs listed on the marketplace; the partial indexes below cover only these rows
+MARKETPLACE_PROGRAMS = models.Q(is_public=True, is_published=True, is_active=True, is_custom=False)
+
+
 class WorkoutProgram(models.Model):
+    class Meta:
+        indexes = [
+            models.Index(fields=['created_by', '-created_at', '-id'], name='program_owner_recent'),
+            # marketplace sorts (keyset pagination on each ordering)
+            models.Index(
+                fields=['-assignment_count', '-id'], name='program_market_popular', condition=MARKETPLACE_PROGRAMS
+            ),
+            models.Index(
+                fields=['-created_at', '-id'], name='program_market_newest', condition=MARKETPLACE_PROGRAMS
+            ),
+            models.Index(
+                fields=['-rating_avg', '-rating_count', '-id'], name='program_market_rating',
+                condition=MARKETPLACE_PROGRAMS
+            ),
+            # the common "level + goal" browse, already in popularity order
+            models.Index(
+                fields=['level', 'goal', '-assignment_count', '-id'], name='program_market_level_goal',
+                condition=MARKETPLACE_PROGRAMS
+            ),
+        ]
 
     id = models.UUIDField(primary_key=True, default=uuid4, editable=False)
     title = models.CharField(max_length=255, blank=True, default='')
@@ -216,10 +340,16 @@ class WorkoutProgram(models.Model):
     is_custom = models.BooleanField(default=False)
     is_verified = models.BooleanField(default=False)
 
-    video = models.FileField(upload_to=program_video_upload_to, blank=True, null=True)
+    video = models.FileField(upload_to=program_video_upload_to, blank=True, null=True, max_length=255)
     location = models.CharField(max_length=255, blank=True)
     equipment = models.CharField(max_length=255, blank=True)
 
+    # Denormalized stats, kept by ProgramMarketplaceService (bump_stats / refresh_stats)
+    assignment_count = models.PositiveIntegerField(default=0)
+    session_count = models.PositiveIntegerField(default=0)
+    rating_count = models.PositiveIntegerField(default=0)
+    rating_avg = models.FloatField(default=0)
+
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -232,9 +362,51 @@ class WorkoutProgram(models.Model):
         return self.title
 
 
+class ProgramReview(models.Model):
+    program = models.ForeignKey(WorkoutProgram, on_delete=models.CASCADE, related_name='reviews')
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='program_reviews')
+    rating = models.PositiveSmallIntegerField(validators=[MinValueValidator(1), MaxValueValidator(5)])
+    comment = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['-created_at']
+        constraints = [
+            models.UniqueConstraint(fields=['program', 'user'], name='unique_program_review'),
+        ]
+
+    def __str__(self):
+        return f"{self.program_id} rated {self.rating} by {self.user_id}"
+
+
 class WorkoutProgramImage(models.Model):
     program = models.ForeignKey(WorkoutProgram, on_delete=models.CASCADE, related_name='images')
-    image_file = models.FileField(upload_to=program_image_upload_to)
+    image_file = models.FileField(upload_to=program_image_upload_to, max_length=255)
+
+
+class ProgramVersion(models.Model):
+    """
+    Immutable snapshot of a program (sessions + exercises) frozen on publish
+    or assignment. `document` is zlib-compressed JSON; media are stored as
+    storage names and signed when the version is read.
+    """
+    id = models.UUIDField(primary_key=True, default=uuid4, editable=False)
+    program = models.ForeignKey(WorkoutProgram, on_delete=models.CASCADE, related_name='versions')
+    number = models.PositiveIntegerField()
+    document = models.BinaryField()
+    checksum = models.CharField(max_length=64)
+    created_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, related_name='+')
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['program', '-number']
+        constraints = [
+            models.UniqueConstraint(fields=['program', 'number'], name='unique_program_version_number'),
+        ]
+
+    def __str__(self):
+        return f"{self.program_id} v{self.number}"
 
 
 class ProgramAssignment(models.Model):
@@ -254,6 +426,14 @@ class ProgramAssignment(models.Model):
         null=True,
         related_name='program_assignments'
     )
+    # Frozen content the client follows; edits to the live program don't reach it
+    program_version = models.ForeignKey(
+        ProgramVersion,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='assignments'
+    )
     coach_service_request = models.OneToOneField(   # 🔒 one request → one assignment
         CoachServiceRequest,
         on_delete=models.SET_NULL,
@@ -263,10 +443,15 @@ class ProgramAssignment(models.Model):
     )
 
     assigned_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
     is_active = models.BooleanField(default=True)
 
     class Meta:
         ordering = ['-assigned_at']
+        indexes = [
+            # keyset pagination of a client's assignments / history
+            models.Index(fields=['client', '-assigned_at', '-id'], name='assignment_client_recent'),
+        ]
         constraints = [
             models.UniqueConstraint(
                 fields=['client', 'program'],
@@ -279,9 +464,44 @@ class ProgramAssignment(models.Model):
         return f"{self.client} → {self.program}"
 
 
+class ScheduledSession(models.Model):
+    """
+    One dated session of a client's calendar, laid out from the program
+    version an assignment is pinned to. Rows are rebuilt whenever the
+    assignment is (re)pinned and removed when it is deactivated, so a
+    calendar read is a range scan on (client, date).
+    """
+    assignment = models.ForeignKey(ProgramAssignment, on_delete=models.CASCADE, related_name='scheduled_sessions')
+    client = models.ForeignKey(User, on_delete=models.CASCADE, related_name='scheduled_sessions')
+    program = models.ForeignKey(WorkoutProgram, on_delete=models.CASCADE, related_name='+')
+    # Session of the pinned version document; the live row may be gone
+    session_id = models.UUIDField()
+    title = models.CharField(max_length=255, blank=True)
+    week_number = models.PositiveIntegerField(default=1)
+    is_rest_day = models.BooleanField(default=False)
+    date = models.DateField()
+    position = models.PositiveSmallIntegerField(default=0)  # order within the week
+
+    class Meta:
+        ordering = ['date', 'assignment', 'position']
+        indexes = [
+            models.Index(fields=['client', 'date'], name='schedule_client_date'),
+        ]
+        constraints = [
+            models.UniqueConstraint(fields=['assignment', 'session_id'], name='unique_scheduled_session'),
+        ]
+
+    def __str__(self):
+        return f"{self.client_id} {self.date}: {self.title}"
+
+
 class WorkoutSession(models.Model):
     class Meta:
         ordering = ['week_number', 'created_at']
+        indexes = [
+            # a program's sessions in list order; id makes keyset positions unique
+            models.Index(fields=['program', 'week_number', 'created_at', 'id'], name='session_program_order'),
+        ]
 
     @property
     def all_images(self):
@@ -303,7 +523,7 @@ class WorkoutSession(models.Model):
     duration = models.CharField(max_length=50, blank=True)
     intensity = models.CharField(max_length=50, blank=True)
     popularity = models.PositiveIntegerField(default=0)
-    video = models.FileField(upload_to=session_video_upload_to, blank=True, null=True)
+    video = models.FileField(upload_to=session_video_upload_to, blank=True, null=True, max_length=255)
 
     is_public = models.BooleanField(default=False)
     is_rest_day = models.BooleanField(default=False)
@@ -322,12 +542,15 @@ class WorkoutSession(models.Model):
 
 class SessionImage(models.Model):
     session = models.ForeignKey(WorkoutSession, on_delete=models.CASCADE, related_name='images')
-    image_file = models.FileField(upload_to=session_image_upload_to)
+    image_file = models.FileField(upload_to=session_image_upload_to, max_length=255)
 
 
 class WorkoutExercise(models.Model):
     class Meta:
-        ordering = ['id']
+        ordering = ['position', 'id']
+        indexes = [
+            models.Index(fields=['session', 'position', 'id'], name='workout_exercise_order'),
+        ]
 
     id = models.UUIDField(primary_key=True, default=uuid4, editable=False)
     session = models.ForeignKey(WorkoutSession, on_delete=models.CASCADE, related_name='exercises')
@@ -337,6 +560,9 @@ class WorkoutExercise(models.Model):
     duration = models.CharField(max_length=50, blank=True)
     rest_time = models.CharField(max_length=50, blank=True)
     tempo = models.CharField(max_length=50, blank=True)
+    # Order within the session
+    position = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
 
     def __str__(self):
         return f"{self.exercise.name} - {self.sets}x{self.reps}"
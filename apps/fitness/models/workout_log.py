@@ -0,0 +1,163 @@
+from uuid import uuid4
+
+from django.conf import settings
+from django.core.validators import MaxValueValidator, MinValueValidator
+from django.db import models
+
+
+class WorkoutLog(models.Model):
+    """
+    A session the client actually trained. Ids are generated on the phone,
+    so an offline batch can be uploaded again without creating duplicates.
+    """
+    id = models.UUIDField(primary_key=True, default=uuid4, editable=False)
+    client = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='workout_logs'
+    )
+    session = models.ForeignKey(
+        'fitness.WorkoutSession',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='logs'
+    )
+    started_at = models.DateTimeField(null=True, blank=True)
+    completed_at = models.DateTimeField()
+    notes = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['-completed_at']
+        indexes = [
+            models.Index(fields=['client', '-completed_at', '-id'], name='workout_log_client_recent'),
+        ]
+
+    def __str__(self):
+        return f"{self.client_id} {self.completed_at:%Y-%m-%d}"
+
+
+class PerformedSet(models.Model):
+    """One set as performed, next to what was prescribed (workout_exercise)."""
+    id = models.UUIDField(primary_key=True, default=uuid4, editable=False)
+    log = models.ForeignKey(WorkoutLog, on_delete=models.CASCADE, related_name='sets')
+    # Denormalized from the log for per-client time-range reads without a join
+    client = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='performed_sets'
+    )
+    workout_exercise = models.ForeignKey(
+        'fitness.WorkoutExercise',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='performed_sets'
+    )
+    # Kept when the prescription is edited away
+    exercise = models.ForeignKey('fitness.Exercise', on_delete=models.CASCADE, related_name='performed_sets')
+
+    set_number = models.PositiveSmallIntegerField()
+    reps = models.PositiveSmallIntegerField(null=True, blank=True)
+    weight = models.DecimalField(max_digits=6, decimal_places=2, null=True, blank=True)  # kg
+    rpe = models.DecimalField(
+        max_digits=3, decimal_places=1, null=True, blank=True,
+        validators=[MinValueValidator(1), MaxValueValidator(10)]
+    )
+    duration_seconds = models.PositiveIntegerField(null=True, blank=True)
+    performed_at = models.DateTimeField()
+
+    class Meta:
+        ordering = ['performed_at', 'set_number']
+        indexes = [
+            models.Index(fields=['client', 'performed_at'], name='performed_set_client_time'),
+            models.Index(fields=['client', 'exercise', 'performed_at'], name='performed_set_client_exercise'),
+        ]
+
+    def __str__(self):
+        return f"{self.exercise_id} set {self.set_number}: {self.reps} x {self.weight}"
+
+
+# --------------------------------
+# Rollups (maintained by TrainingRollupService)
+# --------------------------------
+class ExerciseDailyVolume(models.Model):
+    """Per client, exercise and day totals of the performed sets; volume is sum(weight x reps)."""
+    client = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='exercise_daily_volumes'
+    )
+    exercise = models.ForeignKey('fitness.Exercise', on_delete=models.CASCADE, related_name='daily_volumes')
+    day = models.DateField()
+    set_count = models.PositiveIntegerField(default=0)
+    rep_count = models.PositiveIntegerField(default=0)
+    volume = models.DecimalField(max_digits=12, decimal_places=2, default=0)  # kg
+    duration_seconds = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['client', 'exercise', 'day'], name='exercise_daily_volume_unique'),
+        ]
+        indexes = [
+            models.Index(fields=['client', 'day'], name='exercise_daily_volume_day'),
+        ]
+
+    def __str__(self):
+        return f"{self.client_id} {self.exercise_id} {self.day}: {self.volume}"
+
+
+class MuscleGroupWeeklyVolume(models.Model):
+    """
+    Per client, muscle group and week (starting Monday) totals, through the
+    exercise's ExerciseMuscleGroup entries. A set counts for every muscle
+    group of its exercise; primary_set_count only for the primary ones.
+    """
+    client = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='muscle_group_weekly_volumes'
+    )
+    muscle_group = models.ForeignKey('fitness.MuscleGroup', on_delete=models.CASCADE, related_name='weekly_volumes')
+    week = models.DateField()
+    set_count = models.PositiveIntegerField(default=0)
+    primary_set_count = models.PositiveIntegerField(default=0)
+    volume = models.DecimalField(max_digits=12, decimal_places=2, default=0)  # kg
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['client', 'muscle_group', 'week'], name='muscle_group_weekly_unique'),
+        ]
+        indexes = [
+            models.Index(fields=['client', 'week'], name='muscle_group_weekly_week'),
+        ]
+
+    def __str__(self):
+        return f"{self.client_id} {self.muscle_group_id} {self.week}: {self.set_count} sets"
+
+
+class PersonalRecord(models.Model):
+    """Best performances of a client on an exercise; only ever moves up."""
+    client = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='personal_records'
+    )
+    exercise = models.ForeignKey('fitness.Exercise', on_delete=models.CASCADE, related_name='personal_records')
+    max_weight = models.DecimalField(max_digits=6, decimal_places=2, null=True, blank=True)
+    max_weight_reps = models.PositiveSmallIntegerField(null=True, blank=True)
+    max_weight_at = models.DateTimeField(null=True, blank=True)
+    # Estimated one-rep max (Epley)
+    best_e1rm = models.DecimalField(max_digits=7, decimal_places=2, null=True, blank=True)
+    best_e1rm_at = models.DateTimeField(null=True, blank=True)
+    max_reps = models.PositiveSmallIntegerField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['client', 'exercise'], name='personal_record_unique'),
+        ]
+
+    def __str__(self):
+        return f"{self.client_id} {self.exercise_id}: {self.max_weight} x {self.max_weight_reps}"
@@ -1,19 +1,20 @@
 from rest_framework import serializers
-from apps.fitness.models.workout import WorkoutSession
+from apps.fitness.models.workout import ScheduledSession
 
 
-class ClientWorkoutSessionSerializer(serializers.ModelSerializer):
+class ScheduledSessionSerializer(serializers.ModelSerializer):
     program_title = serializers.CharField(source="program.title", read_only=True)
 
     class Meta:
-        model = WorkoutSession
+        model = ScheduledSession
         fields = [
-            "id",
-            "title",
+            "date",
+            "assignment",
             "program",
             "program_title",
+            "session_id",
+            "title",
             "week_number",
-            "duration",
-            "intensity",
             "is_rest_day",
+            "position",
         ]
@@ -1,11 +1,15 @@
 # apps/fitness/serializers/exercise.py
 
 from rest_framework import serializers
+from apps.fitness.services.media_url_service import MediaUrlService
+from apps.fitness.services.popularity_service import exercise_popularity
+from apps.fitness.services.taxonomy_cache import TaxonomyCache
 from apps.fitness.models.workout import (
     Exercise,
     ExerciseImage,
     ExerciseVideo,
     ExerciseMuscleGroup,
+    MuscleGroup,
 )
 
 
@@ -22,10 +26,7 @@ class ExerciseVideoSerializer(serializers.ModelSerializer):
 
 
 class ExerciseMuscleGroupSerializer(serializers.ModelSerializer):
-    muscle_group_title = serializers.CharField(
-        source='muscle_group.title',
-        read_only=True
-    )
+    muscle_group_title = serializers.SerializerMethodField()
 
     class Meta:
         model = ExerciseMuscleGroup
@@ -35,6 +36,27 @@ class ExerciseMuscleGroupSerializer(serializers.ModelSerializer):
             'is_primary',
         ]
 
+    def get_muscle_group_title(self, obj):
+        return TaxonomyCache.title(MuscleGroup, obj.muscle_group_id)
+
+
+def exercise_media_names(exercises):
+    """Storage names of every image and video of `exercises` (prefetched relations)."""
+    names = []
+    for exercise in exercises:
+        names.extend(img.image_file.name for img in exercise.images.all())
+        names.extend(vid.video_file.name for vid in exercise.videos.all())
+    return names
+
+
+class ExerciseListSerializer(serializers.ListSerializer):
+    """Resolves the media URLs of the whole list in one batch before rendering."""
+
+    def to_representation(self, data):
+        exercises = data.all() if hasattr(data, 'all') else data
+        MediaUrlService.urls(exercise_media_names(exercises))
+        return super().to_representation(exercises)
+
 
 class ExerciseSerializer(serializers.ModelSerializer):
     images = serializers.SerializerMethodField()
@@ -67,9 +89,28 @@ class ExerciseSerializer(serializers.ModelSerializer):
             'updated_at',
         ]
         read_only_fields = ['id', 'slug', 'created_at', 'updated_at']
+        list_serializer_class = ExerciseListSerializer
 
     def get_images(self, obj):
-        return [img.image_file.url for img in obj.images.all()]
+        urls = MediaUrlService.urls([img.image_file.name for img in obj.images.all()])
+        return [urls[img.image_file.name] for img in obj.images.all() if img.image_file.name]
 
     def get_videos(self, obj):
-        return [vid.video_file.url for vid in obj.videos.all()]
+        urls = MediaUrlService.urls([vid.video_file.name for vid in obj.videos.all()])
+        return [urls[vid.video_file.name] for vid in obj.videos.all() if vid.video_file.name]
+
+
+class ExercisePopularitySerializer(ExerciseSerializer):
+    """
+    ExerciseSerializer plus the live popularity. Popularity moves on every
+    view without touching updated_at, so it is kept out of the cached and
+    ETag-validated documents and only served by uncached listings.
+    """
+    popularity = serializers.SerializerMethodField()
+
+    class Meta(ExerciseSerializer.Meta):
+        fields = ExerciseSerializer.Meta.fields + ['popularity']
+
+    def get_popularity(self, obj):
+        # stored value + increments not flushed yet
+        return obj.popularity + exercise_popularity.pending(obj.pk)
@@ -0,0 +1,16 @@
+from rest_framework import serializers
+from apps.fitness.services.media_url_service import MediaUrlService
+
+
+class MediaUrlField(serializers.Field):
+    """Read-only file URL resolved through MediaUrlService instead of FieldFile.url."""
+
+    def __init__(self, **kwargs):
+        kwargs['read_only'] = True
+        super().__init__(**kwargs)
+
+    def get_attribute(self, instance):
+        return super().get_attribute(instance) or None
+
+    def to_representation(self, value):
+        return MediaUrlService.url(value)
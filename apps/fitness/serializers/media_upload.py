@@ -0,0 +1,28 @@
+from rest_framework import serializers
+from apps.account.models import User
+from apps.fitness.services.media_upload_service import UPLOAD_TARGETS
+
+
+class MediaUploadSerializer(serializers.Serializer):
+    target = serializers.ChoiceField(choices=list(UPLOAD_TARGETS))
+    # exercise, program or session the file belongs to (not used by profile_picture)
+    object_id = serializers.UUIDField(required=False)
+    filename = serializers.CharField(max_length=200)
+    content_type = serializers.CharField(max_length=100)
+    size = serializers.IntegerField(min_value=1)
+
+    def validate(self, attrs):
+        if UPLOAD_TARGETS[attrs['target']]['parent'] is not User and 'object_id' not in attrs:
+            raise serializers.ValidationError(f"{attrs['target']} requires object_id.")
+        return attrs
+
+
+class UploadedPartSerializer(serializers.Serializer):
+    number = serializers.IntegerField(min_value=1, max_value=10000)
+    etag = serializers.CharField(max_length=200)
+
+
+class MediaUploadConfirmSerializer(serializers.Serializer):
+    token = serializers.CharField()
+    # multipart uploads: the ETag returned for every part
+    parts = UploadedPartSerializer(many=True, required=False, allow_empty=False)
@@ -15,6 +15,7 @@ class ProgramAssignmentSerializer(serializers.ModelSerializer):
             "client",
             "program",
             "program_title",
+            "program_version",
             "coach",
             "coach_name",
             "coach_service_request",
@@ -0,0 +1,13 @@
+from rest_framework import serializers
+from apps.fitness.models.workout_log import PersonalRecord
+
+
+class PersonalRecordSerializer(serializers.ModelSerializer):
+    exercise_name = serializers.CharField(source='exercise.name', read_only=True)
+
+    class Meta:
+        model = PersonalRecord
+        fields = [
+            'exercise', 'exercise_name', 'max_weight', 'max_weight_reps', 'max_weight_at',
+            'best_e1rm', 'best_e1rm_at', 'max_reps', 'updated_at'
+        ]
@@ -22,5 +22,44 @@ class WorkoutExerciseSerializer(serializers.ModelSerializer):
             'duration',
             'rest_time',
             'tempo',
+            'position',
         ]
         read_only_fields = ['id']
+
+
+MAX_OPERATIONS = 200
+REQUIRED_OPERATION_FIELDS = {
+    'add': ('exercise_id', 'sets', 'reps'),
+    'update': ('id',),
+    'delete': ('id',),
+    'reorder': ('ids',),
+}
+
+
+class WorkoutExerciseOperationSerializer(serializers.Serializer):
+    op = serializers.ChoiceField(choices=list(REQUIRED_OPERATION_FIELDS))
+    # add: optional client generated id; update / delete: the row
+    id = serializers.UUIDField(required=False)
+    # reorder: every exercise of the session, in the new order
+    ids = serializers.ListField(child=serializers.UUIDField(), required=False, allow_empty=False)
+    exercise_id = serializers.UUIDField(required=False)
+    sets = serializers.IntegerField(min_value=0, required=False)
+    reps = serializers.IntegerField(min_value=0, required=False)
+    duration = serializers.CharField(max_length=50, required=False, allow_blank=True)
+    rest_time = serializers.CharField(max_length=50, required=False, allow_blank=True)
+    tempo = serializers.CharField(max_length=50, required=False, allow_blank=True)
+    # add: index to insert at (default: last)
+    position = serializers.IntegerField(min_value=0, required=False)
+
+    def validate(self, attrs):
+        missing = [field for field in REQUIRED_OPERATION_FIELDS[attrs['op']] if field not in attrs]
+        if missing:
+            raise serializers.ValidationError(f"{attrs['op']} requires {', '.join(missing)}.")
+        if 'position' in attrs and attrs['op'] != 'add':
+            raise serializers.ValidationError("position is only accepted by add; use reorder.")
+        return attrs
+
+
+# Request body of the batch endpoint
+class WorkoutExerciseBatchSerializer(serializers.Serializer):
+    operations = WorkoutExerciseOperationSerializer(many=True, allow_empty=False, max_length=MAX_OPERATIONS)
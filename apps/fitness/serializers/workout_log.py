@@ -0,0 +1,46 @@
+from rest_framework import serializers
+from apps.fitness.models.workout_log import PerformedSet, WorkoutLog
+
+MAX_LOGS_PER_BATCH = 100
+MAX_SETS_PER_LOG = 500
+
+
+class PerformedSetSerializer(serializers.ModelSerializer):
+    # Client generated, so a re-sent batch is recognised
+    id = serializers.UUIDField()
+    workout_exercise_id = serializers.UUIDField()
+    performed_at = serializers.DateTimeField(required=False)
+
+    class Meta:
+        model = PerformedSet
+        fields = [
+            'id', 'workout_exercise_id', 'exercise', 'set_number', 'reps',
+            'weight', 'rpe', 'duration_seconds', 'performed_at'
+        ]
+        read_only_fields = ['exercise']
+
+    def validate_set_number(self, value):
+        if value < 1:
+            raise serializers.ValidationError("Set number must be >= 1.")
+        return value
+
+
+class WorkoutLogSerializer(serializers.ModelSerializer):
+    id = serializers.UUIDField()
+    session_id = serializers.UUIDField(required=False, allow_null=True)
+    sets = PerformedSetSerializer(many=True, max_length=MAX_SETS_PER_LOG)
+
+    class Meta:
+        model = WorkoutLog
+        fields = ['id', 'session_id', 'started_at', 'completed_at', 'notes', 'sets', 'created_at']
+        read_only_fields = ['created_at']
+
+    def validate(self, attrs):
+        if attrs.get('started_at') and attrs['started_at'] > attrs['completed_at']:
+            raise serializers.ValidationError("started_at must not be after completed_at.")
+        return attrs
+
+
+# Request body of the batch upload
+class WorkoutLogBatchSerializer(serializers.Serializer):
+    logs = WorkoutLogSerializer(many=True, allow_empty=False, max_length=MAX_LOGS_PER_BATCH)
@@ -1,29 +1,31 @@
 from rest_framework import serializers
-from apps.fitness.models.workout import WorkoutProgram, WorkoutSession, WorkoutExercise, Exercise
+from apps.fitness.models.workout import ProgramReview, WorkoutProgram, WorkoutSession, WorkoutExercise
+from apps.fitness.serializers.fields import MediaUrlField
 from apps.fitness.serializers.workout_session import WorkoutSessionDeepSerializer
 
 
 # Serializer to handle exercises inside a session during program creation/update
 class WorkoutExerciseCreateSerializer(serializers.ModelSerializer):
-    exercise_id = serializers.PrimaryKeyRelatedField(
-        source='exercise',
-        queryset=Exercise.objects.all(),  # Can be dynamically set in service if needed
-        write_only=True
-    )
+    # Existing row to update; omitted for new exercises
+    id = serializers.UUIDField(required=False)
+    # Existence is checked for the whole program in one query by the service
+    exercise_id = serializers.UUIDField(write_only=True)
 
     class Meta:
         model = WorkoutExercise
-        fields = ['exercise_id', 'sets', 'reps', 'duration', 'rest_time', 'tempo']
+        fields = ['id', 'exercise_id', 'sets', 'reps', 'duration', 'rest_time', 'tempo']
 
 
 # Serializer to handle sessions inside a program during creation/update
 class WorkoutSessionCreateSerializer(serializers.ModelSerializer):
+    # Existing session to update; omitted for new sessions
+    id = serializers.UUIDField(required=False)
     exercises = WorkoutExerciseCreateSerializer(many=True)
 
     class Meta:
         model = WorkoutSession
         fields = [
-            'title', 'notes', 'week_number', 'session_type',
+            'id', 'title', 'notes', 'week_number', 'session_type',
             'duration', 'intensity', 'is_rest_day', 'exercises'
         ]
 
@@ -45,6 +47,7 @@ class WorkoutProgramBuilderSerializer(serializers.ModelSerializer):
 # Deep serializer for returning a full program with sessions & exercises
 class WorkoutProgramDeepSerializer(serializers.ModelSerializer):
     sessions = WorkoutSessionDeepSerializer(many=True, read_only=True)
+    video = MediaUrlField()
 
     class Meta:
         model = WorkoutProgram
@@ -67,3 +70,41 @@ class WorkoutProgramSerializer(serializers.ModelSerializer):
             'created_at', 'updated_at'
         ]
         read_only_fields = ['id', 'created_by', 'created_at', 'updated_at']
+
+
+# Request body for cloning several programs, or one program for several clients
+class ProgramBulkCloneSerializer(serializers.Serializer):
+    program_ids = serializers.ListField(child=serializers.UUIDField(), required=False, allow_empty=False, max_length=100)
+    program_id = serializers.UUIDField(required=False)
+    client_ids = serializers.ListField(child=serializers.UUIDField(), required=False, allow_empty=False, max_length=100)
+    background = serializers.BooleanField(default=False, help_text="Queue a job and return 202 instead of waiting")
+
+    def validate(self, attrs):
+        if 'program_ids' in attrs:
+            if 'program_id' in attrs or 'client_ids' in attrs:
+                raise serializers.ValidationError("Send either program_ids, or program_id with client_ids.")
+        elif 'program_id' not in attrs or 'client_ids' not in attrs:
+            raise serializers.ValidationError("Send either program_ids, or program_id with client_ids.")
+        return attrs
+
+
+# Marketplace card: listing fields plus the denormalized stats
+class ProgramMarketplaceSerializer(serializers.ModelSerializer):
+    coach_name = serializers.CharField(source='created_by.full_name', read_only=True, default='')
+
+    class Meta:
+        model = WorkoutProgram
+        fields = [
+            'id', 'title', 'slug', 'description', 'level', 'goal', 'duration',
+            'duration_weeks', 'price', 'off_percent', 'is_verified',
+            'created_by', 'coach_name', 'assignment_count', 'session_count',
+            'rating_avg', 'rating_count', 'created_at'
+        ]
+        read_only_fields = fields
+
+
+class ProgramReviewSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = ProgramReview
+        fields = ['id', 'program', 'user', 'rating', 'comment', 'created_at', 'updated_at']
+        read_only_fields = ['id', 'program', 'user', 'created_at', 'updated_at']
@@ -1,6 +1,17 @@
 from rest_framework import serializers
 from apps.fitness.models.workout import WorkoutSession, WorkoutExercise
-from apps.fitness.serializers.exercise import ExerciseSerializer
+from apps.fitness.serializers.exercise import ExerciseSerializer, exercise_media_names
+from apps.fitness.services.media_url_service import MediaUrlService
+from apps.fitness.services.popularity_service import session_popularity
+
+
+class WorkoutExerciseDeepListSerializer(serializers.ListSerializer):
+    """Resolves the media URLs of every exercise in the session in one batch."""
+
+    def to_representation(self, data):
+        workout_exercises = data.all() if hasattr(data, 'all') else data
+        MediaUrlService.urls(exercise_media_names(we.exercise for we in workout_exercises))
+        return super().to_representation(workout_exercises)
 
 
 # Serializer for exercises inside a session (deep view)
@@ -19,6 +30,7 @@ class WorkoutExerciseDeepSerializer(serializers.ModelSerializer):
             'tempo',
         ]
         read_only_fields = ['id', 'exercise']
+        list_serializer_class = WorkoutExerciseDeepListSerializer
 
 
 # Deep serializer for a workout session with all exercises
@@ -46,6 +58,7 @@ class WorkoutSessionDeepSerializer(serializers.ModelSerializer):
 
 class WorkoutSessionSerializer(serializers.ModelSerializer):
     program_id = serializers.UUIDField(write_only=True, required=False)
+    popularity = serializers.SerializerMethodField()
 
     class Meta:
         model = WorkoutSession
@@ -63,6 +76,7 @@ class WorkoutSessionSerializer(serializers.ModelSerializer):
             'intensity',
             'is_public',
             'is_rest_day',
+            'popularity',
             'created_at',
             'updated_at',
         ]
@@ -73,6 +87,9 @@ class WorkoutSessionSerializer(serializers.ModelSerializer):
             'updated_at',
         ]
 
+    def get_popularity(self, obj):
+        return obj.popularity + session_popularity.pending(obj.pk)
+
     def validate_week_number(self, value):
         if value < 1:
             raise serializers.ValidationError("Week number must be >= 1.")
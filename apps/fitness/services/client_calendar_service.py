@@ -0,0 +1,110 @@
+# apps/fitness/services/client_calendar_service.py
+
+from collections import defaultdict
+from datetime import timedelta
+
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+
+from apps.fitness.models.workout import ProgramAssignment, ScheduledSession
+from apps.fitness.services.program_version_service import ProgramVersionService
+from config.utils.exceptions import BadRequestException
+
+DAYS_PER_WEEK = 7
+DEFAULT_RANGE_DAYS = 7
+MAX_RANGE_DAYS = 92
+
+
+class ClientCalendarService:
+    """
+    Client calendar: week N of a program starts (N - 1) weeks after the
+    assignment date, and the sessions of a week are spread evenly over its
+    seven days in program order (3 sessions -> days 0, 2, 4).
+    """
+
+    @staticmethod
+    def layout(start, sessions):
+        """[(date, position, session)] for `sessions` (version document entries) from `start`."""
+        weeks = defaultdict(list)
+        for session in sessions:
+            weeks[max(1, session.get('week_number') or 1)].append(session)
+
+        days = []
+        for week_number, week in weeks.items():
+            week_start = start + timedelta(weeks=week_number - 1)
+            for position, session in enumerate(week):
+                offset = position * DAYS_PER_WEEK // len(week)
+                days.append((week_start + timedelta(days=offset), position, session))
+        return days
+
+    @staticmethod
+    @transaction.atomic
+    def schedule(assignment, version=None):
+        """(Re)build the calendar rows of an assignment from its pinned version."""
+        ScheduledSession.objects.filter(assignment=assignment).delete()
+
+        version = version or assignment.program_version
+        if not assignment.is_active or version is None:
+            return []
+
+        start = timezone.localdate(assignment.assigned_at)
+        document = ProgramVersionService.load(version)
+        return ScheduledSession.objects.bulk_create([
+            ScheduledSession(
+                assignment=assignment,
+                client_id=assignment.client_id,
+                program_id=assignment.program_id,
+                session_id=session['id'],
+                title=session.get('title') or '',
+                week_number=session.get('week_number') or 1,
+                is_rest_day=bool(session.get('is_rest_day')),
+                date=date,
+                position=position,
+            )
+            for date, position, session in ClientCalendarService.layout(start, document['sessions'])
+        ])
+
+    @staticmethod
+    def unschedule(assignment):
+        return ScheduledSession.objects.filter(assignment=assignment).delete()[0]
+
+    @staticmethod
+    def date_range(start=None, end=None):
+        """Validated (start, end) from query strings; defaults to the coming week."""
+        try:
+            start = parse_date(start) if start else timezone.localdate()
+            end = parse_date(end) if end else start and start + timedelta(days=DEFAULT_RANGE_DAYS - 1)
+        except ValueError:
+            start = end = None
+        if start is None or end is None:
+            raise BadRequestException("from and to must be dates (YYYY-MM-DD).")
+        if end < start:
+            raise BadRequestException("to must not be before from.")
+        if (end - start).days >= MAX_RANGE_DAYS:
+            raise BadRequestException(f"The range is limited to {MAX_RANGE_DAYS} days.")
+        return start, end
+
+    @staticmethod
+    def get_calendar(client, start, end):
+        """Scheduled sessions of the client's active assignments between start and end, inclusive."""
+        return ScheduledSession.objects.filter(
+            client=client, date__gte=start, date__lte=end
+        ).select_related('program').order_by('date', 'assignment_id', 'position')
+
+    @staticmethod
+    def rebuild(assignments=None):
+        """
+        Re-pin (when needed) and reschedule active assignments; for existing
+        data and after a layout change. Returns the number of assignments.
+        """
+        if assignments is None:
+            assignments = ProgramAssignment.objects.filter(is_active=True)
+        count = 0
+        for assignment in assignments.select_related('program', 'program_version').iterator(chunk_size=200):
+            version = assignment.program_version
+            if version is None:
+                version = ProgramVersionService.pin(assignment, assignment.coach)
+            ClientCalendarService.schedule(assignment, version)
+            count += 1
+        return count
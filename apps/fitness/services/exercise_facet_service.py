@@ -0,0 +1,220 @@
+# apps/fitness/services/exercise_facet_service.py
+
+import threading
+from collections import defaultdict
+
+from django.contrib.postgres.aggregates import ArrayAgg
+from django.db.models import Q, Value
+from django.db.models.functions import Coalesce, Concat, NullIf
+
+from apps.fitness.models.workout import Exercise, MuscleGroup
+from config.utils.version_stamp import VersionStamp
+
+# Bumped whenever an exercise, its modalities, its muscle entries or the
+# muscle group tree change
+EXERCISE_CATALOG_VERSION = VersionStamp('fitness:exercise-catalog')
+
+FACETS = (
+    'category',
+    'modality',
+    'training_system',
+    'level',
+    'intensity',
+    'muscle_group',
+    'primary_muscle_group',
+    'secondary_muscle_group',
+)
+
+
+def _bitmap(positions, size):
+    """Build the int bitmap for a list of positions in one pass."""
+    buffer = bytearray(size // 8 + 1)
+    for position in positions:
+        buffer[position >> 3] |= 1 << (position & 7)
+    return int.from_bytes(buffer, 'little')
+
+
+def _with_ancestors(paths):
+    groups = set()
+    for path in paths or ():
+        if path:
+            groups.update(part for part in path.split(MuscleGroup.PATH_SEPARATOR) if part)
+    return groups
+
+
+class FacetBitmapIndex:
+    """
+    Compact in-memory bitmap index.
+
+    Every row gets a bit position; every facet value maps to a Python int
+    whose set bits are the rows carrying that value. Filtering is AND/OR over
+    ints and a facet count is a popcount, so filter + counts never touch the DB.
+    """
+
+    def __init__(self, rows, facets=FACETS):
+        self.facets = facets
+        self.ids = []
+        self.positions = {}
+        positions = {facet: defaultdict(list) for facet in facets}
+
+        for position, (row_id, values) in enumerate(rows):
+            self.ids.append(row_id)
+            self.positions[row_id] = position
+            for facet in facets:
+                for value in values.get(facet) or ():
+                    positions[facet][value].append(position)
+
+        size = len(self.ids)
+        self.all = (1 << size) - 1
+        self.bitmaps = {
+            facet: {value: _bitmap(rows_with_value, size) for value, rows_with_value in by_value.items()}
+            for facet, by_value in positions.items()
+        }
+
+    def __len__(self):
+        return len(self.ids)
+
+    def _facet_masks(self, selections):
+        masks = {}
+        for facet, values in selections.items():
+            if not values or facet not in self.bitmaps:
+                continue
+            mask = 0
+            for value in values:
+                mask |= self.bitmaps[facet].get(value, 0)
+            masks[facet] = mask
+        return masks
+
+    def mask_for(self, ids):
+        """Bitmap of the given ids (ids not in the index are ignored)."""
+        return _bitmap([self.positions[pk] for pk in ids if pk in self.positions], len(self.ids))
+
+    def match(self, selections, exclude=0):
+        """
+        Returns (matching ids, counts). Values are OR-ed within a facet and
+        facets are AND-ed together. Counts are disjunctive: each facet is
+        counted against every selection except its own, so sibling values
+        keep meaningful counts after one of them is picked. Rows in the
+        `exclude` bitmap are left out of both.
+        """
+        masks = self._facet_masks(selections)
+        rows = self.all & ~exclude
+
+        result = rows
+        for mask in masks.values():
+            result &= mask
+
+        counts = {}
+        for facet in self.facets:
+            base = rows
+            for other, mask in masks.items():
+                if other != facet:
+                    base &= mask
+            counts[facet] = {
+                value: (bitmap & base).bit_count()
+                for value, bitmap in self.bitmaps[facet].items()
+                if bitmap & base
+            }
+
+        return self.ids_for(result), counts
+
+    def ids_for(self, bitmap):
+        bits = bin(bitmap)[:1:-1]
+        return [self.ids[position] for position, bit in enumerate(bits) if bit == '1']
+
+
+class ExerciseFacetService:
+
+    _public_index = None
+    _public_version = None
+    _lock = threading.Lock()
+
+    @staticmethod
+    def _rows(queryset):
+        """One query: scalar facets plus aggregated m2m facets per exercise."""
+        # Muscle groups come back as materialized paths so every ancestor is
+        # credited too: filtering on "legs" matches exercises tagged "quads".
+        muscle_path = Coalesce(
+            NullIf('exercise_muscle_entries__muscle_group__path', Value('')),
+            Concat('exercise_muscle_entries__muscle_group_id', Value(MuscleGroup.PATH_SEPARATOR)),
+        )
+        queryset = queryset.order_by('name', 'id').values(
+            'id', 'category_id', 'training_system_id', 'level', 'intensity'
+        ).annotate(
+            modality_ids=ArrayAgg('modalities__id', distinct=True, default=None),
+            primary_paths=ArrayAgg(
+                muscle_path,
+                filter=Q(exercise_muscle_entries__is_primary=True),
+                distinct=True,
+                default=None,
+            ),
+            secondary_paths=ArrayAgg(
+                muscle_path,
+                filter=Q(exercise_muscle_entries__is_primary=False),
+                distinct=True,
+                default=None,
+            ),
+        )
+
+        for row in queryset:
+            primary = _with_ancestors(row['primary_paths'])
+            secondary = _with_ancestors(row['secondary_paths'])
+            yield row['id'], {
+                'category': [row['category_id']] if row['category_id'] else (),
+                'modality': [m for m in row['modality_ids'] or () if m],
+                'training_system': [row['training_system_id']] if row['training_system_id'] else (),
+                'level': [row['level']] if row['level'] else (),
+                'intensity': [row['intensity']] if row['intensity'] else (),
+                'muscle_group': primary | secondary,
+                'primary_muscle_group': primary,
+                'secondary_muscle_group': secondary,
+            }
+
+    @classmethod
+    def public_index(cls):
+        """Process-wide index of the public catalog, rebuilt when the version moves."""
+        version = EXERCISE_CATALOG_VERSION.get()
+        if cls._public_index is not None and cls._public_version == version:
+            return cls._public_index
+
+        with cls._lock:
+            if cls._public_index is None or cls._public_version != version:
+                cls._public_index = FacetBitmapIndex(
+                    cls._rows(Exercise.objects.filter(is_public=True, is_active=True))
+                )
+                cls._public_version = version
+        return cls._public_index
+
+    @classmethod
+    def own_index(cls, actor):
+        """The caller's own exercises, public or not; small, built per request."""
+        return FacetBitmapIndex(
+            cls._rows(Exercise.objects.filter(created_by=actor, is_active=True))
+        )
+
+    @classmethod
+    def search(cls, actor, selections, scope='all'):
+        """
+        Filter the catalog and count every facet value in one pass.
+        scope: 'all' (public + own), 'public' or 'mine' (own, public or not).
+        Returns (exercise ids, facet counts); own exercises come first.
+        """
+        searches = []
+        if scope in ('all', 'mine'):
+            own = cls.own_index(actor)
+            searches.append((own, 0))
+        if scope in ('all', 'public'):
+            public = cls.public_index()
+            # own public exercises are already counted in the own index
+            searches.append((public, public.mask_for(own.ids) if scope == 'all' else 0))
+
+        ids = []
+        counts = {facet: defaultdict(int) for facet in FACETS}
+        for index, exclude in searches:
+            matched, index_counts = index.match(selections, exclude)
+            ids.extend(matched)
+            for facet, values in index_counts.items():
+                for value, count in values.items():
+                    counts[facet][value] += count
+
+        return ids, {facet: dict(values) for facet, values in counts.items()}
@@ -0,0 +1,158 @@
+# apps/fitness/services/exercise_import_service.py
+
+import json
+from uuid import NAMESPACE_URL, UUID, uuid5
+
+from django.db import transaction
+from django.utils.text import slugify
+
+from apps.fitness.models.workout import (
+    Category,
+    Exercise,
+    ExerciseImage,
+    ExerciseMuscleGroup,
+    ExerciseVideo,
+    Modality,
+    MuscleGroup,
+    TrainingSystem,
+)
+from apps.fitness.services.exercise_facet_service import EXERCISE_CATALOG_VERSION
+from apps.fitness.services.exercise_service import ExerciseService
+from apps.fitness.services.taxonomy_cache import TaxonomyCache
+from config.utils.exceptions import BadRequestException
+
+LIST_SEPARATOR = '|'
+TRUE_VALUES = {'1', 'true', 'yes', 'y'}
+
+
+def _as_list(value):
+    if value in (None, ''):
+        return []
+    if isinstance(value, list):
+        return value
+    return [part.strip() for part in str(value).split(LIST_SEPARATOR) if part.strip()]
+
+
+def _as_bool(value, default):
+    if value in (None, ''):
+        return default
+    if isinstance(value, bool):
+        return value
+    return str(value).strip().lower() in TRUE_VALUES
+
+
+def _as_instructions(value):
+    if value in (None, ''):
+        return []
+    if isinstance(value, list):
+        return value
+    try:
+        parsed = json.loads(value)
+        return parsed if isinstance(parsed, list) else [parsed]
+    except (TypeError, ValueError):
+        return _as_list(value)
+
+
+class ExerciseImporter:
+    """
+    Batch writer for exercise libraries.
+
+    Rows are plain dicts (CSV or JSONL). Reference columns accept ids or
+    titles; list columns accept JSON lists or '|' separated strings:
+
+        name, slug, instructions, category, training_system, level, intensity,
+        modalities, primary_muscle_groups, secondary_muscle_groups, images,
+        videos, is_public, is_verified, id
+
+    Rows without an id get a deterministic one derived from `source` and the
+    row number, so replaying a batch after a crash never duplicates it.
+    """
+
+    def __init__(self, owner, source, is_public=False):
+        self.owner = owner
+        self.source = source
+        self.is_public = is_public
+
+    def _exercise_id(self, row, row_number):
+        if row.get('id'):
+            return UUID(str(row['id']))
+        return uuid5(NAMESPACE_URL, f'exercise-import:{self.source}:{row_number}')
+
+    def build(self, row, row_number):
+        """Resolve one row into an unsaved Exercise plus its related rows."""
+        name = (row.get('name') or '').strip()
+        if not name:
+            raise BadRequestException("Missing name")
+
+        exercise = Exercise(
+            id=self._exercise_id(row, row_number),
+            name=name,
+            slug=row.get('slug') or slugify(name),
+            instructions=_as_instructions(row.get('instructions')),
+            category_id=TaxonomyCache.resolve(Category, row.get('category')),
+            training_system_id=TaxonomyCache.resolve(TrainingSystem, row.get('training_system')),
+            level=row.get('level') or '',
+            intensity=row.get('intensity') or '',
+            created_by=self.owner,
+            is_public=_as_bool(row.get('is_public'), self.is_public),
+            is_verified=_as_bool(row.get('is_verified'), False),
+        )
+
+        muscles = {
+            TaxonomyCache.resolve(MuscleGroup, value): True
+            for value in _as_list(row.get('primary_muscle_groups'))
+        }
+        for value in _as_list(row.get('secondary_muscle_groups')):
+            muscles.setdefault(TaxonomyCache.resolve(MuscleGroup, value), False)
+
+        return {
+            'exercise': exercise,
+            'modalities': {TaxonomyCache.resolve(Modality, value) for value in _as_list(row.get('modalities'))},
+            'muscles': muscles,
+            'images': _as_list(row.get('images')),
+            'videos': _as_list(row.get('videos')),
+        }
+
+    @transaction.atomic
+    def write(self, built_rows):
+        """
+        Insert one batch: a handful of bulk INSERTs whatever the batch size.
+        Exercises that already exist (a replayed batch) are skipped entirely.
+        Returns the number of exercises created.
+        """
+        ids = [item['exercise'].id for item in built_rows]
+        existing = set(Exercise.objects.filter(id__in=ids).values_list('id', flat=True))
+        fresh = [item for item in built_rows if item['exercise'].id not in existing]
+        if not fresh:
+            return 0
+
+        Exercise.objects.bulk_create([item['exercise'] for item in fresh])
+
+        ModalityLink = Exercise.modalities.through
+        ModalityLink.objects.bulk_create([
+            ModalityLink(exercise_id=item['exercise'].id, modality_id=modality_id)
+            for item in fresh
+            for modality_id in item['modalities']
+        ])
+        ExerciseMuscleGroup.objects.bulk_create([
+            ExerciseMuscleGroup(exercise_id=item['exercise'].id, muscle_group_id=pk, is_primary=is_primary)
+            for item in fresh
+            for pk, is_primary in item['muscles'].items()
+        ])
+        # Media columns carry storage keys of files already uploaded
+        ExerciseImage.objects.bulk_create([
+            ExerciseImage(exercise_id=item['exercise'].id, image_file=key)
+            for item in fresh
+            for key in item['images']
+        ])
+        ExerciseVideo.objects.bulk_create([
+            ExerciseVideo(exercise_id=item['exercise'].id, video_file=key)
+            for item in fresh
+            for key in item['videos']
+        ])
+
+        # bulk_create bypasses save() and signals
+        fresh_ids = [item['exercise'].id for item in fresh]
+        ExerciseService.refresh_search_vectors(fresh_ids)
+        transaction.on_commit(EXERCISE_CATALOG_VERSION.bump)
+        return len(fresh)
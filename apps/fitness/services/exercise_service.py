@@ -1,19 +1,144 @@
 # apps/fitness/services/exercise_service.py
 
-from django.db.models import Q
-from apps.fitness.models.workout import Exercise
+from django.contrib.postgres.search import SearchQuery, SearchRank, TrigramWordSimilarity
+from django.db import connection, transaction
+from django.db.models import Count, F, Max, Q
+from apps.fitness.models.workout import EXERCISE_SEARCH_CONFIG, Exercise, ExerciseMuscleGroup, MuscleGroup, exercise_search_vector
+from apps.fitness.services.exercise_facet_service import EXERCISE_CATALOG_VERSION
+from apps.fitness.services.taxonomy_cache import TaxonomyCache
 from config.utils.exceptions import ForbiddenException, NotFoundException
 
+# pg_trgm's word similarity operator defaults to 0.6, which misses one-letter
+# typos in short words (word_similarity('sqat', 'squat') is 0.4). Searches
+# lower it for their own transaction only.
+SEARCH_TRIGRAM_THRESHOLD = 0.3
+
+
+def exercise_prefetch_plan(prefix=''):
+    """
+    Relations rendered by ExerciseSerializer, optionally rooted at `prefix`
+    (e.g. 'exercises__exercise__' from a WorkoutSession).
+    Keep in sync with the serializer fields.
+    """
+    return [
+        f'{prefix}images',
+        f'{prefix}videos',
+        f'{prefix}modalities',
+        # muscle group titles come from TaxonomyCache, no join needed
+        f'{prefix}exercise_muscle_entries',
+    ]
+
 
 class ExerciseService:
 
     @staticmethod
-    def list_exercises(actor):
+    def visible_exercises(actor):
         return Exercise.objects.filter(
             Q(is_public=True) | Q(created_by=actor),
             is_active=True
         )
 
+    @staticmethod
+    def filter_by_muscle_subtree(queryset, muscle_group_ids, is_primary=None):
+        """
+        Exercises hitting any muscle under `muscle_group_ids`: a semi-join on
+        ExerciseMuscleGroup -> MuscleGroup.path prefix, no recursion.
+        """
+        entries = ExerciseMuscleGroup.objects.filter(
+            muscle_group__in=MuscleGroup.objects.subtree(muscle_group_ids)
+        )
+        if is_primary is not None:
+            entries = entries.filter(is_primary=is_primary)
+        return queryset.filter(id__in=entries.values('exercise_id'))
+
+    @staticmethod
+    def list_exercises(actor, muscle_group_ids=None, is_primary=None):
+        queryset = ExerciseService.visible_exercises(actor)
+        if muscle_group_ids:
+            queryset = ExerciseService.filter_by_muscle_subtree(queryset, muscle_group_ids, is_primary)
+
+        # 1 query for the rows + 1 per prefetched relation, whatever the size
+        return queryset.prefetch_related(
+            *exercise_prefetch_plan()
+        )
+
+    @staticmethod
+    def catalog_stamp(actor, exercise_id=None):
+        """
+        Cheap version of what the actor can see (or of one exercise):
+        row count and latest updated_at in one aggregate query, plus the
+        catalog and muscle group versions the serializer output depends on.
+        """
+        queryset = ExerciseService.visible_exercises(actor)
+        if exercise_id is not None:
+            queryset = queryset.filter(id=exercise_id)
+        stamp = queryset.aggregate(count=Count('id'), last_modified=Max('updated_at'))
+        stamp['catalog'] = EXERCISE_CATALOG_VERSION.get()
+        stamp['taxonomy'] = TaxonomyCache.table(MuscleGroup).version()
+        return stamp
+
+    @staticmethod
+    def get_exercise(actor, exercise_id):
+        exercise = ExerciseService.visible_exercises(actor).filter(
+            id=exercise_id
+        ).prefetch_related(
+            *exercise_prefetch_plan()
+        ).first()
+
+        if not exercise:
+            raise NotFoundException("Exercise not found")
+        return exercise
+
+    @staticmethod
+    def get_exercises_by_ids(exercise_ids):
+        """Fetch a page of exercises with serializer relations, preserving the given order."""
+        exercises = Exercise.objects.filter(id__in=exercise_ids).prefetch_related(
+            *exercise_prefetch_plan()
+        ).in_bulk()
+        return [exercises[pk] for pk in exercise_ids if pk in exercises]
+
+    @staticmethod
+    def _search_queryset(actor, term):
+        search_query = SearchQuery(term, config=EXERCISE_SEARCH_CONFIG, search_type='websearch')
+        # Both predicates are served by GIN indexes; the similarity only ranks matches
+        return ExerciseService.visible_exercises(actor).filter(
+            Q(search_vector=search_query) | Q(name__trigram_word_similar=term)
+        ).annotate(
+            relevance=SearchRank(F('search_vector'), search_query) + TrigramWordSimilarity(term, 'name')
+        ).order_by(
+            '-relevance', 'name'
+        )
+
+    @staticmethod
+    def search_exercises(actor, query, limit=20):
+        """
+        Relevance-ranked search: full-text match on the weighted search vector
+        OR trigram word similarity on the name (typos such as "sqat").
+        Evaluated in its own transaction so the trigram threshold can be
+        lowered with SET LOCAL; returns a list.
+        """
+        term = (query or '').strip()
+        if not term:
+            return []
+
+        with transaction.atomic():
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    "SELECT set_config('pg_trgm.word_similarity_threshold', %s, true)",
+                    [str(SEARCH_TRIGRAM_THRESHOLD)],
+                )
+            return list(
+                ExerciseService._search_queryset(actor, term).prefetch_related(*exercise_prefetch_plan())[:limit]
+            )
+
+    @staticmethod
+    def refresh_search_vectors(exercise_ids=None):
+        """Recompute search vectors set-based (backfills and bulk writes bypass save())."""
+        queryset = Exercise.objects.all()
+        if exercise_ids is not None:
+            queryset = queryset.filter(id__in=exercise_ids)
+        return queryset.update(search_vector=exercise_search_vector())
+
     @staticmethod
     def create_exercise(actor, data):
         if not actor.is_coach:
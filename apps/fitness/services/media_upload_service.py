@@ -0,0 +1,264 @@
+# apps/fitness/services/media_upload_service.py
+
+import math
+from uuid import UUID, uuid4
+
+from django.conf import settings
+from django.core import signing
+from django.core.files import File
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.urls import reverse
+from django.utils.text import get_valid_filename
+
+from apps.account.models import User
+from apps.fitness.models.workout import (
+    Exercise,
+    ExerciseImage,
+    ExerciseVideo,
+    SessionImage,
+    WorkoutProgram,
+    WorkoutSession,
+)
+from config.utils.exceptions import BadRequestException, ForbiddenException, NotFoundException
+
+MB = 1024 * 1024
+IMAGE_MAX_SIZE = 20 * MB
+VIDEO_MAX_SIZE = 2048 * MB
+# S3 parts are 5 MB..5 GB, at most 10000 per upload
+MULTIPART_THRESHOLD = 100 * MB
+PART_SIZE = 64 * MB
+
+TOKEN_SALT = 'fitness.media-upload'
+
+# target -> where the file lands. `model` rows are created next to the
+# parent (through `link`); without a model the parent's own `field` is set.
+# Keys come from the field's upload_to, so they match the existing layout.
+UPLOAD_TARGETS = {
+    'exercise_image': {
+        'parent': Exercise, 'model': ExerciseImage, 'link': 'exercise', 'field': 'image_file',
+        'types': ('image/',), 'max_size': IMAGE_MAX_SIZE,
+    },
+    'exercise_video': {
+        'parent': Exercise, 'model': ExerciseVideo, 'link': 'exercise', 'field': 'video_file',
+        'types': ('video/',), 'max_size': VIDEO_MAX_SIZE,
+    },
+    'program_video': {
+        'parent': WorkoutProgram, 'model': None, 'field': 'video',
+        'types': ('video/',), 'max_size': VIDEO_MAX_SIZE,
+    },
+    'session_image': {
+        'parent': WorkoutSession, 'model': SessionImage, 'link': 'session', 'field': 'image_file',
+        'types': ('image/',), 'max_size': IMAGE_MAX_SIZE,
+    },
+    'profile_picture': {
+        'parent': User, 'model': None, 'field': 'profile_picture',
+        'types': ('image/',), 'max_size': 10 * MB,
+    },
+}
+
+
+class MediaUploadService:
+    """
+    Uploads that go straight from the client to the storage.
+
+    start() checks access and returns presigned PUT URLs (one, or one per
+    part for large files) with a signed token; the client uploads, then
+    calls confirm() with the token, which checks the object and attaches it.
+    Django never handles the bytes on S3/MinIO. Other storages (the local
+    filesystem in development) get a signed URL to receive(), which
+    streams the body to the storage.
+
+    A failed confirm aborts its multipart upload and deletes an object of
+    the wrong size. Uploads that are never confirmed are left to the
+    bucket: give it a lifecycle rule that aborts incomplete multipart
+    uploads after a day.
+    """
+
+    storage = default_storage
+
+    @staticmethod
+    def ttl():
+        """Seconds a presigned upload URL is valid."""
+        return getattr(settings, 'AWS_QUERYSTRING_EXPIRE', 3600)
+
+    @classmethod
+    def _is_s3(cls):
+        return bool(getattr(cls.storage, 'bucket_name', None))
+
+    @classmethod
+    def _client(cls):
+        return cls.storage.connection.meta.client
+
+    @classmethod
+    def _object_key(cls, name):
+        # S3 storages may prefix a location
+        normalize = getattr(cls.storage, '_normalize_name', None)
+        return normalize(name) if normalize else name
+
+    @staticmethod
+    def _parent(actor, target, object_id):
+        """The object the media belongs to; only its owner may upload."""
+        spec = UPLOAD_TARGETS[target]
+        if spec['parent'] is User:
+            return actor
+
+        parent = spec['parent'].objects.select_related('created_by').filter(id=object_id).first()
+        if parent is None:
+            raise NotFoundException(f"{spec['parent'].__name__} not found.")
+        if parent.created_by_id != actor.id:
+            raise ForbiddenException("You cannot upload media for this item.")
+        return parent
+
+    @classmethod
+    def _storage_name(cls, target, parent, filename):
+        spec = UPLOAD_TARGETS[target]
+        instance = spec['model'](**{spec['link']: parent}) if spec['model'] else parent
+        field = instance._meta.get_field(spec['field'])
+        # A fresh prefix per upload: presigned PUTs overwrite, the storage won't rename
+        name = cls.storage.generate_filename(
+            field.upload_to(instance, f"{uuid4().hex[:12]}-{get_valid_filename(filename)}")
+        )
+        if len(name) > field.max_length:
+            raise BadRequestException("filename is too long.")
+        return name
+
+    # ---------------------------
+    # Start
+    # ---------------------------
+    @classmethod
+    def start(cls, actor, target, filename, content_type, size, object_id=None):
+        spec = UPLOAD_TARGETS.get(target)
+        if spec is None:
+            raise BadRequestException(f"target must be one of: {', '.join(UPLOAD_TARGETS)}.")
+        if not content_type.startswith(spec['types']):
+            raise BadRequestException(f"{target} accepts {', '.join(t + '*' for t in spec['types'])} files.")
+        if size > spec['max_size']:
+            raise BadRequestException(f"{target} files are limited to {spec['max_size'] // MB} MB.")
+
+        parent = cls._parent(actor, target, object_id)
+        name = cls._storage_name(target, parent, filename)
+        payload = {
+            'target': target,
+            'object_id': str(parent.id),
+            'user': str(actor.id),
+            'name': name,
+            'size': size,
+            'content_type': content_type,
+        }
+        upload = {'method': 'PUT', 'headers': {'Content-Type': content_type}, 'expires_in': cls.ttl()}
+
+        if not cls._is_s3():
+            token = signing.dumps(payload, salt=TOKEN_SALT)
+            return {'token': token, **upload, 'url': reverse('media-upload-local', args=[token])}
+
+        client = cls._client()
+        params = {'Bucket': cls.storage.bucket_name, 'Key': cls._object_key(name)}
+        if size <= MULTIPART_THRESHOLD:
+            url = client.generate_presigned_url(
+                'put_object', Params={**params, 'ContentType': content_type}, ExpiresIn=cls.ttl(), HttpMethod='PUT'
+            )
+            return {'token': signing.dumps(payload, salt=TOKEN_SALT), **upload, 'url': url}
+
+        upload_id = client.create_multipart_upload(**params, ContentType=content_type)['UploadId']
+        payload['upload_id'] = upload_id
+        upload['headers'] = {}
+        parts = [
+            {
+                'number': number,
+                'url': client.generate_presigned_url(
+                    'upload_part', Params={**params, 'UploadId': upload_id, 'PartNumber': number},
+                    ExpiresIn=cls.ttl(), HttpMethod='PUT',
+                ),
+            }
+            for number in range(1, math.ceil(size / PART_SIZE) + 1)
+        ]
+        return {'token': signing.dumps(payload, salt=TOKEN_SALT), **upload, 'part_size': PART_SIZE, 'parts': parts}
+
+    # ---------------------------
+    # Local stand-in
+    # ---------------------------
+    @classmethod
+    def receive(cls, token, stream, content_type, length):
+        """Store the body of a PUT to the local upload URL (non-S3 storages only)."""
+        if cls._is_s3():
+            raise BadRequestException("Upload to the presigned storage URL instead.")
+        try:
+            payload = signing.loads(token, salt=TOKEN_SALT, max_age=cls.ttl())
+        except signing.BadSignature:
+            raise ForbiddenException("The upload URL is invalid or has expired.")
+        if content_type != payload['content_type']:
+            raise BadRequestException(f"Content-Type must be {payload['content_type']}.")
+        if length != payload['size']:
+            raise BadRequestException(f"Content-Length must be {payload['size']}.")
+        if cls.storage.exists(payload['name']):
+            raise BadRequestException("This upload was already received.")
+
+        name = cls.storage.save(payload['name'], File(stream))
+        if name != payload['name'] or cls.storage.size(name) != payload['size']:
+            cls.storage.delete(name)
+            raise BadRequestException("The uploaded size does not match the declared size.")
+        return name
+
+    # ---------------------------
+    # Confirm
+    # ---------------------------
+    @classmethod
+    def _complete_multipart(cls, name, upload_id, parts):
+        """Assemble the parts; a rejected completion aborts the upload so its parts are freed."""
+        client = cls._client()
+        params = {'Bucket': cls.storage.bucket_name, 'Key': cls._object_key(name), 'UploadId': upload_id}
+        try:
+            client.complete_multipart_upload(**params, MultipartUpload={'Parts': [
+                {'PartNumber': part['number'], 'ETag': part['etag']}
+                for part in sorted(parts, key=lambda part: part['number'])
+            ]})
+        except client.exceptions.ClientError as e:
+            try:
+                client.abort_multipart_upload(**params)
+            except client.exceptions.ClientError:
+                pass  # already aborted or expired
+            raise BadRequestException(f"The multipart upload could not be completed; upload the file again. ({e})")
+
+    @classmethod
+    @transaction.atomic
+    def confirm(cls, actor, token, parts=None):
+        """
+        Check the uploaded object and attach it to its target. Returns the
+        row (ExerciseImage, ...) or the parent whose field was set.
+        Confirming twice attaches once.
+        """
+        try:
+            # Large uploads may outlive their URLs; allow as long again to confirm
+            payload = signing.loads(token, salt=TOKEN_SALT, max_age=2 * cls.ttl())
+        except signing.BadSignature:
+            raise BadRequestException("Invalid or expired upload token.")
+        if payload['user'] != str(actor.id):
+            raise ForbiddenException("This upload belongs to another user.")
+
+        target, name = payload['target'], payload['name']
+        spec = UPLOAD_TARGETS[target]
+        parent = cls._parent(actor, target, UUID(payload['object_id']))
+
+        if payload.get('upload_id') and not cls.storage.exists(name):
+            if not parts:
+                raise BadRequestException("parts (number and etag of every part) are required.")
+            cls._complete_multipart(name, payload['upload_id'], parts)
+
+        if not cls.storage.exists(name):
+            raise BadRequestException("The file has not been uploaded yet.")
+        if cls.storage.size(name) != payload['size']:
+            cls.storage.delete(name)
+            raise BadRequestException("The uploaded size does not match the declared size.")
+
+        if spec['model'] is None:
+            if getattr(parent, spec['field']).name != name:
+                setattr(parent, spec['field'], name)
+                fields = [spec['field']] + (['updated_at'] if hasattr(parent, 'updated_at') else [])
+                parent.save(update_fields=fields)
+            return target, parent
+
+        row = spec['model'].objects.filter(**{spec['link']: parent, spec['field']: name}).first()
+        if row is None:
+            row = spec['model'].objects.create(**{spec['link']: parent, spec['field']: name})
+        return target, row
@@ -0,0 +1,122 @@
+# apps/fitness/services/media_url_service.py
+
+import hashlib
+import threading
+import time
+from urllib.parse import quote
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files.storage import default_storage
+
+# Signed URLs are reused for this share of their lifetime, so a cached URL
+# always has at least half of its validity left when it is handed out.
+CACHE_FRACTION = 0.5
+MAX_LOCAL_URLS = 10000
+
+
+class MediaUrlService:
+    """
+    URLs for stored media files (the keys built by the *_upload_to helpers).
+
+    Signing an S3/MinIO URL costs a presign per file; a program deep view
+    repeats it for every exercise of every session. URLs are resolved in
+    batches through two tiers: a per-process dict, then the shared cache
+    (one get_many / set_many per batch). Only the misses are signed.
+    With MEDIA_PUBLIC_URL set (public bucket or CDN) nothing is signed.
+    """
+
+    storage = default_storage
+
+    _local = {}
+    _lock = threading.Lock()
+
+    @staticmethod
+    def ttl():
+        """Seconds a signed URL is reused; it stays valid at least as long again."""
+        expire = getattr(settings, 'AWS_QUERYSTRING_EXPIRE', 3600)
+        return max(1, int(expire * CACHE_FRACTION))
+
+    @staticmethod
+    def epoch():
+        """
+        Changes every ttl() seconds. Part of the ETag of any response that
+        embeds signed URLs, so a revalidated body never outlives its links.
+        """
+        return int(time.time() // MediaUrlService.ttl())
+
+    @staticmethod
+    def _cache_key(name):
+        return 'media-url:' + hashlib.sha1(name.encode()).hexdigest()
+
+    @classmethod
+    def _public_url(cls, name):
+        base = getattr(settings, 'MEDIA_PUBLIC_URL', '')
+        if base:
+            return f"{base.rstrip('/')}/{quote(name)}"
+        if not getattr(cls.storage, 'querystring_auth', True):
+            # Unsigned storage URLs are plain string formatting
+            return cls.storage.url(name)
+        return None
+
+    @classmethod
+    def urls(cls, names):
+        """{name: url} for every non-empty name, signing only what no tier holds."""
+        names = {name for name in names if name}
+        if not names:
+            return {}
+
+        resolved = {}
+        missing = []
+        now = time.monotonic()
+        for name in names:
+            public = cls._public_url(name)
+            if public is not None:
+                resolved[name] = public
+                continue
+            entry = cls._local.get(name)
+            if entry and entry[1] > now:
+                resolved[name] = entry[0]
+            else:
+                missing.append(name)
+
+        if not missing:
+            return resolved
+
+        ttl = cls.ttl()
+        keys = {cls._cache_key(name): name for name in missing}
+        shared = cache.get_many(list(keys))
+
+        signed = {}
+        for key, name in keys.items():
+            url = shared.get(key)
+            if url is None:
+                url = cls.storage.url(name)
+                signed[key] = url
+            resolved[name] = url
+
+        if signed:
+            cache.set_many(signed, timeout=ttl)
+
+        # Shared entries may be older than ours; keep them locally for a short while only
+        with cls._lock:
+            if len(cls._local) > MAX_LOCAL_URLS:
+                cls._local.clear()
+            for key, name in keys.items():
+                lifetime = ttl if key in signed else ttl * CACHE_FRACTION
+                cls._local[name] = (resolved[name], now + lifetime)
+
+        return resolved
+
+    @classmethod
+    def url(cls, file):
+        """URL for a FieldFile or a storage name; None for an empty file field."""
+        name = getattr(file, 'name', file)
+        if not name:
+            return None
+        return cls.urls([name])[name]
+
+    @classmethod
+    def clear(cls):
+        with cls._lock:
+            cls._local.clear()
@@ -0,0 +1,163 @@
+# apps/fitness/services/popularity_service.py
+
+import logging
+import threading
+from collections import Counter
+
+from django.db import connection, connections, transaction
+
+from apps.fitness.models.workout import Exercise, WorkoutExercise, WorkoutSession
+
+logger = logging.getLogger("fitness.popularity")
+
+
+class BufferedCounter:
+    """
+    In-process accumulator for a hot integer column.
+
+    Increments only touch a dict; pending deltas are written in one
+    UPDATE ... FROM (VALUES ...) once `max_pending` rows are dirty, and by a
+    timer `flush_interval` seconds after the first unflushed increment, so
+    hot rows are never locked per hit. The timer is only armed by an
+    increment, so processes that never record (migrations, most commands)
+    never write. Deltas still pending when a process exits are lost.
+    Reads add the unflushed delta on top of the stored value; a batch being
+    written stays part of that delta until its UPDATE has committed.
+    """
+
+    def __init__(self, model, field, max_pending=500, flush_interval=30):
+        self.model = model
+        self.field = field
+        self.max_pending = max_pending
+        self.flush_interval = flush_interval
+        self._pending = Counter()
+        self._flushing = Counter()
+        self._lock = threading.Lock()
+        self._timer = None
+
+    def increment(self, ids, amount=1):
+        with self._lock:
+            for pk in ids:
+                self._pending[pk] += amount
+            due = len(self._pending) >= self.max_pending
+            if self._pending and self._timer is None:
+                self._timer = threading.Timer(self.flush_interval, self._flush_on_timer)
+                self._timer.daemon = True
+                self._timer.start()
+
+        if due:
+            # Never hold row locks inside the caller's transaction, nor fail it
+            transaction.on_commit(self.flush_quietly)
+
+    def _flush_on_timer(self):
+        with self._lock:
+            self._timer = None
+        try:
+            self.flush_quietly()
+        finally:
+            # The timer thread's own connection
+            connections.close_all()
+
+    def pending(self, pk):
+        with self._lock:
+            return self._pending.get(pk, 0) + self._flushing.get(pk, 0)
+
+    def read(self, ids):
+        """Stored value + unflushed delta for each id."""
+        stored = dict(
+            self.model.objects.filter(pk__in=ids).values_list('pk', self.field)
+        )
+        return {pk: value + self.pending(pk) for pk, value in stored.items()}
+
+    def flush(self):
+        with self._lock:
+            batch, self._pending = self._pending, Counter()
+            self._flushing.update(batch)
+
+        if not batch:
+            return 0
+
+        try:
+            self._write(batch)
+        except Exception:
+            # Put the deltas back so the next flush retries them
+            with self._lock:
+                self._flushing.subtract(batch)
+                self._pending.update(batch)
+                self._flushing = +self._flushing
+            raise
+        with self._lock:
+            self._flushing.subtract(batch)
+            self._flushing = +self._flushing
+        return len(batch)
+
+    def _write(self, batch):
+        meta = self.model._meta
+        quote = connection.ops.quote_name
+        table = quote(meta.db_table)
+        pk_column = quote(meta.pk.column)
+        column = quote(meta.get_field(self.field).column)
+        pk_type = meta.pk.db_type(connection)
+
+        # Sorted so concurrent flushers lock rows in the same order
+        rows = sorted(batch.items(), key=lambda item: str(item[0]))
+        values = ', '.join([f'(%s::{pk_type}, %s::integer)'] * len(rows))
+        params = [value for pk, delta in rows for value in (str(pk), delta)]
+
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'UPDATE {table} AS t SET {column} = t.{column} + v.delta '
+                f'FROM (VALUES {values}) AS v(id, delta) '
+                f'WHERE t.{pk_column} = v.id',
+                params,
+            )
+
+    def flush_quietly(self):
+        try:
+            self.flush()
+        except Exception:
+            logger.exception("Failed to flush %s.%s counters", self.model.__name__, self.field)
+
+
+exercise_popularity = BufferedCounter(Exercise, 'popularity')
+session_popularity = BufferedCounter(WorkoutSession, 'popularity')
+
+
+class PopularityService:
+
+    @staticmethod
+    def record_exercise_views(exercise_ids):
+        exercise_popularity.increment(exercise_ids)
+
+    @staticmethod
+    def record_session_views(session_ids):
+        session_popularity.increment(session_ids)
+
+    @staticmethod
+    def record_program_assignment(program):
+        """An assignment counts once for every session and distinct exercise of the program."""
+        session_ids = list(program.sessions.values_list('id', flat=True))
+        exercise_ids = set(
+            WorkoutExercise.objects.filter(
+                session_id__in=session_ids
+            ).values_list('exercise_id', flat=True)
+        )
+
+        def record():
+            session_popularity.increment(session_ids)
+            exercise_popularity.increment(exercise_ids)
+
+        # A rolled back assignment must not count
+        transaction.on_commit(record)
+
+    @staticmethod
+    def exercise_popularity(exercise_ids):
+        return exercise_popularity.read(exercise_ids)
+
+    @staticmethod
+    def session_popularity(session_ids):
+        return session_popularity.read(session_ids)
+
+    @staticmethod
+    def flush():
+        return exercise_popularity.flush() + session_popularity.flush()
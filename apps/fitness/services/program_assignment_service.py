@@ -1,6 +1,8 @@
 # apps/fitness/services/program_assignment_service.py
 
 from django.db import transaction
+from django.db.models import Count, Max
+from django.utils import timezone
 from django.utils.dateparse import parse_date
 from django.db import IntegrityError
 
@@ -9,6 +11,11 @@ from apps.fitness.models.program_assignment_audit import ProgramAssignmentAudit
 from apps.fitness.models.workout import ProgramAssignment, WorkoutProgram
 from apps.fitness.models.coach_client import CoachClient
 from apps.fitness.services.audit_logger import AssignmentAuditLogger
+from apps.fitness.services.client_calendar_service import ClientCalendarService
+from apps.fitness.services.popularity_service import PopularityService
+from apps.fitness.services.program_marketplace_service import ProgramMarketplaceService
+from apps.fitness.services.program_version_service import ProgramVersionService
+from apps.fitness.services.sync_service import SyncService
 from apps.payments.models.coach_service import CoachServiceRequest
 from apps.payments.services.coach_request_service import CoachRequestService
 from config.utils.exceptions import (
@@ -88,6 +95,8 @@ class ProgramAssignmentService:
             assignment.is_active = True
             assignment.coach = actor
             assignment.coach_service_request = coach_request
+            # The calendar is laid out from assigned_at; start over from today
+            assignment.assigned_at = timezone.now()
             assignment.save()
         else:
             assignment = ProgramAssignment.objects.create(
@@ -97,6 +106,12 @@ class ProgramAssignmentService:
                 coach_service_request=coach_request,
                 is_active=True
             )
+            ProgramMarketplaceService.bump_stats(program.id, assignment_count=1)
+        # The client follows this frozen copy, not the live program
+        version = ProgramVersionService.pin(assignment, actor)
+        ClientCalendarService.schedule(assignment, version)
+        PopularityService.record_program_assignment(program)
+
         # 🔥 AUTO-COMPLETE REQUEST
         if coach_request:
             CoachRequestService.complete_request(
@@ -142,11 +157,13 @@ class ProgramAssignmentService:
 
         assignment.is_active = False
         try:
-            assignment.save(update_fields=["is_active"])
+            assignment.save(update_fields=["is_active", "updated_at"])
         except IntegrityError:
             raise BadRequestException(
                     "This program is already assigned to the client."
                 )
+        ClientCalendarService.unschedule(assignment)
+        SyncService.record_unassigned([assignment])
         AssignmentAuditLogger.log(
             actor=actor,
             client=assignment.client,
@@ -221,3 +238,45 @@ class ProgramAssignmentService:
             queryset = queryset.filter(assigned_at__date__lte=to_date)
 
         return queryset.order_by("-assigned_at")
+
+    # --------------------------------
+    # READ — Client version stamps
+    # --------------------------------
+    @staticmethod
+    def client_stamp(client):
+        """
+        Version of the client's active assignments, in one aggregate query.
+        Unassigning touches updated_at and drops the count; program and
+        coach request edits move their own updated_at.
+        """
+        return ProgramAssignment.objects.filter(client=client, is_active=True).aggregate(
+            count=Count("id"),
+            updated=Max("updated_at"),
+            programs_updated=Max("program__updated_at"),
+            requests_updated=Max("coach_service_request__updated_at"),
+        )
+
+    @staticmethod
+    def client_sessions_stamp(client):
+        """
+        Version of the client's session list: the program versions their
+        active assignments are pinned to, in one query. Live program edits
+        do not move it, except for assignments not pinned yet, which follow
+        the live program; pinning a version touches updated_at.
+        """
+        assignments = list(ProgramAssignment.objects.filter(client=client, is_active=True).values_list(
+            "id", "program_version_id", "updated_at", "program__updated_at"
+        ).order_by("id"))
+        return {
+            "versions": [
+                (assignment_id, version_id) if version_id else (assignment_id, program_updated)
+                for assignment_id, version_id, _, program_updated in assignments
+            ],
+            "updated": max(
+                (
+                    updated if version_id else max(updated, program_updated)
+                    for _, version_id, updated, program_updated in assignments
+                ),
+                default=None,
+            ),
+        }
@@ -0,0 +1,199 @@
+# apps/fitness/services/program_clone_service.py
+
+from uuid import uuid4
+
+from django.db import connection, transaction
+from django.db.models import Q
+from django.utils.text import slugify
+
+from apps.fitness.models.coach_client import CoachClient
+from apps.fitness.models.workout import WorkoutExercise, WorkoutProgram, WorkoutSession
+from apps.jobs.services.job_service import JobService
+from config.utils.exceptions import BadRequestException, NotFoundException
+
+CLONE_PROGRAMS_JOB = 'fitness.clone_programs'
+CLONE_FOR_CLIENTS_JOB = 'fitness.clone_program_for_clients'
+
+# Columns that are reset on the copy instead of copied from the source
+PROGRAM_RESET = {
+    'is_active': False,
+    'is_public': False,
+    'is_published': False,
+    'is_verified': False,
+    # marketplace stats belong to the source; session_count is copied as is
+    'assignment_count': 0,
+    'rating_count': 0,
+    'rating_avg': 0,
+}
+SESSION_OVERRIDES = {
+    'id': 'map.new_id',
+    'program_id': 'map.program_id',
+    'created_by_id': 'map.owner_id',
+    'is_public': 'false',
+    'popularity': '0',
+    'created_at': 'now()',
+    'updated_at': 'now()',
+}
+WORKOUT_EXERCISE_OVERRIDES = {
+    'id': 'gen_random_uuid()',
+    'session_id': 'map.new_id',
+    'updated_at': 'now()',
+}
+
+
+def _insert_select(model, overrides):
+    """
+    Column list and SELECT list copying every concrete column of `model`
+    from alias `src`, except the `overrides` (attname -> SQL expression).
+    Built from _meta so new columns are cloned without touching this code.
+    """
+    quote = connection.ops.quote_name
+    columns, values = [], []
+    for field in model._meta.concrete_fields:
+        columns.append(quote(field.column))
+        values.append(overrides.get(field.attname, f'src.{quote(field.column)}'))
+    return ', '.join(columns), ', '.join(values)
+
+
+class ProgramCloneService:
+
+    @staticmethod
+    def _copy_programs(sources, owner, titles, **overrides):
+        """One INSERT for the program rows; `sources` and `titles` are parallel lists."""
+        copies = []
+        for source, title in zip(sources, titles):
+            values = {
+                field.attname: getattr(source, field.attname)
+                for field in WorkoutProgram._meta.concrete_fields
+                if not field.primary_key
+            }
+            values.update(PROGRAM_RESET, title=title, slug=slugify(title), created_by_id=owner.id, **overrides)
+            copies.append(WorkoutProgram(id=uuid4(), **values))
+        return WorkoutProgram.objects.bulk_create(copies)
+
+    @staticmethod
+    def _copy_tree(pairs, owner):
+        """
+        Copy the sessions and workout exercises of every (source, copy) pair
+        in a single INSERT ... SELECT statement. Sessions get their new ids
+        in a materialized CTE, which is also the old -> new session map the
+        workout exercise insert joins on; no row travels through Python.
+        Returns (sessions copied, workout exercises copied).
+        """
+        if not pairs:
+            return 0, 0
+
+        quote = connection.ops.quote_name
+        session_table = quote(WorkoutSession._meta.db_table)
+        exercise_table = quote(WorkoutExercise._meta.db_table)
+        session_columns, session_values = _insert_select(WorkoutSession, SESSION_OVERRIDES)
+        exercise_columns, exercise_values = _insert_select(WorkoutExercise, WORKOUT_EXERCISE_OVERRIDES)
+
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'''
+                WITH program_map (old_id, new_id) AS (
+                    SELECT * FROM unnest(%s::uuid[], %s::uuid[])
+                ),
+                session_map AS MATERIALIZED (
+                    SELECT s.id AS old_id, gen_random_uuid() AS new_id,
+                           m.new_id AS program_id, %s::uuid AS owner_id
+                    FROM {session_table} s
+                    JOIN program_map m ON s.program_id = m.old_id
+                ),
+                new_sessions AS (
+                    INSERT INTO {session_table} ({session_columns})
+                    SELECT {session_values}
+                    FROM {session_table} src
+                    JOIN session_map map ON src.id = map.old_id
+                    RETURNING 1
+                ),
+                new_exercises AS (
+                    INSERT INTO {exercise_table} ({exercise_columns})
+                    SELECT {exercise_values}
+                    FROM {exercise_table} src
+                    JOIN session_map map ON src.session_id = map.old_id
+                    RETURNING 1
+                )
+                SELECT (SELECT count(*) FROM new_sessions), (SELECT count(*) FROM new_exercises)
+                ''',
+                [
+                    [str(source_id) for source_id, _ in pairs],
+                    [str(copy_id) for _, copy_id in pairs],
+                    str(owner.id),
+                ],
+            )
+            return cursor.fetchone()
+
+    @staticmethod
+    def _visible_sources(actor, program_ids):
+        """Own or public programs, in the requested order."""
+        programs = WorkoutProgram.objects.filter(
+            Q(created_by=actor) | Q(is_public=True),
+            id__in=program_ids
+        ).in_bulk()
+        missing = [str(pk) for pk in program_ids if pk not in programs]
+        if missing:
+            raise NotFoundException(f"Workout program {missing[0]} not found.")
+        return [programs[pk] for pk in program_ids]
+
+    @staticmethod
+    @transaction.atomic
+    def clone_programs(actor, program_ids):
+        """Copy each program with its sessions and exercises for `actor`, in a fixed number of queries."""
+        sources = ProgramCloneService._visible_sources(actor, list(program_ids))
+        copies = ProgramCloneService._copy_programs(
+            sources, actor, [f"{source.title} (Copy)" for source in sources]
+        )
+        ProgramCloneService._copy_tree(
+            [(source.id, copy.id) for source, copy in zip(sources, copies)], actor
+        )
+        return copies
+
+    @staticmethod
+    @transaction.atomic
+    def clone_program_for_clients(actor, program_id, client_ids):
+        """
+        One customizable copy of a program per client, owned by the coach.
+        Returns {client_id: program copy}.
+        """
+        source = ProgramCloneService._visible_sources(actor, [program_id])[0]
+
+        relations = CoachClient.objects.filter(
+            coach=actor, client_id__in=client_ids, is_active=True
+        ).select_related('client')
+        clients = {relation.client_id: relation.client for relation in relations}
+        missing = [str(pk) for pk in client_ids if pk not in clients]
+        if missing:
+            raise BadRequestException(f"User {missing[0]} is not one of your active clients.")
+
+        client_ids = list(dict.fromkeys(client_ids))
+        titles = [f"{source.title} ({clients[pk].get_full_name() or clients[pk].username})" for pk in client_ids]
+        copies = ProgramCloneService._copy_programs([source] * len(client_ids), actor, titles, is_custom=True)
+
+        ProgramCloneService._copy_tree([(source.id, copy.id) for copy in copies], actor)
+        return dict(zip(client_ids, copies))
+
+    # ---------------------------
+    # Background
+    # ---------------------------
+    @staticmethod
+    def enqueue_clone_programs(actor, program_ids):
+        """
+        Same as clone_programs, run by a job worker. Access is checked now so
+        the caller gets the 404 instead of a failed job. Returns the Job.
+        """
+        ProgramCloneService._visible_sources(actor, list(program_ids))
+        return JobService.enqueue(
+            CLONE_PROGRAMS_JOB, {'program_ids': [str(pk) for pk in program_ids]}, actor=actor
+        )
+
+    @staticmethod
+    def enqueue_clone_program_for_clients(actor, program_id, client_ids):
+        """Same as clone_program_for_clients, run by a job worker. Returns the Job."""
+        ProgramCloneService._visible_sources(actor, [program_id])
+        return JobService.enqueue(
+            CLONE_FOR_CLIENTS_JOB,
+            {'program_id': str(program_id), 'client_ids': [str(pk) for pk in client_ids]},
+            actor=actor,
+        )
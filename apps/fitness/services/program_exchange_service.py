@@ -0,0 +1,313 @@
+# apps/fitness/services/program_exchange_service.py
+
+import json
+from decimal import Decimal
+from itertools import islice
+from uuid import UUID, uuid4
+
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.db.models import Case, Q, Value, When
+from django.utils.text import slugify
+
+from apps.fitness.models.workout import Exercise, WorkoutExercise, WorkoutProgram, WorkoutSession
+from apps.fitness.services.workout_program_service import SESSION_FIELDS, WORKOUT_EXERCISE_FIELDS
+from config.utils.exceptions import BadRequestException
+
+FORMATS = {
+    'ndjson': 'application/x-ndjson',
+    'msgpack': 'application/msgpack',
+}
+# First record of every stream
+HEADER = {'format': 'fitness-programs', 'version': 1}
+
+# Portable program columns; media, flags and stats stay behind
+PROGRAM_FIELDS = (
+    'title', 'description', 'price', 'off_percent', 'duration', 'level', 'goal',
+    'duration_weeks', 'location', 'equipment',
+)
+EXERCISE_FIELDS = tuple(field for field in WORKOUT_EXERCISE_FIELDS if field != 'exercise_id')
+
+
+def _plain(value):
+    """JSON / MessagePack-safe scalar."""
+    if isinstance(value, (UUID, Decimal)):
+        return str(value)
+    return value
+
+
+def _objects(value, what):
+    """A list of dicts from a record (missing means empty)."""
+    if value is None:
+        return []
+    if not isinstance(value, list) or not all(isinstance(item, dict) for item in value):
+        raise BadRequestException(f"{what} must be a list of objects.")
+    return value
+
+
+def _clean(model, data, fields, label):
+    """
+    The `fields` present in `data`, converted and checked as the model field
+    would (length, choices, type). Missing fields are left to their default;
+    ones without any (e.g. sets) are rejected.
+    """
+    cleaned = {}
+    for name in fields:
+        field = model._meta.get_field(name)
+        if name not in data and (field.has_default() or field.null or field.blank):
+            continue
+        try:
+            cleaned[name] = field.clean(data.get(name), None)
+        except ValidationError as e:
+            raise BadRequestException(f"{label}: {name}: {' '.join(e.messages)}")
+    return cleaned
+
+
+def _msgpack():
+    try:
+        import msgpack
+    except ImportError:
+        raise BadRequestException("MessagePack support requires the msgpack package.")
+    return msgpack
+
+
+class ProgramExchangeService:
+    """
+    Program trees as a stream of self-contained records: a header, then one
+    record per program with its sessions and workout exercises inline.
+    Exercises are referenced by id, slug and name, never copied.
+
+    Both directions work in batches of programs: export reads three flat
+    queries per batch, import writes three bulk INSERTs per batch, so memory
+    depends on the batch size, not on the number of programs.
+    """
+
+    # ---------------------------
+    # Export
+    # ---------------------------
+    @staticmethod
+    def _batch_documents(program_ids):
+        programs = WorkoutProgram.objects.filter(id__in=program_ids).order_by('id').values('id', *PROGRAM_FIELDS)
+        sessions = WorkoutSession.objects.filter(program_id__in=program_ids).order_by(
+            'program_id', 'week_number', 'created_at', 'id'
+        ).values('id', 'program_id', *SESSION_FIELDS)
+        workout_exercises = WorkoutExercise.objects.filter(session__program_id__in=program_ids).order_by(
+            'session_id', 'position', 'id'
+        ).values('session_id', 'exercise_id', 'exercise__slug', 'exercise__name', *EXERCISE_FIELDS)
+
+        exercises_by_session = {}
+        for row in workout_exercises:
+            exercises_by_session.setdefault(row['session_id'], []).append({
+                'exercise': {
+                    'id': str(row['exercise_id']),
+                    'slug': row['exercise__slug'],
+                    'name': row['exercise__name'],
+                },
+                **{field: _plain(row[field]) for field in EXERCISE_FIELDS},
+            })
+
+        sessions_by_program = {}
+        for row in sessions:
+            sessions_by_program.setdefault(row['program_id'], []).append({
+                **{field: _plain(row[field]) for field in SESSION_FIELDS},
+                'exercises': exercises_by_session.get(row['id'], []),
+            })
+
+        for row in programs:
+            yield {
+                'id': str(row['id']),
+                **{field: _plain(row[field]) for field in PROGRAM_FIELDS},
+                'sessions': sessions_by_program.get(row['id'], []),
+            }
+
+    @staticmethod
+    def iter_documents(queryset, batch_size=200):
+        """Program documents of `queryset`, in id order, `batch_size` programs at a time."""
+        ids = queryset.order_by('id').values_list('id', flat=True)
+        last_id = None
+        while True:
+            page = list((ids.filter(id__gt=last_id) if last_id else ids)[:batch_size])
+            if not page:
+                return
+            yield from ProgramExchangeService._batch_documents(page)
+            last_id = page[-1]
+
+    @staticmethod
+    def encode(documents, fmt):
+        """Encoded chunks (one per record) for a StreamingHttpResponse or a file."""
+        if fmt == 'msgpack':
+            packer = _msgpack().Packer()
+            yield packer.pack(HEADER)
+            for document in documents:
+                yield packer.pack(document)
+            return
+
+        yield json.dumps(HEADER).encode() + b'\n'
+        for document in documents:
+            yield json.dumps(document, separators=(',', ':')).encode() + b'\n'
+
+    @staticmethod
+    def export_programs(actor, program_ids=None, fmt='ndjson', batch_size=200):
+        """Encoded stream of the actor's programs (all of them when no ids are given)."""
+        if fmt not in FORMATS:
+            raise BadRequestException(f"format must be one of {', '.join(FORMATS)}")
+        queryset = WorkoutProgram.objects.filter(created_by=actor)
+        if program_ids:
+            queryset = queryset.filter(id__in=program_ids)
+        return ProgramExchangeService.encode(
+            ProgramExchangeService.iter_documents(queryset, batch_size), fmt
+        )
+
+    # ---------------------------
+    # Import
+    # ---------------------------
+    @staticmethod
+    def decode(stream, fmt):
+        """Documents read incrementally from a binary file-like `stream`; checks the header."""
+        if fmt not in FORMATS:
+            raise BadRequestException(f"format must be one of {', '.join(FORMATS)}")
+
+        if fmt == 'msgpack':
+            records = iter(_msgpack().Unpacker(stream, raw=False))
+        else:
+            records = (json.loads(line) for line in stream if line.strip())
+
+        try:
+            header = next(records, None)
+        except ValueError:
+            raise BadRequestException("Stream is not valid " + fmt)
+        if not isinstance(header, dict) or header.get('format') != HEADER['format']:
+            raise BadRequestException("Not a program export stream.")
+        if header.get('version') != HEADER['version']:
+            raise BadRequestException(f"Unsupported export version {header.get('version')}.")
+
+        try:
+            yield from records
+        except ValueError:
+            raise BadRequestException("Stream is not valid " + fmt)
+
+    @staticmethod
+    def _clean_documents(documents):
+        """
+        Documents checked for shape and field values before anything is
+        written, rebuilt from the known keys only; bad input is a 400, not
+        a failed INSERT.
+        """
+        cleaned = []
+        for document in documents:
+            if not isinstance(document, dict):
+                raise BadRequestException("Every record after the header must be a program object.")
+            label = f"Program {document.get('title')!r}"
+            sessions = []
+            for session_data in _objects(document.get('sessions'), f"{label}: sessions"):
+                exercises = []
+                for exercise_data in _objects(session_data.get('exercises'), f"{label}: exercises"):
+                    ref = exercise_data.get('exercise')
+                    if not isinstance(ref, dict) or not any(
+                        isinstance(ref.get(key), str) and ref[key] for key in ('id', 'slug')
+                    ):
+                        raise BadRequestException(f"{label}: every exercise needs an exercise id or slug.")
+                    exercises.append({
+                        'exercise': {key: ref.get(key) if isinstance(ref.get(key), str) else None
+                                     for key in ('id', 'slug', 'name')},
+                        **_clean(WorkoutExercise, exercise_data, EXERCISE_FIELDS, label),
+                    })
+                sessions.append({
+                    **_clean(WorkoutSession, session_data, SESSION_FIELDS, label),
+                    'exercises': exercises,
+                })
+            cleaned.append({**_clean(WorkoutProgram, document, PROGRAM_FIELDS, label), 'sessions': sessions})
+        return cleaned
+
+    @staticmethod
+    def _resolve_exercises(actor, documents):
+        """{reference id or slug: Exercise id} for every exercise the batch references, in one query."""
+        refs = [
+            workout_exercise['exercise']
+            for document in documents
+            for session in document['sessions']
+            for workout_exercise in session['exercises']
+        ]
+        ids = set()
+        for ref in refs:
+            try:
+                ids.add(UUID(ref['id']))
+            except (TypeError, ValueError):
+                pass
+        slugs = {ref['slug'] for ref in refs if ref['slug']}
+
+        rows = Exercise.objects.filter(
+            Q(is_public=True) | Q(created_by=actor),
+            Q(id__in=ids) | Q(slug__in=slugs),
+        ).annotate(
+            preference=Case(When(created_by=actor, then=Value(0)), default=Value(1))
+        ).order_by('preference', 'created_at', 'id').values_list('id', 'slug')
+
+        # Slugs are not unique: the actor's own exercise wins, then the oldest public one
+        resolved = {}
+        for pk, slug in rows:
+            resolved[str(pk)] = pk
+            resolved.setdefault(slug, pk)
+        return resolved
+
+    @staticmethod
+    @transaction.atomic
+    def _import_batch(actor, documents):
+        documents = ProgramExchangeService._clean_documents(documents)
+        resolved = ProgramExchangeService._resolve_exercises(actor, documents)
+
+        programs, sessions, workout_exercises = [], [], []
+        for document in documents:
+            title = document.get('title') or ''
+            program = WorkoutProgram(
+                id=uuid4(),
+                created_by=actor,
+                slug=slugify(title),
+                session_count=len(document['sessions']),
+                **{field: document[field] for field in PROGRAM_FIELDS if field in document},
+            )
+            programs.append(program)
+
+            for session_data in document['sessions']:
+                session = WorkoutSession(
+                    id=uuid4(),
+                    program=program,
+                    created_by=actor,
+                    **{field: session_data[field] for field in SESSION_FIELDS if field in session_data},
+                )
+                session.slug = slugify(session.title)
+                sessions.append(session)
+
+                for position, exercise_data in enumerate(session_data['exercises']):
+                    ref = exercise_data['exercise']
+                    exercise_id = resolved.get(ref['id']) or resolved.get(ref['slug'])
+                    if exercise_id is None:
+                        raise BadRequestException(
+                            f"Program {title!r}: exercise {ref['name'] or ref['id'] or ref['slug']!r} not found."
+                        )
+                    workout_exercises.append(WorkoutExercise(
+                        session=session,
+                        exercise_id=exercise_id,
+                        position=position,
+                        **{field: exercise_data[field] for field in EXERCISE_FIELDS if field in exercise_data},
+                    ))
+
+        WorkoutProgram.objects.bulk_create(programs)
+        WorkoutSession.objects.bulk_create(sessions)
+        WorkoutExercise.objects.bulk_create(workout_exercises)
+        return programs
+
+    @staticmethod
+    def import_programs(actor, documents, batch_size=100):
+        """
+        Create private copies of the documents for `actor`, batch by batch.
+        Each batch commits on its own; wrap the call in a transaction for
+        all-or-nothing. Returns the number of programs created.
+        """
+        documents = iter(documents)
+        created = 0
+        while True:
+            batch = list(islice(documents, batch_size))
+            if not batch:
+                return created
+            created += len(ProgramExchangeService._import_batch(actor, batch))
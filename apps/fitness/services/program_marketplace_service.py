@@ -0,0 +1,131 @@
+# apps/fitness/services/program_marketplace_service.py
+
+from decimal import Decimal, InvalidOperation
+
+from django.db import transaction
+from django.db.models import Avg, Count, F, IntegerField, FloatField, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce, Greatest
+from django.shortcuts import get_object_or_404
+
+from apps.fitness.models.workout import (
+    MARKETPLACE_PROGRAMS,
+    ProgramAssignment,
+    ProgramReview,
+    WorkoutProgram,
+    WorkoutSession,
+)
+from config.utils.exceptions import BadRequestException, ForbiddenException
+
+# ?sort= -> keyset ordering; each one has a partial index on WorkoutProgram
+MARKETPLACE_SORTS = {
+    'popular': ('-assignment_count', '-id'),
+    'newest': ('-created_at', '-id'),
+    'rating': ('-rating_avg', '-rating_count', '-id'),
+}
+
+
+def _per_program(queryset, aggregate, output_field):
+    """Correlated subquery: `aggregate` over the rows of `queryset` for the outer program."""
+    return Coalesce(
+        Subquery(
+            queryset.filter(program=OuterRef('pk')).order_by().values('program').annotate(
+                value=aggregate
+            ).values('value'),
+            output_field=output_field,
+        ),
+        Value(0),
+        output_field=output_field,
+    )
+
+
+class ProgramMarketplaceService:
+
+    @staticmethod
+    def refresh_stats(program_ids):
+        """
+        Recompute the denormalized counters of the given programs in one
+        UPDATE. updated_at is left alone: the stats are not program content.
+        """
+        return WorkoutProgram.objects.filter(id__in=program_ids).update(
+            session_count=_per_program(WorkoutSession.objects.all(), Count('id'), IntegerField()),
+            assignment_count=_per_program(ProgramAssignment.objects.all(), Count('client', distinct=True), IntegerField()),
+            rating_count=_per_program(ProgramReview.objects.all(), Count('id'), IntegerField()),
+            rating_avg=_per_program(ProgramReview.objects.all(), Avg('rating'), FloatField()),
+        )
+
+    @staticmethod
+    def bump_stats(program_id, **deltas):
+        """
+        Add deltas to counters (e.g. assignment_count=1) once the caller's
+        transaction commits, so the hot program row is never locked inside it
+        and nothing is rescanned. refresh_program_stats repairs any drift.
+        """
+        def bump():
+            WorkoutProgram.objects.filter(id=program_id).update(**{
+                field: Greatest(F(field) + delta, 0) for field, delta in deltas.items()
+            })
+
+        transaction.on_commit(bump)
+
+    @staticmethod
+    def _decimal(filters, key):
+        value = filters.get(key)
+        if value in (None, ''):
+            return None
+        try:
+            return Decimal(value)
+        except InvalidOperation:
+            raise BadRequestException(f"{key} must be a number.")
+
+    @staticmethod
+    def list_programs(filters=None):
+        """
+        Published public programs, filtered. Returns (queryset, ordering);
+        the ordering is meant for keyset pagination.
+        """
+        filters = filters or {}
+
+        sort = filters.get('sort') or 'popular'
+        if sort not in MARKETPLACE_SORTS:
+            raise BadRequestException(f"sort must be one of {', '.join(MARKETPLACE_SORTS)}")
+
+        queryset = WorkoutProgram.objects.filter(MARKETPLACE_PROGRAMS).select_related('created_by')
+
+        for field in ('level', 'goal'):
+            if filters.get(field):
+                queryset = queryset.filter(**{field: filters[field]})
+
+        if filters.get('duration_weeks'):
+            try:
+                queryset = queryset.filter(duration_weeks=int(filters['duration_weeks']))
+            except ValueError:
+                raise BadRequestException("duration_weeks must be an integer.")
+
+        price_min = ProgramMarketplaceService._decimal(filters, 'price_min')
+        if price_min is not None:
+            queryset = queryset.filter(price__gte=price_min)
+        price_max = ProgramMarketplaceService._decimal(filters, 'price_max')
+        if price_max is not None:
+            queryset = queryset.filter(price__lte=price_max)
+
+        is_verified = filters.get('is_verified')
+        if is_verified is not None:
+            queryset = queryset.filter(is_verified=str(is_verified).lower() == 'true')
+
+        return queryset, MARKETPLACE_SORTS[sort]
+
+    @staticmethod
+    @transaction.atomic
+    def review_program(*, actor, program_id, rating, comment=''):
+        """Create or replace the actor's review; only clients the program was assigned to may rate it."""
+        program = get_object_or_404(WorkoutProgram, id=program_id)
+
+        if not ProgramAssignment.objects.filter(client=actor, program=program).exists():
+            raise ForbiddenException("You can only review programs assigned to you.")
+
+        review, _ = ProgramReview.objects.update_or_create(
+            program=program, user=actor,
+            defaults={'rating': rating, 'comment': comment},
+        )
+        ProgramMarketplaceService.refresh_stats([program.id])
+        return review
@@ -0,0 +1,100 @@
+# apps/fitness/services/program_snapshot_service.py
+
+import hashlib
+
+from django.core.cache import cache
+from django.db.models import Count, Max, Prefetch
+from rest_framework.renderers import JSONRenderer
+
+from apps.fitness.models.workout import MuscleGroup, WorkoutExercise, WorkoutProgram, WorkoutSession
+from apps.fitness.serializers.workout_program import WorkoutProgramDeepSerializer
+from apps.fitness.services.exercise_service import exercise_prefetch_plan
+from apps.fitness.services.media_url_service import MediaUrlService
+from apps.fitness.services.taxonomy_cache import TaxonomyCache
+from config.utils.conditional import version_etag
+from config.utils.exceptions import NotFoundException
+
+
+class ProgramSnapshotService:
+    """
+    Deep program documents (WorkoutProgramDeepSerializer) compiled once and
+    kept in the cache as encoded JSON bytes.
+
+    The cache key embeds the program's aggregate version: its own
+    updated_at, the latest session, workout exercise and exercise
+    updated_at, and the row counts (so deletes move it too). Signals touch the program's updated_at
+    when a session or workout exercise is written, and the exercise's when
+    its media, muscle groups or modalities change, so any edit lands on a
+    new key. Old keys simply expire.
+    """
+
+    @staticmethod
+    def _timeout():
+        # The document embeds signed media URLs; expire it before they do
+        return max(1, MediaUrlService.ttl() // 2)
+
+    @staticmethod
+    def version(program_id):
+        """One aggregate query; None when the program does not exist."""
+        row = WorkoutProgram.objects.filter(id=program_id).values('id', 'updated_at').annotate(
+            session_count=Count('sessions', distinct=True),
+            sessions_updated=Max('sessions__updated_at'),
+            exercise_count=Count('sessions__exercises', distinct=True),
+            # workout exercises directly too: bulk writers need not touch the program
+            workout_exercises_updated=Max('sessions__exercises__updated_at'),
+            exercises_updated=Max('sessions__exercises__exercise__updated_at'),
+        ).order_by('id').first()
+        if row is None:
+            return None
+        # muscle group titles are rendered from the taxonomy cache
+        row['taxonomy'] = TaxonomyCache.table(MuscleGroup).version()
+        return row
+
+    @staticmethod
+    def _cache_key(program_id, version):
+        digest = hashlib.sha1(repr(sorted(version.items())).encode()).hexdigest()
+        return f'program-snapshot:{program_id}:{digest}'
+
+    @staticmethod
+    def get_program_tree(program_id):
+        """Program with everything the deep serializer renders, in a fixed number of queries."""
+        program = WorkoutProgram.objects.filter(id=program_id).prefetch_related(
+            Prefetch(
+                'sessions',
+                queryset=WorkoutSession.objects.prefetch_related(
+                    Prefetch(
+                        'exercises',
+                        queryset=WorkoutExercise.objects.select_related('exercise').prefetch_related(
+                            *exercise_prefetch_plan('exercise__')
+                        ),
+                    )
+                ),
+            )
+        ).first()
+        if not program:
+            raise NotFoundException("Workout program not found.")
+        return program
+
+    @staticmethod
+    def etag(program_id, version):
+        """ETag of the document for `version`; it embeds signed URLs, so the media epoch too."""
+        return version_etag(program_id, sorted(version.items()), MediaUrlService.epoch())
+
+    @staticmethod
+    def encoded(program_id, version=None):
+        """
+        The deep program document as JSON bytes, compiled on a cache miss.
+        Pass the `version` when the caller already computed it.
+        """
+        if version is None:
+            version = ProgramSnapshotService.version(program_id)
+        if version is None:
+            raise NotFoundException("Workout program not found.")
+
+        key = ProgramSnapshotService._cache_key(program_id, version)
+        document = cache.get(key)
+        if document is None:
+            program = ProgramSnapshotService.get_program_tree(program_id)
+            document = JSONRenderer().render(WorkoutProgramDeepSerializer(program).data)
+            cache.set(key, document, timeout=ProgramSnapshotService._timeout())
+        return document
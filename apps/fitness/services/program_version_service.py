@@ -0,0 +1,199 @@
+# apps/fitness/services/program_version_service.py
+
+import hashlib
+import json
+import zlib
+
+from django.db import transaction
+
+from apps.fitness.models.workout import MuscleGroup, ProgramAssignment, ProgramVersion, WorkoutProgram
+from apps.fitness.services.media_url_service import MediaUrlService
+from apps.fitness.services.program_snapshot_service import ProgramSnapshotService
+from apps.fitness.services.taxonomy_cache import TaxonomyCache
+from config.utils.exceptions import NotFoundException
+
+PROGRAM_FIELDS = (
+    'id', 'title', 'description', 'level', 'goal', 'duration', 'duration_weeks',
+    'location', 'equipment',
+)
+SESSION_FIELDS = (
+    'id', 'title', 'notes', 'week_number', 'session_type', 'duration', 'intensity', 'is_rest_day',
+)
+WORKOUT_EXERCISE_FIELDS = ('id', 'sets', 'reps', 'duration', 'rest_time', 'tempo')
+CLIENT_SESSION_FIELDS = ('id', 'title', 'week_number', 'duration', 'intensity', 'is_rest_day')
+EXERCISE_FIELDS = (
+    'id', 'name', 'slug', 'instructions', 'category_id', 'training_system_id', 'level', 'intensity',
+)
+
+
+def _pick(instance, fields):
+    return {field: getattr(instance, field) for field in fields}
+
+
+class ProgramVersionService:
+
+    @staticmethod
+    def compile(program_id):
+        """Compact version document of the live program (media as storage names)."""
+        program = ProgramSnapshotService.get_program_tree(program_id)
+
+        document = _pick(program, PROGRAM_FIELDS)
+        document['video'] = program.video.name or None
+        document['sessions'] = []
+        for session in program.sessions.all():
+            exercises = []
+            for workout_exercise in session.exercises.all():
+                exercise = workout_exercise.exercise
+                exercises.append({
+                    **_pick(workout_exercise, WORKOUT_EXERCISE_FIELDS),
+                    'exercise': {
+                        **_pick(exercise, EXERCISE_FIELDS),
+                        'modalities': [modality.id for modality in exercise.modalities.all()],
+                        'muscle_groups': [
+                            {'id': entry.muscle_group_id, 'is_primary': entry.is_primary}
+                            for entry in exercise.exercise_muscle_entries.all()
+                        ],
+                        'images': [image.image_file.name for image in exercise.images.all()],
+                        'videos': [video.video_file.name for video in exercise.videos.all()],
+                    },
+                })
+            document['sessions'].append({**_pick(session, SESSION_FIELDS), 'exercises': exercises})
+
+        return json.dumps(document, sort_keys=True, separators=(',', ':'), default=str).encode()
+
+    @staticmethod
+    @transaction.atomic
+    def freeze(program, actor=None):
+        """
+        Freeze the program as it is now. Returns the latest version unchanged
+        when the content did not move since, so repeated assigns share one row.
+        """
+        # Serialize version numbering per program
+        WorkoutProgram.objects.select_for_update().filter(id=program.id).values('id').first()
+
+        encoded = ProgramVersionService.compile(program.id)
+        checksum = hashlib.sha256(encoded).hexdigest()
+
+        latest = ProgramVersion.objects.filter(program=program).defer('document').order_by('-number').first()
+        if latest and latest.checksum == checksum:
+            return latest
+
+        return ProgramVersion.objects.create(
+            program=program,
+            number=(latest.number + 1) if latest else 1,
+            document=zlib.compress(encoded),
+            checksum=checksum,
+            created_by=actor,
+        )
+
+    @staticmethod
+    def pin(assignment, actor=None):
+        """Point the assignment at the program's current version."""
+        assignment.program_version = ProgramVersionService.freeze(assignment.program, actor)
+        assignment.save(update_fields=['program_version', 'updated_at'])
+        return assignment.program_version
+
+    @staticmethod
+    def load(version):
+        """The stored version document, decoded (media still as storage names)."""
+        return json.loads(zlib.decompress(bytes(version.document)))
+
+    @staticmethod
+    def live(program_id):
+        """Decoded document of the live program, for assignments not pinned yet."""
+        return json.loads(ProgramVersionService.compile(program_id))
+
+    @staticmethod
+    def pin_missing(assignments=None, batch_size=200):
+        """
+        Pin assignments created before versioning (all of them by default).
+        Reads fall back to the live program until this ran; returns the count.
+        """
+        if assignments is None:
+            assignments = ProgramAssignment.objects.all()
+        pending = assignments.filter(program_version__isnull=True).select_related('program', 'coach')
+        count = 0
+        for assignment in pending.order_by('id').iterator(chunk_size=batch_size):
+            ProgramVersionService.pin(assignment, assignment.coach)
+            count += 1
+        return count
+
+    @staticmethod
+    def render(version):
+        """Decoded version document with media names turned into URLs (one batch)."""
+        document = ProgramVersionService.with_urls(ProgramVersionService.load(version))
+        document['version'] = version.number
+        return document
+
+    @staticmethod
+    def render_live(program_id):
+        """The live program rendered like a version; `version` is None."""
+        document = ProgramVersionService.with_urls(ProgramVersionService.live(program_id))
+        document['version'] = None
+        return document
+
+    @staticmethod
+    def with_urls(document):
+        """Turn the media names of a decoded document into URLs (one batch)."""
+        exercises = [
+            workout_exercise['exercise']
+            for session in document['sessions']
+            for workout_exercise in session['exercises']
+        ]
+
+        urls = MediaUrlService.urls(
+            [document['video']]
+            + [name for exercise in exercises for name in exercise['images'] + exercise['videos']]
+        )
+        document['video'] = urls.get(document['video'])
+        for exercise in exercises:
+            exercise['images'] = [urls[name] for name in exercise['images'] if name in urls]
+            exercise['videos'] = [urls[name] for name in exercise['videos'] if name in urls]
+            for entry in exercise['muscle_groups']:
+                entry['title'] = TaxonomyCache.title(MuscleGroup, entry['id'])
+        return document
+
+    @staticmethod
+    def get_client_program(actor, assignment_id):
+        """
+        The program an assignment is pinned to: a single-row read of the
+        version. Assignments not pinned yet (see pin_missing) get the live
+        program; reads never write.
+        """
+        assignment = ProgramAssignment.objects.select_related(
+            'program', 'program_version'
+        ).filter(id=assignment_id, client=actor).first()
+        if not assignment:
+            raise NotFoundException("Assignment not found.")
+
+        if assignment.program_version is None:
+            return assignment, ProgramVersionService.render_live(assignment.program_id)
+        return assignment, ProgramVersionService.render(assignment.program_version)
+
+    @staticmethod
+    def get_client_sessions(actor):
+        """
+        Sessions of the client's active assignments as pinned, in assignment
+        order: one query for the assignments with their version documents.
+        Assignments not pinned yet list the live program's sessions.
+        """
+        assignments = ProgramAssignment.objects.filter(
+            client=actor, is_active=True
+        ).select_related('program', 'program_version').order_by('assigned_at', 'id')
+
+        sessions = []
+        for assignment in assignments:
+            version = assignment.program_version
+            if version is None:
+                document = ProgramVersionService.live(assignment.program_id)
+            else:
+                document = ProgramVersionService.load(version)
+            for session in document['sessions']:
+                sessions.append({
+                    **{field: session[field] for field in CLIENT_SESSION_FIELDS},
+                    'program': assignment.program_id,
+                    'program_title': document['title'],
+                    'assignment': assignment.id,
+                    'version': version.number if version else None,
+                })
+        return sessions
@@ -0,0 +1,192 @@
+# apps/fitness/services/sync_service.py
+
+import base64
+import json
+from datetime import timedelta
+
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from apps.fitness.models.sync_tombstone import SyncTombstone
+from apps.fitness.models.workout import (
+    Exercise,
+    ProgramAssignment,
+    ProgramVersion,
+    WorkoutExercise,
+    WorkoutProgram,
+    WorkoutSession,
+)
+from apps.fitness.services.program_version_service import (
+    EXERCISE_FIELDS,
+    PROGRAM_FIELDS,
+    SESSION_FIELDS,
+    WORKOUT_EXERCISE_FIELDS,
+    ProgramVersionService,
+)
+from config.utils.exceptions import BadRequestException
+
+# Rows committed shortly before a sync may carry an older updated_at than
+# rows already returned; the next cursor starts this far back to catch them.
+SYNC_OVERLAP = timedelta(seconds=30)
+SYNC_TOMBSTONE_RETENTION = timedelta(days=90)
+
+ASSIGNMENT_FIELDS = ('id', 'program_id', 'coach_id', 'program_version_id', 'assigned_at', 'is_active', 'updated_at')
+SYNC_PROGRAM_FIELDS = (*PROGRAM_FIELDS, 'created_by_id', 'updated_at')
+SYNC_SESSION_FIELDS = (*SESSION_FIELDS, 'program_id', 'updated_at')
+SYNC_WORKOUT_EXERCISE_FIELDS = (*WORKOUT_EXERCISE_FIELDS, 'session_id', 'exercise_id', 'position', 'updated_at')
+SYNC_EXERCISE_FIELDS = (*EXERCISE_FIELDS, 'is_active', 'updated_at')
+
+# Response key per tombstone kind
+DELETED_KEYS = {
+    SyncTombstone.Kind.ASSIGNMENT: 'assignments',
+    SyncTombstone.Kind.PROGRAM: 'programs',
+    SyncTombstone.Kind.SESSION: 'sessions',
+    SyncTombstone.Kind.WORKOUT_EXERCISE: 'workout_exercises',
+    SyncTombstone.Kind.EXERCISE: 'exercises',
+}
+
+
+class SyncService:
+    """
+    Delta sync for offline clients.
+
+    The cursor is a high-water mark on updated_at. A sync returns what
+    changed since then, plus the tombstones recorded since then:
+    - the user's active assignments, each with the program version it is
+      pinned to (the whole version document, under `versions`), so
+      assigned programs sync exactly as the client sees them online;
+    - the user's own programs as live rows (programs, sessions, workout
+      exercises and their exercises), and assigned programs whose
+      assignment is not pinned yet.
+    Rows may be repeated across syncs (see SYNC_OVERLAP); clients apply
+    them as upserts.
+    """
+
+    # ---------------------------
+    # Tombstones
+    # ---------------------------
+    @staticmethod
+    def record(entries, program_id=None, user_id=None):
+        """One INSERT for [(kind, object_id)] deleted from `program_id` (owned by `user_id`)."""
+        return SyncTombstone.objects.bulk_create([
+            SyncTombstone(kind=kind, object_id=str(object_id), program_id=program_id, user_id=user_id)
+            for kind, object_id in entries
+        ])
+
+    @staticmethod
+    def record_unassigned(assignments):
+        """Tombstones addressed to the clients of deactivated or deleted assignments."""
+        return SyncTombstone.objects.bulk_create([
+            SyncTombstone(
+                kind=SyncTombstone.Kind.ASSIGNMENT,
+                object_id=str(assignment.id),
+                program_id=assignment.program_id,
+                user_id=assignment.client_id,
+            )
+            for assignment in assignments
+        ])
+
+    @staticmethod
+    def prune(before=None):
+        """Drop tombstones older than the retention; returns how many."""
+        before = before or timezone.now() - SYNC_TOMBSTONE_RETENTION
+        return SyncTombstone.objects.filter(deleted_at__lt=before).delete()[0]
+
+    # ---------------------------
+    # Cursor
+    # ---------------------------
+    @staticmethod
+    def encode_cursor(since):
+        payload = json.dumps({'since': since.isoformat()}).encode()
+        return base64.urlsafe_b64encode(payload).decode().rstrip('=')
+
+    @staticmethod
+    def decode_cursor(cursor):
+        """The cursor's watermark; None (full sync) for no cursor or one older than the tombstones."""
+        if not cursor:
+            return None
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+            since = parse_datetime(payload['since'])
+        except (TypeError, ValueError, KeyError):
+            since = None
+        if since is None or timezone.is_naive(since):
+            raise BadRequestException("Invalid sync cursor.")
+        if since < timezone.now() - SYNC_TOMBSTONE_RETENTION:
+            return None
+        return since
+
+    # ---------------------------
+    # Sync
+    # ---------------------------
+    @staticmethod
+    def changes(actor, cursor=None):
+        since = SyncService.decode_cursor(cursor)
+        now = timezone.now()
+
+        assigned = ProgramAssignment.objects.filter(client=actor, is_active=True)
+        # Own programs sync live, and so do assigned ones not pinned yet
+        # (ProgramVersionService.pin_missing); pinning touches the assignment,
+        # which then brings its version along
+        program_ids = WorkoutProgram.objects.filter(
+            Q(created_by=actor) | Q(id__in=assigned.filter(program_version__isnull=True).values('program_id'))
+        ).values('id')
+
+        def changed(queryset):
+            return queryset if since is None else queryset.filter(updated_at__gt=since)
+
+        assignments = list(changed(assigned).order_by('id').values(*ASSIGNMENT_FIELDS))
+        versions = ProgramVersion.objects.filter(
+            id__in={row['program_version_id'] for row in assignments}
+        ).order_by('id')
+
+        programs = changed(WorkoutProgram.objects.filter(id__in=program_ids))
+        sessions = changed(WorkoutSession.objects.filter(program_id__in=program_ids))
+        workout_exercises = list(changed(
+            WorkoutExercise.objects.filter(session__program_id__in=program_ids)
+        ).order_by('id').values(*SYNC_WORKOUT_EXERCISE_FIELDS))
+
+        # Exercises of the rows above, and any used in own programs that changed since
+        exercises = Q(id__in={row['exercise_id'] for row in workout_exercises})
+        if since is not None:
+            exercises |= Q(updated_at__gt=since, id__in=WorkoutExercise.objects.filter(
+                session__program_id__in=program_ids
+            ).values('exercise_id'))
+
+        result = {
+            'assignments': assignments,
+            'programs': list(programs.order_by('id').values(*SYNC_PROGRAM_FIELDS)),
+            'sessions': list(sessions.order_by('id').values(*SYNC_SESSION_FIELDS)),
+            'workout_exercises': workout_exercises,
+            'exercises': list(Exercise.objects.filter(exercises).order_by('id').values(*SYNC_EXERCISE_FIELDS)),
+        }
+
+        deleted = {key: {} for key in DELETED_KEYS.values()}
+        if since is not None:
+            tombstones = SyncTombstone.objects.filter(deleted_at__gt=since).filter(
+                # private exercise tombstones carry their owner's user
+                Q(user=actor) | Q(program_id__in=program_ids) | Q(kind=SyncTombstone.Kind.EXERCISE, user__isnull=True)
+            ).order_by('deleted_at').values_list('kind', 'object_id')
+            # A row sent above outlived its tombstone (e.g. a reactivated assignment)
+            live = {key: {str(row['id']) for row in rows} for key, rows in result.items()}
+            for kind, object_id in tombstones:
+                key = DELETED_KEYS[kind]
+                if object_id not in live[key]:
+                    deleted[key][object_id] = None
+
+        return {
+            'cursor': SyncService.encode_cursor(now - SYNC_OVERLAP),
+            'full': since is None,
+            **result,
+            'versions': [
+                {
+                    'id': version.id,
+                    'program_id': version.program_id,
+                    'number': version.number,
+                    'document': ProgramVersionService.render(version),
+                }
+                for version in versions
+            ],
+            'deleted': {key: list(ids) for key, ids in deleted.items()},
+        }
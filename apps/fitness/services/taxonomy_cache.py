@@ -0,0 +1,180 @@
+# apps/fitness/services/taxonomy_cache.py
+
+import hashlib
+import json
+import threading
+import time
+
+from django.db import transaction
+
+from apps.fitness.models.workout import Category, Equipment, Modality, MuscleGroup, TrainingSystem
+from config.utils.exceptions import BadRequestException
+from config.utils.version_stamp import VersionStamp
+
+# Seconds a process trusts its copy without looking at the shared stamp.
+# Local writes drop the copy immediately; other processes see them within this window.
+REVALIDATE_SECONDS = 1.0
+
+TAXONOMY_FIELDS = {
+    Category: ('id', 'title'),
+    Modality: ('id', 'title'),
+    Equipment: ('id', 'title', 'icon'),
+    TrainingSystem: ('id', 'title'),
+    MuscleGroup: ('id', 'title', 'parent_id', 'path', 'depth'),
+}
+
+
+class TaxonomyTable:
+    """
+    One reference table held in process memory, loaded with a single query
+    and reloaded when its version stamp moves.
+    """
+
+    def __init__(self, model, fields):
+        self.model = model
+        self.fields = fields
+        self.stamp = VersionStamp(f'fitness:taxonomy:{model._meta.model_name}')
+        self._version = None
+        self._checked_at = 0.0
+        self._rows = None
+        self._by_id = None
+        self._by_title = None
+        self._lock = threading.Lock()
+
+    def _fresh(self):
+        if self._rows is None:
+            return False
+        if time.monotonic() - self._checked_at < REVALIDATE_SECONDS:
+            return True
+        if self.stamp.get() != self._version:
+            return False
+        self._checked_at = time.monotonic()
+        return True
+
+    def _load(self):
+        if self._fresh():
+            return
+        with self._lock:
+            if self._fresh():
+                return
+            # Read the stamp first: a write racing the query bumps it again
+            version = self.stamp.get()
+            rows = list(self.model.objects.order_by('pk').values(*self.fields))
+            by_title = {}
+            for row in rows:
+                by_title.setdefault(row['title'].strip().lower(), row)
+
+            self._by_id = {row['id']: row for row in rows}
+            self._by_title = by_title
+            self._rows = rows
+            self._version = version
+            self._checked_at = time.monotonic()
+
+    def invalidate(self):
+        self._rows = None
+        self.stamp.bump()
+        # Again once committed, so no process keeps rows it read mid-transaction
+        transaction.on_commit(self.stamp.bump)
+
+    def version(self):
+        self._load()
+        return self._version
+
+    def all(self):
+        self._load()
+        return self._rows
+
+    def get(self, pk):
+        self._load()
+        return self._by_id.get(pk)
+
+    def find(self, value):
+        """Row matching an id or a case-insensitive title."""
+        if value in (None, ''):
+            return None
+        self._load()
+        key = str(value).strip()
+        return self._by_id.get(key) or self._by_id.get(key.lower()) or self._by_title.get(key.lower())
+
+
+class TaxonomyCache:
+    """
+    Read-through cache for Category, Modality, Equipment, TrainingSystem and
+    MuscleGroup. Signals invalidate a table on save/delete.
+    """
+
+    tables = {model: TaxonomyTable(model, fields) for model, fields in TAXONOMY_FIELDS.items()}
+
+    _snapshot = None
+    _snapshot_versions = None
+
+    @classmethod
+    def table(cls, model):
+        return cls.tables[model]
+
+    @classmethod
+    def get(cls, model, pk):
+        return cls.tables[model].get(pk)
+
+    @classmethod
+    def title(cls, model, pk):
+        row = cls.tables[model].get(pk)
+        return row['title'] if row else None
+
+    @classmethod
+    def resolve(cls, model, value):
+        """Primary key for an id or title; BadRequestException when unknown."""
+        if value in (None, ''):
+            return None
+        row = cls.tables[model].find(value)
+        if row is None:
+            raise BadRequestException(f"Unknown {model.__name__} '{value}'")
+        return row['id']
+
+    @classmethod
+    def invalidate(cls, model):
+        cls.tables[model].invalidate()
+
+    @classmethod
+    def clear(cls):
+        for table in cls.tables.values():
+            table._rows = None
+        cls._snapshot = None
+
+    @staticmethod
+    def _muscle_tree(rows):
+        nodes = {
+            row['id']: {'id': row['id'], 'title': row['title'], 'children': []}
+            for row in rows
+        }
+        roots = []
+        # Sorted by path so parents are attached before their children
+        for row in sorted(rows, key=lambda row: (row['path'], row['id'])):
+            parent = nodes.get(row['parent_id'])
+            (parent['children'] if parent else roots).append(nodes[row['id']])
+        return roots
+
+    @classmethod
+    def snapshot(cls):
+        """
+        The whole taxonomy as (payload, etag). The ETag is a hash of the
+        payload, so every process hands out the same one for the same data.
+        """
+        versions = tuple(table.version() for table in cls.tables.values())
+        snapshot = cls._snapshot
+        if snapshot is not None and cls._snapshot_versions == versions:
+            return snapshot
+
+        payload = {
+            'categories': [{'id': r['id'], 'title': r['title']} for r in cls.tables[Category].all()],
+            'modalities': [{'id': r['id'], 'title': r['title']} for r in cls.tables[Modality].all()],
+            'equipment': [{'id': r['id'], 'title': r['title'], 'icon': r['icon']} for r in cls.tables[Equipment].all()],
+            'training_systems': [{'id': r['id'], 'title': r['title']} for r in cls.tables[TrainingSystem].all()],
+            'muscle_groups': cls._muscle_tree(cls.tables[MuscleGroup].all()),
+        }
+        encoded = json.dumps(payload, sort_keys=True, separators=(',', ':')).encode()
+        etag = f'"{hashlib.sha1(encoded).hexdigest()}"'
+
+        cls._snapshot = (payload, etag)
+        cls._snapshot_versions = versions
+        return cls._snapshot
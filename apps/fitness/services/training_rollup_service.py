@@ -0,0 +1,209 @@
+# apps/fitness/services/training_rollup_service.py
+
+from datetime import timedelta
+from uuid import UUID
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import F, Sum
+from django.db.models.functions import TruncWeek
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+
+from apps.fitness.models.coach_client import CoachClient
+from apps.fitness.models.workout import ExerciseMuscleGroup, MuscleGroup
+from apps.fitness.models.workout_log import (
+    ExerciseDailyVolume,
+    MuscleGroupWeeklyVolume,
+    PerformedSet,
+    PersonalRecord,
+)
+from apps.fitness.services.taxonomy_cache import TaxonomyCache
+from config.utils.exceptions import BadRequestException, ForbiddenException
+
+DEFAULT_RANGE_WEEKS = 12
+MAX_RANGE_DAYS = 366
+PERIODS = ('day', 'week')
+
+
+def _tables():
+    quote = connection.ops.quote_name
+    return {
+        'sets': quote(PerformedSet._meta.db_table),
+        'muscles': quote(ExerciseMuscleGroup._meta.db_table),
+        'daily': quote(ExerciseDailyVolume._meta.db_table),
+        'weekly': quote(MuscleGroupWeeklyVolume._meta.db_table),
+        'records': quote(PersonalRecord._meta.db_table),
+    }
+
+
+# Each statement folds the sets matching {condition} into a rollup: the new
+# totals are added to the stored ones (records keep the better value).
+DAILY_SQL = '''
+    INSERT INTO {daily} AS r (client_id, exercise_id, day, set_count, rep_count, volume, duration_seconds)
+    SELECT s.client_id, s.exercise_id, (s.performed_at AT TIME ZONE %(tz)s)::date,
+           count(*), coalesce(sum(s.reps), 0), coalesce(sum(s.weight * s.reps), 0),
+           coalesce(sum(s.duration_seconds), 0)
+    FROM {sets} s
+    WHERE {condition}
+    GROUP BY 1, 2, 3
+    ON CONFLICT (client_id, exercise_id, day) DO UPDATE SET
+        set_count = r.set_count + EXCLUDED.set_count,
+        rep_count = r.rep_count + EXCLUDED.rep_count,
+        volume = r.volume + EXCLUDED.volume,
+        duration_seconds = r.duration_seconds + EXCLUDED.duration_seconds
+'''
+WEEKLY_SQL = '''
+    INSERT INTO {weekly} AS r (client_id, muscle_group_id, week, set_count, primary_set_count, volume)
+    SELECT s.client_id, m.muscle_group_id, date_trunc('week', s.performed_at AT TIME ZONE %(tz)s)::date,
+           count(*), count(*) FILTER (WHERE m.is_primary), coalesce(sum(s.weight * s.reps), 0)
+    FROM {sets} s
+    JOIN {muscles} m ON m.exercise_id = s.exercise_id
+    WHERE {condition}
+    GROUP BY 1, 2, 3
+    ON CONFLICT (client_id, muscle_group_id, week) DO UPDATE SET
+        set_count = r.set_count + EXCLUDED.set_count,
+        primary_set_count = r.primary_set_count + EXCLUDED.primary_set_count,
+        volume = r.volume + EXCLUDED.volume
+'''
+RECORDS_SQL = '''
+    INSERT INTO {records} AS r (
+        client_id, exercise_id, max_weight, max_weight_reps, max_weight_at,
+        best_e1rm, best_e1rm_at, max_reps, updated_at
+    )
+    SELECT client_id, exercise_id,
+           max(weight),
+           (array_agg(reps ORDER BY weight DESC, reps DESC NULLS LAST, performed_at)
+                FILTER (WHERE weight IS NOT NULL))[1],
+           (array_agg(performed_at ORDER BY weight DESC, reps DESC NULLS LAST, performed_at)
+                FILTER (WHERE weight IS NOT NULL))[1],
+           max(e1rm),
+           (array_agg(performed_at ORDER BY e1rm DESC, performed_at) FILTER (WHERE e1rm IS NOT NULL))[1],
+           max(reps),
+           now()
+    FROM (
+        SELECT s.client_id, s.exercise_id, s.weight, s.reps, s.performed_at,
+               CASE WHEN s.reps > 1 THEN round(s.weight * (1 + s.reps / 30.0), 2)
+                    WHEN s.reps = 1 THEN s.weight END AS e1rm
+        FROM {sets} s
+        WHERE {condition}
+    ) s
+    GROUP BY 1, 2
+    ON CONFLICT (client_id, exercise_id) DO UPDATE SET
+        max_weight = GREATEST(r.max_weight, EXCLUDED.max_weight),
+        max_weight_reps = CASE WHEN r.max_weight IS NULL OR EXCLUDED.max_weight > r.max_weight
+                               THEN EXCLUDED.max_weight_reps ELSE r.max_weight_reps END,
+        max_weight_at = CASE WHEN r.max_weight IS NULL OR EXCLUDED.max_weight > r.max_weight
+                             THEN EXCLUDED.max_weight_at ELSE r.max_weight_at END,
+        best_e1rm = GREATEST(r.best_e1rm, EXCLUDED.best_e1rm),
+        best_e1rm_at = CASE WHEN r.best_e1rm IS NULL OR EXCLUDED.best_e1rm > r.best_e1rm
+                            THEN EXCLUDED.best_e1rm_at ELSE r.best_e1rm_at END,
+        max_reps = GREATEST(r.max_reps, EXCLUDED.max_reps),
+        updated_at = now()
+'''
+
+
+class TrainingRollupService:
+    """
+    Training volume and personal records, kept in rollup tables so the
+    coach dashboards never aggregate raw sets.
+
+    New sets are folded in incrementally (three INSERT ... ON CONFLICT
+    statements per upload). Days and weeks are in settings.TIME_ZONE.
+    Rollups only add up; rebuild() recomputes them from the sets, e.g.
+    after an exercise's muscle groups changed.
+    """
+
+    @staticmethod
+    def _fold(condition, params):
+        tables = _tables()
+        params = {'tz': settings.TIME_ZONE, **params}
+        with connection.cursor() as cursor:
+            for statement in (DAILY_SQL, WEEKLY_SQL, RECORDS_SQL):
+                cursor.execute(statement.format(condition=condition, **tables), params)
+
+    @staticmethod
+    def apply_sets(set_ids):
+        """Add newly stored sets to the rollups. Each set must be applied exactly once."""
+        if set_ids:
+            TrainingRollupService._fold('s.id = ANY(%(ids)s::uuid[])', {'ids': [str(pk) for pk in set_ids]})
+
+    @staticmethod
+    @transaction.atomic
+    def rebuild(client_ids):
+        """Recompute the rollups of these clients from their performed sets."""
+        client_ids = [str(pk) for pk in client_ids]
+        for model in (ExerciseDailyVolume, MuscleGroupWeeklyVolume, PersonalRecord):
+            model.objects.filter(client_id__in=client_ids).delete()
+        TrainingRollupService._fold('s.client_id = ANY(%(ids)s::uuid[])', {'ids': client_ids})
+        return len(client_ids)
+
+    # ---------------------------
+    # Reads (rollups only)
+    # ---------------------------
+    @staticmethod
+    def _check_access(actor, client_id):
+        if actor.id == client_id:
+            return
+        if not (actor.is_coach and CoachClient.objects.filter(
+            coach=actor, client_id=client_id, is_active=True
+        ).exists()):
+            raise ForbiddenException("You are not allowed to view this client's training data.")
+
+    @staticmethod
+    def date_range(start=None, end=None):
+        """Validated (start, end) from query strings; defaults to the last twelve weeks."""
+        try:
+            end = parse_date(end) if end else timezone.localdate()
+            start = parse_date(start) if start else end and end - timedelta(weeks=DEFAULT_RANGE_WEEKS, days=-1)
+        except ValueError:
+            start = end = None
+        if start is None or end is None:
+            raise BadRequestException("from and to must be dates (YYYY-MM-DD).")
+        if end < start:
+            raise BadRequestException("to must not be before from.")
+        if (end - start).days >= MAX_RANGE_DAYS:
+            raise BadRequestException(f"The range is limited to {MAX_RANGE_DAYS} days.")
+        return start, end
+
+    @staticmethod
+    def volume(actor, client_id, start, end, period='week', exercise_id=None):
+        """Volume totals per day or week (Monday) between start and end, inclusive."""
+        if period not in PERIODS:
+            raise BadRequestException(f"period must be one of: {', '.join(PERIODS)}.")
+        TrainingRollupService._check_access(actor, client_id)
+
+        rows = ExerciseDailyVolume.objects.filter(client_id=client_id, day__gte=start, day__lte=end)
+        if exercise_id:
+            try:
+                rows = rows.filter(exercise_id=UUID(str(exercise_id)))
+            except ValueError:
+                raise BadRequestException("exercise_id must be a UUID.")
+        bucket = TruncWeek('day') if period == 'week' else F('day')
+        return list(
+            rows.annotate(period=bucket).values('period').annotate(
+                set_count=Sum('set_count'),
+                rep_count=Sum('rep_count'),
+                volume=Sum('volume'),
+                duration_seconds=Sum('duration_seconds'),
+            ).order_by('period')
+        )
+
+    @staticmethod
+    def muscle_groups(actor, client_id, start, end):
+        """Weekly load per muscle group for the weeks overlapping start..end."""
+        TrainingRollupService._check_access(actor, client_id)
+        rows = MuscleGroupWeeklyVolume.objects.filter(
+            client_id=client_id, week__gte=start - timedelta(days=start.weekday()), week__lte=end
+        ).order_by('week', 'muscle_group_id').values(
+            'week', 'muscle_group_id', 'set_count', 'primary_set_count', 'volume'
+        )
+        return [
+            {**row, 'muscle_group_title': TaxonomyCache.title(MuscleGroup, row['muscle_group_id'])}
+            for row in rows
+        ]
+
+    @staticmethod
+    def records(actor, client_id):
+        TrainingRollupService._check_access(actor, client_id)
+        return PersonalRecord.objects.filter(client_id=client_id).select_related('exercise').order_by('exercise__name')
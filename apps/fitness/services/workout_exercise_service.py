@@ -1,7 +1,18 @@
 # apps/fitness/services/workout_exercise_service.py
 
-from apps.fitness.models.workout import WorkoutExercise, WorkoutSession
-from config.utils.exceptions import NotFoundException, ForbiddenException
+from uuid import uuid4
+
+from django.db import transaction
+from django.db.models import Max
+from django.utils import timezone
+
+from apps.fitness.models.sync_tombstone import SyncTombstone
+from apps.fitness.models.workout import Exercise, WorkoutExercise, WorkoutProgram, WorkoutSession
+from apps.fitness.services.sync_service import SyncService
+from config.utils.exceptions import BadRequestException, NotFoundException, ForbiddenException
+
+# Columns an add / update operation may set
+OPERATION_FIELDS = ('exercise_id', 'sets', 'reps', 'duration', 'rest_time', 'tempo')
 
 
 class WorkoutExerciseService:
@@ -15,6 +26,9 @@ class WorkoutExerciseService:
         if session.created_by != actor:
             raise ForbiddenException("You cannot modify this session")
 
+        if 'position' not in data:
+            last = session.exercises.aggregate(last=Max('position'))['last']
+            data['position'] = 0 if last is None else last + 1
         return WorkoutExercise.objects.create(**data)
 
     @staticmethod
@@ -43,4 +57,126 @@ class WorkoutExerciseService:
         if we.session.created_by != actor:
             raise ForbiddenException("You cannot modify this session")
 
+        SyncService.record(
+            [(SyncTombstone.Kind.WORKOUT_EXERCISE, we.id)], program_id=we.session.program_id, user_id=actor.id
+        )
         we.delete()
+
+    @staticmethod
+    def _owned_session(actor, session_id):
+        """The session, locked for the batch; one query for the ownership check."""
+        session = WorkoutSession.objects.select_for_update().filter(id=session_id).first()
+        if not session:
+            raise NotFoundException("Session not found")
+        if session.created_by_id != actor.id:
+            raise ForbiddenException("You cannot modify this session")
+        return session
+
+    @staticmethod
+    @transaction.atomic
+    def apply_operations(actor, session_id, operations):
+        """
+        Apply add / update / delete / reorder operations to a session's
+        exercises, in order, all or nothing.
+
+        Operations run against the ordered list in memory; the result is
+        written with at most one bulk_create, one bulk_update and one
+        DELETE, and positions are renumbered 0..n-1. `reorder` takes the
+        full new order as `ids` (an add may carry its own `id` for that).
+        Returns ([per-operation result], the session's exercises in their new order).
+        """
+        session = WorkoutExerciseService._owned_session(actor, session_id)
+
+        exercise_ids = {
+            operation['exercise_id'] for operation in operations if operation.get('exercise_id')
+        }
+        found = set(Exercise.objects.filter(id__in=exercise_ids).values_list('id', flat=True))
+        if exercise_ids - found:
+            raise NotFoundException(f"Exercise with ID {sorted(map(str, exercise_ids - found))[0]} does not exist.")
+
+        supplied = {operation['id'] for operation in operations if operation['op'] == 'add' and operation.get('id')}
+        if supplied and WorkoutExercise.objects.filter(id__in=supplied).exclude(session=session).exists():
+            raise BadRequestException("A workout exercise id is already in use.")
+
+        ordered = list(session.exercises.all())
+        rows = {workout_exercise.id: workout_exercise for workout_exercise in ordered}
+        created, changed, deleted = set(), set(), set()
+        results = []
+
+        def find(index, operation):
+            workout_exercise = rows.get(operation['id'])
+            if workout_exercise is None or operation['id'] in deleted:
+                raise BadRequestException(f"Operation {index}: workout exercise {operation['id']} is not in this session.")
+            return workout_exercise
+
+        for index, operation in enumerate(operations):
+            op = operation['op']
+
+            if op == 'add':
+                pk = operation.get('id') or uuid4()
+                if pk in rows:
+                    raise BadRequestException(f"Operation {index}: id {pk} is already in use.")
+                workout_exercise = WorkoutExercise(
+                    id=pk, session=session,
+                    **{field: operation[field] for field in OPERATION_FIELDS if field in operation},
+                )
+                rows[pk] = workout_exercise
+                created.add(pk)
+                position = operation.get('position')
+                ordered.insert(len(ordered) if position is None else position, workout_exercise)
+                results.append({'op': op, 'id': pk, 'status': 'created'})
+
+            elif op == 'update':
+                workout_exercise = find(index, operation)
+                updates = {field: operation[field] for field in OPERATION_FIELDS if field in operation}
+                is_changed = any(getattr(workout_exercise, field) != value for field, value in updates.items())
+                for field, value in updates.items():
+                    setattr(workout_exercise, field, value)
+                if is_changed and workout_exercise.id not in created:
+                    changed.add(workout_exercise.id)
+                results.append({'op': op, 'id': workout_exercise.id, 'status': 'updated' if is_changed else 'unchanged'})
+
+            elif op == 'delete':
+                workout_exercise = find(index, operation)
+                ordered.remove(workout_exercise)
+                deleted.add(workout_exercise.id)
+                results.append({'op': op, 'id': workout_exercise.id, 'status': 'deleted'})
+
+            elif op == 'reorder':
+                current = [workout_exercise.id for workout_exercise in ordered]
+                if sorted(operation['ids'], key=str) != sorted(current, key=str):
+                    raise BadRequestException(
+                        f"Operation {index}: ids must list every exercise of the session exactly once."
+                    )
+                ordered = [rows[pk] for pk in operation['ids']]
+                results.append({'op': op, 'id': None, 'status': 'reordered'})
+
+        for position, workout_exercise in enumerate(ordered):
+            if workout_exercise.position != position:
+                workout_exercise.position = position
+                if workout_exercise.id not in created:
+                    changed.add(workout_exercise.id)
+
+        # Rows added and deleted within the batch never reach the database
+        stale = deleted - created
+        created -= deleted
+        now = timezone.now()
+
+        WorkoutExercise.objects.bulk_create([rows[pk] for pk in created])
+        if changed - deleted:
+            updates = [rows[pk] for pk in changed - deleted]
+            for workout_exercise in updates:
+                workout_exercise.updated_at = now
+            WorkoutExercise.objects.bulk_update(updates, [*OPERATION_FIELDS, 'position', 'updated_at'])
+        if stale:
+            SyncService.record(
+                [(SyncTombstone.Kind.WORKOUT_EXERCISE, pk) for pk in stale],
+                program_id=session.program_id,
+                user_id=actor.id,
+            )
+            WorkoutExercise.objects.filter(id__in=stale).delete()
+        if session.program_id and (created or changed or stale):
+            # bulk writes skip the signals that touch the program
+            WorkoutProgram.objects.filter(id=session.program_id).update(updated_at=now)
+
+        return results, list(session.exercises.select_related('exercise'))
@@ -0,0 +1,158 @@
+# apps/fitness/services/workout_log_service.py
+
+from datetime import datetime, time, timedelta
+
+from django.db import transaction
+from django.db.models import Prefetch
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+
+from apps.account.models import User
+from apps.fitness.models.workout import WorkoutExercise, WorkoutSession
+from apps.fitness.models.workout_log import PerformedSet, WorkoutLog
+from apps.fitness.services.training_rollup_service import TrainingRollupService
+from config.utils.exceptions import BadRequestException, NotFoundException
+
+LOG_FIELDS = ('started_at', 'completed_at', 'notes')
+SET_FIELDS = ('set_number', 'reps', 'weight', 'rpe', 'duration_seconds')
+
+
+class WorkoutLogService:
+
+    @staticmethod
+    def _prescriptions(actor, logs_data):
+        """
+        {workout_exercise_id: (session_id, exercise_id)} for every prescription
+        the batch references, restricted to programs assigned to the actor.
+        One query; any id it does not return is unknown or not the actor's.
+        """
+        ids = {
+            set_data['workout_exercise_id']
+            for log_data in logs_data
+            for set_data in log_data['sets']
+        }
+        rows = WorkoutExercise.objects.filter(
+            id__in=ids,
+            session__program__assignments__client=actor,
+        ).values_list('id', 'session_id', 'exercise_id').distinct()
+        prescriptions = {pk: (session_id, exercise_id) for pk, session_id, exercise_id in rows}
+
+        missing = ids - prescriptions.keys()
+        if missing:
+            raise NotFoundException(f"Workout exercise {sorted(map(str, missing))[0]} is not in your programs.")
+        return prescriptions
+
+    @staticmethod
+    def _check_log_ids(actor, logs_data):
+        """Ids of logs already uploaded by the actor; someone else's id is rejected."""
+        owners = dict(
+            WorkoutLog.objects.filter(id__in=[log_data['id'] for log_data in logs_data]).values_list('id', 'client_id')
+        )
+        if any(owner != actor.id for owner in owners.values()):
+            raise BadRequestException("A workout log id is already in use.")
+        return set(owners)
+
+    @staticmethod
+    def _check_set_ids(actor, set_ids):
+        """Ids of sets already uploaded by the actor; someone else's id is rejected."""
+        owners = dict(PerformedSet.objects.filter(id__in=set_ids).values_list('id', 'client_id'))
+        if any(owner != actor.id for owner in owners.values()):
+            raise BadRequestException("A performed set id is already in use.")
+        return set(owners)
+
+    @staticmethod
+    @transaction.atomic
+    def ingest(actor, logs_data):
+        """
+        Store a batch of offline logs with their performed sets.
+
+        Every set is checked against its prescription in one query, logs and
+        sets are written with one bulk INSERT each, and rows that already
+        exist (a re-sent batch) are skipped, so uploads are idempotent.
+        The new sets are then folded into the training rollups.
+        """
+        # Serialize uploads per client, so the duplicate check below is exact
+        # and every set reaches the rollups once
+        User.objects.select_for_update().filter(id=actor.id).values('id').first()
+
+        log_ids = [log_data['id'] for log_data in logs_data]
+        set_ids = [set_data['id'] for log_data in logs_data for set_data in log_data['sets']]
+        if len(set(log_ids)) != len(log_ids) or len(set(set_ids)) != len(set_ids):
+            raise BadRequestException("Log and set ids must be unique within a batch.")
+
+        prescriptions = WorkoutLogService._prescriptions(actor, logs_data)
+        existing_logs = WorkoutLogService._check_log_ids(actor, logs_data)
+
+        logs, sets = [], []
+        for log_data in logs_data:
+            sessions = {prescriptions[s['workout_exercise_id']][0] for s in log_data['sets']}
+            session_id = log_data.get('session_id')
+            if session_id is None and sessions:
+                session_id = next(iter(sessions))
+            if sessions - {session_id}:
+                raise BadRequestException(f"Workout log {log_data['id']} mixes sets of other sessions.")
+
+            logs.append(WorkoutLog(
+                id=log_data['id'],
+                client=actor,
+                session_id=session_id,
+                **{field: log_data[field] for field in LOG_FIELDS if field in log_data},
+            ))
+            for set_data in log_data['sets']:
+                sets.append(PerformedSet(
+                    id=set_data['id'],
+                    log_id=log_data['id'],
+                    client=actor,
+                    workout_exercise_id=set_data['workout_exercise_id'],
+                    exercise_id=prescriptions[set_data['workout_exercise_id']][1],
+                    performed_at=set_data.get('performed_at') or log_data['completed_at'],
+                    **{field: set_data[field] for field in SET_FIELDS if field in set_data},
+                ))
+
+        # A log without sets names its session itself; it must be visible too
+        unchecked = {log.session_id for log in logs if log.session_id} - {
+            session_id for session_id, _ in prescriptions.values()
+        }
+        if unchecked and WorkoutSession.objects.filter(
+            id__in=unchecked, program__assignments__client=actor
+        ).values('id').distinct().count() != len(unchecked):
+            raise NotFoundException("Workout session is not in your programs.")
+
+        existing_sets = WorkoutLogService._check_set_ids(actor, set_ids)
+        WorkoutLog.objects.bulk_create(
+            [log for log in logs if log.id not in existing_logs], batch_size=500
+        )
+        # Set ids are client generated too; a re-sent set is skipped, not duplicated
+        PerformedSet.objects.bulk_create(sets, batch_size=1000, ignore_conflicts=True)
+        TrainingRollupService.apply_sets([s.id for s in sets if s.id not in existing_sets])
+
+        return {
+            'logs': {'created': len(logs) - len(existing_logs), 'duplicates': len(existing_logs)},
+            'sets': {'created': len(sets) - len(existing_sets), 'duplicates': len(existing_sets)},
+        }
+
+    @staticmethod
+    def _day_start(value, name):
+        day = parse_date(value)
+        if day is None:
+            raise BadRequestException(f"{name} must be a date (YYYY-MM-DD).")
+        return timezone.make_aware(datetime.combine(day, time.min))
+
+    @staticmethod
+    def list_logs(actor, start=None, end=None):
+        """
+        The actor's logs completed between the `start` and `end` dates
+        (inclusive, YYYY-MM-DD strings), with their sets.
+        """
+        queryset = WorkoutLog.objects.filter(client=actor)
+        try:
+            if start:
+                queryset = queryset.filter(completed_at__gte=WorkoutLogService._day_start(start, 'from'))
+            if end:
+                end = WorkoutLogService._day_start(end, 'to') + timedelta(days=1)
+                queryset = queryset.filter(completed_at__lt=end)
+        except ValueError:
+            raise BadRequestException("from and to must be dates (YYYY-MM-DD).")
+        return queryset.prefetch_related(
+            Prefetch('sets', queryset=PerformedSet.objects.order_by('performed_at', 'set_number'))
+        )
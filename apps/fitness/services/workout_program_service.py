@@ -1,114 +1,230 @@
+from django.db import transaction
 from django.shortcuts import get_object_or_404
-from apps.fitness.models.workout import WorkoutProgram, WorkoutSession, WorkoutExercise, Exercise
-from config.utils.exceptions import ForbiddenException, NotFoundException
+from django.utils import timezone
+from django.utils.text import slugify
+from apps.fitness.models.sync_tombstone import SyncTombstone
+from apps.fitness.models.workout import ProgramAssignment, WorkoutProgram, WorkoutSession, WorkoutExercise, Exercise
+from apps.fitness.services.program_clone_service import ProgramCloneService
+from apps.fitness.services.program_marketplace_service import ProgramMarketplaceService
+from apps.fitness.services.program_version_service import ProgramVersionService
+from apps.fitness.services.sync_service import SyncService
+from config.utils.exceptions import BadRequestException, ForbiddenException, NotFoundException
+
+# Builder-editable columns, compared field by field when reconciling an update
+SESSION_FIELDS = ('title', 'notes', 'week_number', 'session_type', 'duration', 'intensity', 'is_rest_day')
+WORKOUT_EXERCISE_FIELDS = ('exercise_id', 'sets', 'reps', 'duration', 'rest_time', 'tempo')
 
 
 class WorkoutProgramService:
 
     @staticmethod
-    def validate_exercises(exercises_data):
-        """Ensure all exercise IDs exist"""
-        for ex_data in exercises_data:
-            exercise = ex_data.get('exercise')
-            if not Exercise.objects.filter(id=exercise.id).exists():
-                raise NotFoundException(f"Exercise with ID {exercise.id} does not exist.")
+    def validate_exercises(sessions_data):
+        """Ensure every exercise referenced by the sessions exists, in one query."""
+        exercise_ids = {
+            exercise_data['exercise_id']
+            for session_data in sessions_data
+            for exercise_data in session_data.get('exercises', [])
+            if 'exercise_id' in exercise_data
+        }
+        if not exercise_ids:
+            return
+
+        found = set(Exercise.objects.filter(id__in=exercise_ids).values_list('id', flat=True))
+        missing = exercise_ids - found
+        if missing:
+            raise NotFoundException(f"Exercise with ID {sorted(map(str, missing))[0]} does not exist.")
 
     @staticmethod
+    def create_sessions(program, actor, sessions_data):
+        """
+        Insert all sessions, then all their exercises: two INSERTs whatever
+        the program size. bulk_create skips save(), so slugs are set here.
+        """
+        sessions = []
+        workout_exercises = []
+        for session_data in sessions_data:
+            exercises_data = session_data.pop('exercises', [])
+            session_data.pop('id', None)
+            session = WorkoutSession(program=program, created_by=actor, **session_data)
+            session.slug = slugify(session.title)
+            sessions.append(session)
+            for position, exercise_data in enumerate(exercises_data):
+                exercise_data.pop('id', None)
+                workout_exercises.append(WorkoutExercise(session=session, position=position, **exercise_data))
+
+        WorkoutSession.objects.bulk_create(sessions)
+        WorkoutExercise.objects.bulk_create(workout_exercises)
+        return sessions
+
+    @staticmethod
+    @transaction.atomic
     def create_program_with_sessions(actor, data):
         sessions_data = data.pop('sessions', [])
-        program = WorkoutProgram.objects.create(created_by=actor, **data)
+        WorkoutProgramService.validate_exercises(sessions_data)
+
+        # A new program has no assignments or reviews; its session count is known
+        program = WorkoutProgram.objects.create(created_by=actor, session_count=len(sessions_data), **data)
+        WorkoutProgramService.create_sessions(program, actor, sessions_data)
+        return program
+
+    @staticmethod
+    def _assign(instance, data, fields):
+        """Copy the given `fields` from `data` onto `instance`; True if anything changed."""
+        changed = False
+        for field in fields:
+            if field in data and getattr(instance, field) != data[field]:
+                setattr(instance, field, data[field])
+                changed = True
+        return changed
+
+    @staticmethod
+    def reconcile_sessions(program, actor, sessions_data):
+        """
+        Bring the program's sessions and exercises in line with `sessions_data`.
+
+        Items carrying an `id` are matched to existing rows and only their
+        changed fields are written; items without one are created; existing
+        rows missing from the payload are deleted. Ids stay stable, and a
+        one-field edit costs one UPDATE instead of rewriting the program.
+        Returns a change summary per kind of row.
+        """
+        summary = {
+            kind: {'created': 0, 'updated': 0, 'deleted': 0, 'unchanged': 0}
+            for kind in ('sessions', 'exercises')
+        }
+        existing_sessions = {session.id: session for session in program.sessions.all()}
+        existing_exercises = {
+            we.id: we for we in WorkoutExercise.objects.filter(session__program=program)
+        }
+
+        seen_sessions, seen_exercises = set(), set()
+        new_sessions, changed_sessions = [], []
+        new_exercises, changed_exercises = [], []
+        now = timezone.now()
 
         for session_data in sessions_data:
             exercises_data = session_data.pop('exercises', [])
-            # Validate exercises
-            WorkoutProgramService.validate_exercises(exercises_data)
-
-            session = WorkoutSession.objects.create(program=program, created_by=actor, **session_data)
-            for exercise_data in exercises_data:
-                WorkoutExercise.objects.create(session=session, **exercise_data)
+            session_id = session_data.pop('id', None)
+
+            if session_id is None:
+                session = WorkoutSession(program=program, created_by=actor, **session_data)
+                session.slug = slugify(session.title)
+                new_sessions.append(session)
+            else:
+                session = existing_sessions.get(session_id)
+                if session is None or session_id in seen_sessions:
+                    raise BadRequestException(f"Session {session_id} is not part of this program.")
+                seen_sessions.add(session_id)
+                if WorkoutProgramService._assign(session, session_data, SESSION_FIELDS):
+                    session.updated_at = now
+                    changed_sessions.append(session)
+                else:
+                    summary['sessions']['unchanged'] += 1
+
+            for position, exercise_data in enumerate(exercises_data):
+                exercise_id = exercise_data.pop('id', None)
+
+                if exercise_id is None:
+                    missing = [field for field in ('exercise_id', 'sets', 'reps') if field not in exercise_data]
+                    if missing:
+                        raise BadRequestException(f"New exercises require {', '.join(missing)}.")
+                    new_exercises.append(WorkoutExercise(session=session, position=position, **exercise_data))
+                    continue
+
+                workout_exercise = existing_exercises.get(exercise_id)
+                if workout_exercise is None or exercise_id in seen_exercises:
+                    raise BadRequestException(f"Workout exercise {exercise_id} is not part of this program.")
+                seen_exercises.add(exercise_id)
+                changed = WorkoutProgramService._assign(workout_exercise, exercise_data, WORKOUT_EXERCISE_FIELDS)
+                if workout_exercise.session_id != session.id:
+                    # moved to another session
+                    workout_exercise.session = session
+                    changed = True
+                if workout_exercise.position != position:
+                    workout_exercise.position = position
+                    changed = True
+                if changed:
+                    changed_exercises.append(workout_exercise)
+                else:
+                    summary['exercises']['unchanged'] += 1
+
+        stale_sessions = existing_sessions.keys() - seen_sessions
+        stale_exercises = existing_exercises.keys() - seen_exercises
+
+        # Sessions first so new exercises and moves can point at them;
+        # deletes last so moved exercises are out of their old session.
+        WorkoutSession.objects.bulk_create(new_sessions)
+        if changed_sessions:
+            WorkoutSession.objects.bulk_update(changed_sessions, [*SESSION_FIELDS, 'updated_at'])
+        WorkoutExercise.objects.bulk_create(new_exercises)
+        if changed_exercises:
+            for workout_exercise in changed_exercises:
+                workout_exercise.updated_at = now
+            WorkoutExercise.objects.bulk_update(
+                changed_exercises, [*WORKOUT_EXERCISE_FIELDS, 'session', 'position', 'updated_at']
+            )
+        if stale_exercises or stale_sessions:
+            SyncService.record(
+                [(SyncTombstone.Kind.WORKOUT_EXERCISE, pk) for pk in stale_exercises]
+                + [(SyncTombstone.Kind.SESSION, pk) for pk in stale_sessions],
+                program_id=program.id,
+                user_id=program.created_by_id,
+            )
+        if stale_exercises:
+            WorkoutExercise.objects.filter(id__in=stale_exercises).delete()
+        if stale_sessions:
+            WorkoutSession.objects.filter(id__in=stale_sessions).delete()
 
-        return program
+        summary['sessions'].update(
+            created=len(new_sessions), updated=len(changed_sessions), deleted=len(stale_sessions)
+        )
+        summary['exercises'].update(
+            created=len(new_exercises), updated=len(changed_exercises), deleted=len(stale_exercises)
+        )
+        return summary
 
     @staticmethod
+    @transaction.atomic
     def update_program_with_sessions(actor, program_id, data):
+        """Returns (program, change summary); the summary is None when sessions were not sent."""
         program = get_object_or_404(WorkoutProgram, id=program_id)
         if program.created_by != actor:
             raise ForbiddenException("You cannot edit this program.")
 
         sessions_data = data.pop('sessions', None)
+        if sessions_data is not None:
+            WorkoutProgramService.validate_exercises(sessions_data)
+
         for attr, value in data.items():
             setattr(program, attr, value)
         program.save()
 
+        changes = None
         if sessions_data is not None:
-            program.sessions.all().delete()
-            for session_data in sessions_data:
-                exercises_data = session_data.pop('exercises', [])
-                # Validate exercises
-                WorkoutProgramService.validate_exercises(exercises_data)
-
-                session = WorkoutSession.objects.create(program=program, created_by=actor, **session_data)
-                for exercise_data in exercises_data:
-                    WorkoutExercise.objects.create(session=session, **exercise_data)
+            changes = WorkoutProgramService.reconcile_sessions(program, actor, sessions_data)
+            ProgramMarketplaceService.refresh_stats([program.id])
 
-        return program
+        return program, changes
 
     @staticmethod
     def clone_program(actor, program_id):
-        program = get_object_or_404(WorkoutProgram, id=program_id)
-
-        new_program = WorkoutProgram.objects.create(
-            title=f"{program.title} (Copy)",
-            description=program.description,
-            level=program.level,
-            goal=program.goal,
-            duration=program.duration,
-            price=program.price,
-            off_percent=program.off_percent,
-            is_active=False,
-            is_public=False,
-            is_custom=program.is_custom,
-            is_verified=False,
-            video=program.video,
-            location=program.location,
-            equipment=program.equipment,
-            created_by=actor,
-        )
+        """Deep copy of an own or public program; see ProgramCloneService."""
+        return ProgramCloneService.clone_programs(actor, [program_id])[0]
 
-        for session in program.sessions.all():
-            new_session = WorkoutSession.objects.create(
-                program=new_program,
-                title=session.title,
-                notes=session.notes,
-                week_number=session.week_number,
-                session_type=session.session_type,
-                duration=session.duration,
-                intensity=session.intensity,
-                is_rest_day=session.is_rest_day,
-                created_by=actor,
-            )
-
-            for exercise in session.exercises.all():
-                # Validate that exercise still exists
-                if not Exercise.objects.filter(id=exercise.exercise.id).exists():
-                    continue  # Skip missing exercises
-                WorkoutExercise.objects.create(
-                    session=new_session,
-                    exercise=exercise.exercise,
-                    sets=exercise.sets,
-                    reps=exercise.reps,
-                    duration=exercise.duration,
-                    rest_time=exercise.rest_time,
-                    tempo=exercise.tempo,
-                )
-
-        return new_program
+    @staticmethod
+    def enqueue_clone_program(actor, program_id):
+        """clone_program in a background job; returns the Job to poll."""
+        return ProgramCloneService.enqueue_clone_programs(actor, [program_id])
 
     @staticmethod
+    @transaction.atomic
     def delete_program(actor, program_id):
         program = get_object_or_404(WorkoutProgram, id=program_id)
         if program.created_by != actor:
             raise ForbiddenException("You cannot delete this program.")
+        # Its assignments go with it; their clients learn through the tombstones
+        SyncService.record_unassigned(ProgramAssignment.objects.filter(program=program, is_active=True))
+        SyncService.record([(SyncTombstone.Kind.PROGRAM, program.id)], program_id=program.id, user_id=actor.id)
         program.delete()
         return True
 
@@ -118,5 +234,7 @@ class WorkoutProgramService:
         if program.created_by != actor:
             raise ForbiddenException("You cannot publish this program.")
         program.is_public = True
+        program.is_published = True
         program.save()
+        ProgramVersionService.freeze(program, actor)
         return program
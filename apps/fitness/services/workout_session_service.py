@@ -1,6 +1,10 @@
+from django.db.models import Q
 from django.shortcuts import get_object_or_404
-from apps.fitness.models.workout import WorkoutSession, WorkoutProgram
-from config.utils.exceptions import ForbiddenException
+from apps.fitness.models.sync_tombstone import SyncTombstone
+from apps.fitness.models.workout import ProgramAssignment, WorkoutSession, WorkoutProgram
+from apps.fitness.services.program_marketplace_service import ProgramMarketplaceService
+from apps.fitness.services.sync_service import SyncService
+from config.utils.exceptions import BadRequestException, ForbiddenException, NotFoundException
 
 
 class WorkoutSessionService:
@@ -16,11 +20,14 @@ class WorkoutSessionService:
             if program.created_by != actor:
                 raise ForbiddenException("You are not allowed to add sessions to this program.")
 
-        return WorkoutSession.objects.create(
+        session = WorkoutSession.objects.create(
             program=program,
             created_by=actor,
             **data
         )
+        if program:
+            ProgramMarketplaceService.bump_stats(program.id, session_count=1)
+        return session
 
     @staticmethod
     def update_session(*, actor, session_id, data):
@@ -42,18 +49,73 @@ class WorkoutSessionService:
         if session.created_by != actor:
             raise ForbiddenException("You cannot delete this session.")
 
+        SyncService.record([(SyncTombstone.Kind.SESSION, session.id)], program_id=session.program_id, user_id=actor.id)
         session.delete()
+        if session.program_id:
+            ProgramMarketplaceService.bump_stats(session.program_id, session_count=-1)
         return True
 
     @staticmethod
-    def list_sessions(*, actor, program_id=None):
-        qs = WorkoutSession.objects.all()
+    def visible_sessions(actor):
+        """Sessions the actor owns, is assigned (active), or that are public."""
+        assigned = ProgramAssignment.objects.filter(client=actor, is_active=True).values('program_id')
+        return WorkoutSession.objects.filter(
+            Q(created_by=actor)
+            | Q(is_public=True)
+            | Q(program__created_by=actor)
+            | Q(program__is_public=True)
+            | Q(program_id__in=assigned)
+        )
 
-        if program_id:
-            qs = qs.filter(program_id=program_id)
+    @staticmethod
+    def _program_is_visible(actor, program_id):
+        return WorkoutProgram.objects.filter(
+            Q(created_by=actor) | Q(is_public=True) | Q(assignments__client=actor, assignments__is_active=True),
+            id=program_id
+        ).exists()
 
-        return qs.order_by('week_number', 'created_at')
+    @staticmethod
+    def _int(filters, key):
+        try:
+            return int(filters[key]) if filters.get(key) else None
+        except ValueError:
+            raise BadRequestException(f"{key} must be an integer.")
+
+    @staticmethod
+    def list_sessions(*, actor, program_id=None, filters=None):
+        """
+        Visible sessions, in program order. With a program_id the access
+        check is made once on the program, and the rows come straight off
+        the (program, week_number, created_at, id) index.
+        """
+        filters = filters or {}
+
+        if program_id and WorkoutSessionService._program_is_visible(actor, program_id):
+            qs = WorkoutSession.objects.filter(program_id=program_id)
+        else:
+            qs = WorkoutSessionService.visible_sessions(actor)
+            if program_id:
+                qs = qs.filter(program_id=program_id)
+
+        week_from = WorkoutSessionService._int(filters, 'week_from')
+        if week_from is not None:
+            qs = qs.filter(week_number__gte=week_from)
+        week_to = WorkoutSessionService._int(filters, 'week_to')
+        if week_to is not None:
+            qs = qs.filter(week_number__lte=week_to)
+
+        is_rest_day = filters.get('is_rest_day')
+        if is_rest_day is not None:
+            qs = qs.filter(is_rest_day=str(is_rest_day).lower() == 'true')
+
+        if filters.get('session_type'):
+            qs = qs.filter(session_type=filters['session_type'])
+
+        return qs.order_by('week_number', 'created_at', 'id')
 
     @staticmethod
     def get_session(*, actor, session_id):
-        return get_object_or_404(WorkoutSession, id=session_id)
+        session = WorkoutSessionService.visible_sessions(actor).filter(id=session_id).first()
+        if not session:
+            raise NotFoundException("Workout session not found.")
+        return session
@@ -0,0 +1,103 @@
+# apps/fitness/signals.py
+
+from django.db import connections
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from apps.fitness.models.sync_tombstone import SyncTombstone
+from apps.fitness.models.workout import (
+    Exercise,
+    ExerciseImage,
+    ExerciseMuscleGroup,
+    ExerciseVideo,
+    MuscleGroup,
+    WorkoutExercise,
+    WorkoutProgram,
+    WorkoutSession,
+)
+from apps.fitness.services.exercise_facet_service import EXERCISE_CATALOG_VERSION
+from apps.fitness.services.sync_service import SyncService
+from apps.fitness.services.taxonomy_cache import TAXONOMY_FIELDS, TaxonomyCache
+
+
+def create_postgres_extensions(sender, using, **kwargs):
+    """
+    Extensions required by fitness indexes (trigram search on exercise names).
+    Runs before migrations so the generated migrations can create the indexes.
+    """
+    connection = connections[using]
+    if connection.vendor != 'postgresql':
+        return
+
+    with connection.cursor() as cursor:
+        cursor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+
+
+@receiver([post_save, post_delete], sender=Exercise)
+@receiver([post_save, post_delete], sender=ExerciseMuscleGroup)
+@receiver([post_save, post_delete], sender=MuscleGroup)
+def bump_exercise_catalog_version(sender, **kwargs):
+    EXERCISE_CATALOG_VERSION.bump()
+
+
+# Exercises are deleted rarely (and take their workout exercises along).
+# A public one gets a tombstone for every synced client; a private one only
+# for its owner, unless the owner is the row being deleted.
+@receiver(post_delete, sender=Exercise)
+def record_exercise_tombstone(sender, instance, origin=None, **kwargs):
+    if instance.is_public:
+        SyncService.record([(SyncTombstone.Kind.EXERCISE, instance.id)])
+        return
+    # `origin` is the instance or queryset the delete started from
+    owner_model = Exercise._meta.get_field('created_by').related_model
+    if isinstance(origin, owner_model) or getattr(origin, 'model', None) is owner_model:
+        return
+    SyncService.record([(SyncTombstone.Kind.EXERCISE, instance.id)], user_id=instance.created_by_id)
+
+
+@receiver(m2m_changed, sender=Exercise.modalities.through)
+def bump_exercise_catalog_version_on_modalities(sender, instance, action, reverse, pk_set, **kwargs):
+    # Program snapshots are keyed by the exercises' updated_at, so touch it too
+    if reverse and action == 'pre_clear':
+        # a modality losing all its exercises; post_clear gets no pk_set
+        Exercise.objects.filter(modalities=instance).update(updated_at=timezone.now())
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    if not reverse:
+        Exercise.objects.filter(id=instance.pk).update(updated_at=timezone.now())
+    elif pk_set:
+        Exercise.objects.filter(id__in=pk_set).update(updated_at=timezone.now())
+    EXERCISE_CATALOG_VERSION.bump()
+
+
+def invalidate_taxonomy(sender, **kwargs):
+    TaxonomyCache.invalidate(sender)
+
+
+for taxonomy_model in TAXONOMY_FIELDS:
+    post_save.connect(invalidate_taxonomy, sender=taxonomy_model, dispatch_uid=f'taxonomy-save-{taxonomy_model.__name__}')
+    post_delete.connect(invalidate_taxonomy, sender=taxonomy_model, dispatch_uid=f'taxonomy-delete-{taxonomy_model.__name__}')
+
+
+# Program snapshots are keyed by updated_at of the program and its exercises;
+# propagate writes on child rows upwards with a single UPDATE. Deletes are
+# already visible in the snapshot version through the row counts, and a
+# post_delete receiver would stop queryset deletes from running in bulk.
+
+@receiver(post_save, sender=WorkoutSession)
+def touch_program_on_session_change(sender, instance, **kwargs):
+    if instance.program_id:
+        WorkoutProgram.objects.filter(id=instance.program_id).update(updated_at=timezone.now())
+
+
+@receiver(post_save, sender=WorkoutExercise)
+def touch_program_on_workout_exercise_change(sender, instance, **kwargs):
+    WorkoutProgram.objects.filter(sessions__id=instance.session_id).update(updated_at=timezone.now())
+
+
+@receiver([post_save, post_delete], sender=ExerciseImage)
+@receiver([post_save, post_delete], sender=ExerciseVideo)
+@receiver([post_save, post_delete], sender=ExerciseMuscleGroup)
+def touch_exercise_on_media_change(sender, instance, **kwargs):
+    Exercise.objects.filter(id=instance.exercise_id).update(updated_at=timezone.now())
@@ -0,0 +1,86 @@
+from datetime import date, datetime, timedelta, timezone as dt_timezone
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.utils import timezone
+from apps.fitness.models.coach_client import CoachClient
+from apps.fitness.models.workout import ProgramAssignment, ScheduledSession, WorkoutProgram, WorkoutSession
+from apps.fitness.services.client_calendar_service import ClientCalendarService
+from apps.fitness.services.program_assignment_service import ProgramAssignmentService
+from config.utils.exceptions import BadRequestException
+
+User = get_user_model()
+
+
+@pytest.mark.django_db
+class TestClientCalendarService:
+
+    @pytest.fixture
+    def coach(self):
+        return User.objects.create(username="coach1", email="coach1@example.com", is_coach=True, is_active=True)
+
+    @pytest.fixture
+    def client(self, coach):
+        client = User.objects.create(username="client1", email="client1@example.com", is_active=True)
+        CoachClient.objects.create(coach=coach, client=client, is_active=True)
+        return client
+
+    @pytest.fixture
+    def program(self, coach):
+        program = WorkoutProgram.objects.create(title="Block", created_by=coach)
+        for week, count in ((1, 3), (2, 1)):
+            for n in range(count):
+                WorkoutSession.objects.create(program=program, title=f"W{week} S{n}", week_number=week)
+        return program
+
+    def test_layout_spreads_sessions_over_the_week(self):
+        start = date(2026, 1, 5)
+        sessions = [{'week_number': 1}] * 3 + [{'week_number': 2}] * 7
+        dates = [day for day, _, _ in ClientCalendarService.layout(start, sessions)]
+        assert dates[:3] == [start, start + timedelta(days=2), start + timedelta(days=4)]
+        assert dates[3:] == [start + timedelta(days=7 + n) for n in range(7)]
+
+    def test_assignment_schedules_and_unassignment_clears(self, coach, client, program):
+        assignment = ProgramAssignmentService.assign_program(actor=coach, client_id=client.id, program_id=program.id)
+        start = assignment.assigned_at.date()
+
+        calendar = list(ClientCalendarService.get_calendar(client, start, start + timedelta(days=13)))
+        assert [(s.title, (s.date - start).days) for s in calendar] == [
+            ("W1 S0", 0), ("W1 S1", 2), ("W1 S2", 4), ("W2 S0", 7),
+        ]
+        assert list(ClientCalendarService.get_calendar(client, start + timedelta(days=1), start + timedelta(days=3))) == [calendar[1]]
+
+        ProgramAssignmentService.unassign_program(actor=coach, assignment_id=assignment.id)
+        assert not ScheduledSession.objects.filter(client=client).exists()
+
+    def test_reactivation_schedules_from_today(self, coach, client, program):
+        assignment = ProgramAssignment.objects.create(client=client, program=program, coach=coach, is_active=False)
+        ProgramAssignment.objects.filter(id=assignment.id).update(
+            assigned_at=datetime(2025, 3, 2, 9, tzinfo=dt_timezone.utc)
+        )
+
+        ProgramAssignmentService.assign_program(actor=coach, client_id=client.id, program_id=program.id)
+
+        first = ScheduledSession.objects.filter(assignment=assignment).order_by('date').first()
+        assert first.date == timezone.localdate()
+
+    def test_rebuild_pins_legacy_assignments(self, coach, client, program):
+        assignment = ProgramAssignment.objects.create(client=client, program=program, coach=coach)
+        ProgramAssignment.objects.filter(id=assignment.id).update(
+            assigned_at=datetime(2026, 3, 2, 9, tzinfo=dt_timezone.utc)
+        )
+
+        call_command('rebuild_client_calendar', stdout=None)
+
+        assignment.refresh_from_db()
+        assert assignment.program_version is not None
+        dates = list(ScheduledSession.objects.filter(assignment=assignment).values_list('date', flat=True))
+        assert dates == [date(2026, 3, 2), date(2026, 3, 4), date(2026, 3, 6), date(2026, 3, 9)]
+
+    def test_date_range_validation(self):
+        start, end = ClientCalendarService.date_range('2026-01-01', None)
+        assert (end - start).days == 6
+        for bad in (('2026-01-10', '2026-01-01'), ('2026-01-01', '2026-12-31'), ('soon', None)):
+            with pytest.raises(BadRequestException):
+                ClientCalendarService.date_range(*bad)
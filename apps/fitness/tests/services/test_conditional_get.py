@@ -0,0 +1,109 @@
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from rest_framework.test import APIRequestFactory, force_authenticate
+from apps.fitness.models.workout import Exercise, ProgramAssignment, WorkoutExercise, WorkoutProgram, WorkoutSession
+from apps.fitness.services.program_version_service import ProgramVersionService
+from apps.fitness.views.client_programs import ClientAssignedProgramsView
+from apps.fitness.views.client_sessions import ClientWorkoutSessionsView
+from apps.fitness.views.exercise import ExerciseDetailView, ExerciseView
+from apps.fitness.views.workout_program import WorkoutProgramDetailView
+
+User = get_user_model()
+factory = APIRequestFactory()
+
+
+def call(view, user, path, etag=None, **kwargs):
+    headers = {"HTTP_IF_NONE_MATCH": etag} if etag else {}
+    request = factory.get(path, **headers)
+    force_authenticate(request, user=user)
+    return view.as_view()(request, **kwargs)
+
+
+@pytest.mark.django_db
+class TestConditionalGet:
+
+    @pytest.fixture
+    def setup(self):
+        cache.clear()
+        coach = User.objects.create(username="coach1", email="coach1@example.com", is_coach=True)
+        client = User.objects.create(username="client1", email="client1@example.com")
+        program = WorkoutProgram.objects.create(title="Block", created_by=coach)
+        session = WorkoutSession.objects.create(program=program, title="Day 1", week_number=1)
+        exercise = Exercise.objects.create(name="Squat", created_by=coach, is_public=True)
+        WorkoutExercise.objects.create(session=session, exercise=exercise, sets=3, reps=5)
+        ProgramAssignment.objects.create(client=client, program=program, coach=coach)
+        return coach, client, program, session, exercise
+
+    def test_program_detail_304_skips_the_body(self, setup, django_assert_num_queries):
+        coach, _, program, session, _ = setup
+        path = f"/workouts/programs/{program.id}/"
+
+        response = call(WorkoutProgramDetailView, coach, path, program_id=program.id)
+        etag = response["ETag"]
+        assert response.status_code == 200
+        assert response.has_header("Last-Modified")
+
+        # the version aggregate only
+        with django_assert_num_queries(1):
+            response = call(WorkoutProgramDetailView, coach, path, etag=etag, program_id=program.id)
+        assert response.status_code == 304
+        assert response["ETag"] == etag
+
+        session.title = "Day 1 (heavy)"
+        session.save()
+        response = call(WorkoutProgramDetailView, coach, path, etag=etag, program_id=program.id)
+        assert response.status_code == 200
+        assert response["ETag"] != etag
+
+    def test_exercise_catalog_and_detail(self, setup):
+        coach, _, _, _, exercise = setup
+
+        response = call(ExerciseView, coach, "/workouts/exercises/")
+        etag = response["ETag"]
+        assert call(ExerciseView, coach, "/workouts/exercises/", etag=etag).status_code == 304
+        # other query strings are other representations
+        assert call(ExerciseView, coach, "/workouts/exercises/?muscle_group=chest", etag=etag).status_code == 200
+
+        path = f"/workouts/exercises/{exercise.id}/"
+        detail_etag = call(ExerciseDetailView, coach, path, exercise_id=exercise.id)["ETag"]
+        assert call(ExerciseDetailView, coach, path, etag=detail_etag, exercise_id=exercise.id).status_code == 304
+
+        exercise.name = "Back squat"
+        exercise.save()
+        assert call(ExerciseView, coach, "/workouts/exercises/", etag=etag).status_code == 200
+        assert call(ExerciseDetailView, coach, path, etag=detail_etag, exercise_id=exercise.id).status_code == 200
+
+    def test_client_lists_follow_assignments(self, setup):
+        _, client, program, _, _ = setup
+
+        sessions_etag = call(ClientWorkoutSessionsView, client, "/client/sessions/")["ETag"]
+        programs_etag = call(ClientAssignedProgramsView, client, "/client/programs/")["ETag"]
+        assert call(ClientAssignedProgramsView, client, "/client/programs/", etag=programs_etag).status_code == 304
+        assert call(ClientWorkoutSessionsView, client, "/client/sessions/", etag=sessions_etag).status_code == 304
+
+        # reads never pin: until the backfill, the live program is served and its edits show
+        WorkoutSession.objects.create(program=program, title="Day 2", week_number=1)
+        response = call(ClientWorkoutSessionsView, client, "/client/sessions/", etag=sessions_etag)
+        assert response.status_code == 200
+        assert {session["version"] for session in response.data["data"]} == {None}
+
+        assert ProgramVersionService.pin_missing() == 1
+        response = call(ClientWorkoutSessionsView, client, "/client/sessions/", etag=response["ETag"])
+        assert response.status_code == 200
+        assert {session["version"] for session in response.data["data"]} == {1}
+        sessions_etag = response["ETag"]
+
+        # sessions are served from the pinned version: live edits do not show
+        WorkoutSession.objects.create(program=program, title="Day 3", week_number=1)
+        assert call(ClientWorkoutSessionsView, client, "/client/sessions/", etag=sessions_etag).status_code == 304
+
+        assignment = ProgramAssignment.objects.get(client=client)
+        ProgramVersionService.pin(assignment)
+        response = call(ClientWorkoutSessionsView, client, "/client/sessions/", etag=sessions_etag)
+        assert response.status_code == 200
+        assert [session["title"] for session in response.data["data"]] == ["Day 1", "Day 2", "Day 3"]
+        assert {session["version"] for session in response.data["data"]} == {2}
+
+        ProgramAssignment.objects.filter(client=client).update(is_active=False)
+        assert call(ClientAssignedProgramsView, client, "/client/programs/", etag=programs_etag).status_code == 200
@@ -0,0 +1,74 @@
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from apps.fitness.models.workout import Exercise
+from apps.fitness.services.exercise_facet_service import ExerciseFacetService, FacetBitmapIndex
+
+User = get_user_model()
+
+
+def build_index():
+    return FacetBitmapIndex([
+        ("squat", {"category": ["strength"], "level": ["beginner"], "primary_muscle_group": ["quads"]}),
+        ("deadlift", {"category": ["strength"], "level": ["advanced"], "primary_muscle_group": ["hamstrings"]}),
+        ("burpee", {"category": ["cardio"], "level": ["beginner"], "secondary_muscle_group": ["quads"]}),
+    ])
+
+
+def test_match_without_selection_counts_everything():
+    ids, counts = build_index().match({})
+    assert ids == ["squat", "deadlift", "burpee"]
+    assert counts["category"] == {"strength": 2, "cardio": 1}
+    assert counts["level"] == {"beginner": 2, "advanced": 1}
+
+
+def test_match_ands_facets_and_ors_values():
+    index = build_index()
+    ids, _ = index.match({"category": {"strength"}, "level": {"beginner", "advanced"}})
+    assert ids == ["squat", "deadlift"]
+
+    ids, _ = index.match({"category": {"strength"}, "level": {"beginner"}})
+    assert ids == ["squat"]
+
+
+def test_counts_ignore_own_facet_selection():
+    _, counts = build_index().match({"category": {"cardio"}})
+    # sibling categories keep their counts, other facets are narrowed
+    assert counts["category"] == {"strength": 2, "cardio": 1}
+    assert counts["level"] == {"beginner": 1}
+    assert counts["secondary_muscle_group"] == {"quads": 1}
+
+
+def test_unknown_value_matches_nothing():
+    ids, counts = build_index().match({"category": {"mobility"}})
+    assert ids == []
+    assert counts["level"] == {}
+
+
+def test_match_leaves_out_excluded_rows():
+    index = build_index()
+    ids, counts = index.match({}, exclude=index.mask_for(["squat", "unknown"]))
+    assert ids == ["deadlift", "burpee"]
+    assert counts["level"] == {"beginner": 1, "advanced": 1}
+
+
+@pytest.mark.django_db
+def test_search_scopes_count_own_public_exercises_once(monkeypatch):
+    cache.clear()
+    monkeypatch.setattr(ExerciseFacetService, "_public_index", None)
+    coach = User.objects.create(username="coach1", email="coach1@example.com", is_coach=True)
+    other = User.objects.create(username="coach2", email="coach2@example.com", is_coach=True)
+    own_public = Exercise.objects.create(name="Squat", created_by=coach, is_public=True, level="beginner")
+    own_private = Exercise.objects.create(name="Lunge", created_by=coach, level="beginner")
+    other_public = Exercise.objects.create(name="Row", created_by=other, is_public=True, level="advanced")
+    Exercise.objects.create(name="Curl", created_by=other, level="advanced")
+
+    ids, counts = ExerciseFacetService.search(coach, {}, scope="mine")
+    assert set(ids) == {own_public.id, own_private.id}
+
+    ids, counts = ExerciseFacetService.search(coach, {}, scope="all")
+    assert sorted(ids, key=str) == sorted([own_public.id, own_private.id, other_public.id], key=str)
+    assert counts["level"] == {"beginner": 2, "advanced": 1}
+
+    ids, _ = ExerciseFacetService.search(coach, {}, scope="public")
+    assert set(ids) == {own_public.id, other_public.id}
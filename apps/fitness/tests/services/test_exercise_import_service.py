@@ -0,0 +1,76 @@
+import io
+import json
+
+import pytest
+from django.core.management import call_command
+from django.contrib.auth import get_user_model
+from apps.fitness.models.workout import Category, Exercise, ExerciseMuscleGroup, Modality, MuscleGroup
+from apps.fitness.services.exercise_import_service import ExerciseImporter
+from config.utils.exceptions import BadRequestException
+
+User = get_user_model()
+
+
+@pytest.mark.django_db
+class TestExerciseImporter:
+
+    @pytest.fixture
+    def importer(self):
+        owner = User.objects.create(username="coach1", email="coach1@example.com", is_coach=True)
+        Category.objects.create(id="strength", title="Strength")
+        Modality.objects.create(id="barbell", title="Barbell")
+        MuscleGroup.objects.create(id="quads", title="Quadriceps")
+        MuscleGroup.objects.create(id="glutes", title="Glutes")
+        return ExerciseImporter(owner=owner, source="library.csv")
+
+    def row(self, **overrides):
+        row = {
+            "name": "Back Squat",
+            "category": "Strength",
+            "modalities": "barbell",
+            "primary_muscle_groups": "Quadriceps",
+            "secondary_muscle_groups": "glutes|quads",
+            "instructions": '["Brace", "Sit down"]',
+        }
+        row.update(overrides)
+        return row
+
+    def test_write_batch(self, importer, django_assert_max_num_queries):
+        built = [importer.build(self.row(name=f"Squat {i}"), i) for i in range(1, 4)]
+
+        with django_assert_max_num_queries(10):
+            assert importer.write(built) == 3
+
+        squat = Exercise.objects.get(name="Squat 1")
+        assert squat.slug == "squat-1"
+        assert squat.category_id == "strength"
+        assert squat.instructions == ["Brace", "Sit down"]
+        assert list(squat.modalities.values_list("id", flat=True)) == ["barbell"]
+        assert dict(ExerciseMuscleGroup.objects.filter(exercise=squat).values_list("muscle_group_id", "is_primary")) == {
+            "quads": True,
+            "glutes": False,
+        }
+
+    def test_replayed_batch_is_skipped(self, importer):
+        importer.write([importer.build(self.row(), 1)])
+        assert importer.write([importer.build(self.row(), 1)]) == 0
+        assert Exercise.objects.count() == 1
+
+    def test_unknown_reference_rejects_row(self, importer):
+        with pytest.raises(BadRequestException):
+            importer.build(self.row(category="Yoga"), 1)
+
+    def test_command_rejects_malformed_jsonl_lines(self, importer, tmp_path):
+        path = tmp_path / "library.jsonl"
+        path.write_text("\n".join([
+            json.dumps(self.row(name="Squat 1")),
+            '{"name": "Broken',
+            '["not", "an", "object"]',
+            json.dumps(self.row(name="Squat 2")),
+        ]))
+        stderr = io.StringIO()
+
+        call_command('import_exercises', str(path), owner="coach1@example.com", stdout=io.StringIO(), stderr=stderr)
+
+        assert sorted(Exercise.objects.values_list("name", flat=True)) == ["Squat 1", "Squat 2"]
+        assert [line.split(":")[0] for line in stderr.getvalue().splitlines()] == ["row 2", "row 3"]
@@ -0,0 +1,76 @@
+import pytest
+from django.contrib.auth import get_user_model
+from django.db import connection, transaction
+from apps.fitness.models.workout import Exercise
+from apps.fitness.services.exercise_service import ExerciseService
+
+User = get_user_model()
+
+
+@pytest.mark.django_db
+class TestExerciseSearch:
+
+    @pytest.fixture
+    def coach(self):
+        return User.objects.create(username="coach1", email="coach1@example.com", is_coach=True)
+
+    @pytest.fixture
+    def other_coach(self):
+        return User.objects.create(username="coach2", email="coach2@example.com", is_coach=True)
+
+    @pytest.fixture
+    def exercises(self, coach, other_coach):
+        return {
+            'squat': Exercise.objects.create(name="Back Squat", created_by=coach, is_public=True),
+            'lunge': Exercise.objects.create(
+                name="Walking Lunge", created_by=coach, is_public=True,
+                instructions="Step forward and lower as in a split squat.",
+            ),
+            'press': Exercise.objects.create(name="Bench Press", created_by=coach, is_public=True),
+            'own': Exercise.objects.create(name="Box Squat", created_by=coach),
+            'private': Exercise.objects.create(name="Zercher Squat", created_by=other_coach),
+            'retired': Exercise.objects.create(name="Smith Squat", created_by=coach, is_public=True, is_active=False),
+        }
+
+    def names(self, actor, query):
+        return [exercise.name for exercise in ExerciseService.search_exercises(actor, query)]
+
+    def test_typo_matches_by_trigram(self, coach, exercises):
+        assert "Back Squat" in self.names(coach, "sqat")
+
+    def test_name_matches_rank_above_instruction_matches(self, coach, exercises):
+        names = self.names(coach, "squat")
+        assert names.index("Back Squat") < names.index("Walking Lunge")
+        assert "Bench Press" not in names
+
+    def test_scoped_to_visible_exercises(self, coach, other_coach, exercises):
+        names = self.names(coach, "squat")
+        assert "Box Squat" in names
+        assert "Zercher Squat" not in names
+        assert "Smith Squat" not in names
+        assert "Zercher Squat" in self.names(other_coach, "squat")
+
+    def test_empty_query(self, coach, exercises):
+        assert self.names(coach, "  ") == []
+
+    def test_search_vector_follows_writes(self, coach, exercises):
+        press = exercises['press']
+        press.name = "Overhead Press"
+        press.save()
+        assert "Overhead Press" in self.names(coach, "overhead")
+
+        # queryset updates bypass save() until the vectors are refreshed
+        Exercise.objects.filter(pk=press.pk).update(instructions="Strict deadlift lockout")
+        assert "Overhead Press" not in self.names(coach, "lockout")
+        ExerciseService.refresh_search_vectors([press.pk])
+        assert "Overhead Press" in self.names(coach, "lockout")
+
+    def test_fuzzy_match_uses_the_trigram_index(self, coach, exercises):
+        queryset = ExerciseService._search_queryset(coach, "sqat")
+        with transaction.atomic():
+            with connection.cursor() as cursor:
+                # the test table is tiny; make the planner show which index it would use
+                cursor.execute("SET LOCAL enable_seqscan = off")
+            plan = queryset.explain()
+        assert "exercise_name_trgm" in plan
+        assert "exercise_search_vector_gin" in plan
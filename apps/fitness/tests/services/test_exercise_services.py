@@ -10,3 +10,28 @@ def test_create_exercise():
     user = User.objects.create(username="user1", email="user1@example.com", is_active=True)
     exercise = Exercise.objects.create(name="Push Up", created_by=user)
     assert exercise.id is not None
+
+
+@pytest.mark.django_db
+def test_list_exercises_query_count_is_constant(django_assert_max_num_queries):
+    from apps.fitness.models.workout import ExerciseMuscleGroup, Modality, MuscleGroup
+    from apps.fitness.serializers.exercise import ExerciseSerializer
+    from apps.fitness.services.exercise_service import ExerciseService
+    from apps.fitness.services.taxonomy_cache import TaxonomyCache
+
+    user = User.objects.create(username="coach1", email="coach1@example.com", is_coach=True, is_active=True)
+    chest = MuscleGroup.objects.create(id="chest", title="Chest")
+    strength = Modality.objects.create(id="strength", title="Strength")
+    for i in range(5):
+        exercise = Exercise.objects.create(name=f"Exercise {i}", created_by=user)
+        exercise.modalities.add(strength)
+        ExerciseMuscleGroup.objects.create(exercise=exercise, muscle_group=chest, is_primary=True)
+
+    TaxonomyCache.title(MuscleGroup, "chest")  # warm the per-process taxonomy
+
+    # rows + images + videos + modalities + muscle entries
+    with django_assert_max_num_queries(5):
+        data = ExerciseSerializer(ExerciseService.list_exercises(user), many=True).data
+
+    assert len(data) == 5
+    assert data[0]["muscle_groups"][0]["muscle_group_title"] == "Chest"
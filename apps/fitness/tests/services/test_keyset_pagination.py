@@ -0,0 +1,93 @@
+import pytest
+from django.contrib.auth import get_user_model
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory, force_authenticate
+from apps.fitness.models.workout import ProgramAssignment, WorkoutProgram, WorkoutSession
+from apps.fitness.views.client_programs import ClientAssignedProgramsView
+from config.utils.pagination import KeysetCursorPagination, get_paginator, StandardResultsSetPagination
+
+User = get_user_model()
+factory = APIRequestFactory()
+
+
+def paginate(queryset, params, ordering=("title", "-id")):
+    request = Request(factory.get("/programs/", params))
+    paginator = KeysetCursorPagination(ordering=ordering)
+    rows = paginator.paginate_queryset(queryset, request)
+    return rows, paginator
+
+
+@pytest.mark.django_db
+class TestKeysetCursorPagination:
+
+    @pytest.fixture
+    def programs(self):
+        coach = User.objects.create(username="coach1", email="coach1@example.com", is_coach=True)
+        # duplicate titles exercise the id tie-breaker
+        for title in ["A", "B", "B", "B", "C", "D", "E"]:
+            WorkoutProgram.objects.create(title=title, created_by=coach)
+        return WorkoutProgram.objects.all()
+
+    def test_walks_forward_and_back_without_gaps(self, programs):
+        expected = list(programs.order_by("title", "-id"))
+
+        seen, params = [], {"page_size": 3}
+        while True:
+            rows, paginator = paginate(programs, params)
+            seen.extend(rows)
+            if not paginator.next_cursor:
+                break
+            params = {"page_size": 3, "cursor": paginator.next_cursor}
+        assert seen == expected
+
+        rows, paginator = paginate(programs, {"page_size": 3, "cursor": paginator.previous_cursor})
+        assert rows == expected[3:6]
+
+    def test_count_only_when_asked(self, programs):
+        _, paginator = paginate(programs, {})
+        assert paginator.count is None
+        assert paginator.previous_cursor is None
+
+        _, paginator = paginate(programs, {"with_count": "true"})
+        assert paginator.count == 7
+
+    def test_page_number_remains_default(self):
+        request = Request(factory.get("/programs/"))
+        assert isinstance(get_paginator(request, ordering=("id",)), StandardResultsSetPagination)
+
+        request = Request(factory.get("/programs/", {"pagination": "cursor"}))
+        assert isinstance(get_paginator(request, ordering=("id",)), KeysetCursorPagination)
+
+    @pytest.mark.parametrize("ordering", [("program_id", "id"), ("-program_id", "id")])
+    def test_nullable_ordering_field_keeps_every_row(self, programs, ordering):
+        for program in programs[:2]:
+            WorkoutSession.objects.create(program=program, title="Day 1")
+            WorkoutSession.objects.create(program=program, title="Day 2")
+        for _ in range(3):
+            WorkoutSession.objects.create(title="Loose")
+        sessions = WorkoutSession.objects.all()
+        expected = list(sessions.order_by(*ordering))
+
+        seen, params = [], {"page_size": 2}
+        while True:
+            rows, paginator = paginate(sessions, params, ordering=ordering)
+            seen.extend(rows)
+            if not paginator.next_cursor:
+                break
+            params = {"page_size": 2, "cursor": paginator.next_cursor}
+        assert seen == expected
+
+        rows, _ = paginate(sessions, {"page_size": 2, "cursor": paginator.previous_cursor}, ordering=ordering)
+        assert rows == expected[4:6]
+
+    def test_client_programs_keep_the_page_number_envelope(self, programs):
+        client = User.objects.create(username="client1", email="client1@example.com")
+        ProgramAssignment.objects.create(client=client, program=programs[0], coach=programs[0].created_by)
+
+        def call(params):
+            request = factory.get("/client/programs/", params)
+            force_authenticate(request, user=client)
+            return ClientAssignedProgramsView.as_view()(request).data["data"]
+
+        assert call({})["data"]["count"] == 1
+        assert len(call({"pagination": "cursor"})["results"]) == 1
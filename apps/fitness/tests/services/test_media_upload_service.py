@@ -0,0 +1,174 @@
+from io import BytesIO
+from types import SimpleNamespace
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.files.storage import FileSystemStorage
+from apps.fitness.models.workout import Exercise, ExerciseImage, WorkoutProgram
+from apps.fitness.services.media_upload_service import MULTIPART_THRESHOLD, MediaUploadService
+from config.utils.exceptions import BadRequestException, ForbiddenException
+
+User = get_user_model()
+
+
+class StubClientError(Exception):
+    pass
+
+
+class StubS3Client:
+    exceptions = SimpleNamespace(ClientError=StubClientError)
+
+    def __init__(self):
+        self.calls = []
+
+    def generate_presigned_url(self, operation, Params, ExpiresIn, HttpMethod):
+        self.calls.append((operation, Params))
+        return f"https://minio.local/{Params['Bucket']}/{Params['Key']}?X-Amz-Signature=sig"
+
+    def create_multipart_upload(self, **params):
+        self.calls.append(('create_multipart_upload', params))
+        return {'UploadId': 'upload-1'}
+
+    def complete_multipart_upload(self, **params):
+        self.calls.append(('complete_multipart_upload', params))
+        if any(part['ETag'] == '"bad"' for part in params['MultipartUpload']['Parts']):
+            raise StubClientError("InvalidPart")
+        self.storage.objects[params['Key'].removeprefix('media/')] = MULTIPART_THRESHOLD + 1
+
+    def abort_multipart_upload(self, **params):
+        self.calls.append(('abort_multipart_upload', params))
+
+
+class StubS3Storage:
+    bucket_name = 'fitness'
+
+    def __init__(self):
+        self.objects = {}
+        client = StubS3Client()
+        client.storage = self
+        self.connection = SimpleNamespace(meta=SimpleNamespace(client=client))
+
+    def generate_filename(self, name):
+        return name
+
+    def _normalize_name(self, name):
+        return f"media/{name}"
+
+    def exists(self, name):
+        return name in self.objects
+
+    def size(self, name):
+        return self.objects[name]
+
+    def delete(self, name):
+        self.objects.pop(name, None)
+
+
+@pytest.mark.django_db
+class TestMediaUploadService:
+
+    @pytest.fixture
+    def coach(self):
+        return User.objects.create(username="coach1", email="coach1@example.com", is_coach=True)
+
+    @pytest.fixture
+    def exercise(self, coach):
+        return Exercise.objects.create(name="Squat", created_by=coach)
+
+    @pytest.fixture
+    def local(self, monkeypatch, tmp_path):
+        storage = FileSystemStorage(location=tmp_path)
+        monkeypatch.setattr(MediaUploadService, "storage", storage)
+        return storage
+
+    @pytest.fixture
+    def s3(self, monkeypatch):
+        storage = StubS3Storage()
+        monkeypatch.setattr(MediaUploadService, "storage", storage)
+        return storage
+
+    def test_local_round_trip(self, coach, exercise, local):
+        upload = MediaUploadService.start(coach, 'exercise_image', 'front squat.png', 'image/png', 4, exercise.id)
+        assert upload['url'].startswith('/api/v1/media/uploads/local/')
+
+        name = MediaUploadService.receive(upload['token'], BytesIO(b'\x89PNG'), 'image/png', 4)
+        assert name.startswith(f"users/{coach.id}/workout/exercises/{exercise.id}/images/")
+        assert name.endswith("-front_squat.png")
+
+        target, image = MediaUploadService.confirm(coach, upload['token'])
+        assert target == 'exercise_image'
+        assert image.image_file.name == name
+        # confirming again does not attach twice
+        MediaUploadService.confirm(coach, upload['token'])
+        assert ExerciseImage.objects.filter(exercise=exercise).count() == 1
+
+    def test_confirm_checks_the_upload(self, coach, exercise, local):
+        upload = MediaUploadService.start(coach, 'exercise_image', 'a.png', 'image/png', 4, exercise.id)
+        with pytest.raises(BadRequestException):
+            MediaUploadService.confirm(coach, upload['token'])
+
+        with pytest.raises(BadRequestException):
+            MediaUploadService.receive(upload['token'], BytesIO(b'\x89PNG'), 'image/jpeg', 4)
+        with pytest.raises(ForbiddenException):
+            MediaUploadService.receive(upload['token'] + 'x', BytesIO(b'\x89PNG'), 'image/png', 4)
+
+    def test_only_the_owner_may_upload(self, exercise, local):
+        other = User.objects.create(username="coach2", email="coach2@example.com", is_coach=True)
+        with pytest.raises(ForbiddenException):
+            MediaUploadService.start(other, 'exercise_image', 'a.png', 'image/png', 4, exercise.id)
+
+    def test_type_and_size_limits(self, coach, exercise, local):
+        with pytest.raises(BadRequestException):
+            MediaUploadService.start(coach, 'exercise_image', 'a.mp4', 'video/mp4', 4, exercise.id)
+        with pytest.raises(BadRequestException):
+            MediaUploadService.start(coach, 'profile_picture', 'me.png', 'image/png', 50 * 1024 * 1024)
+
+    def test_presigned_put(self, coach, s3):
+        upload = MediaUploadService.start(coach, 'profile_picture', 'me.png', 'image/png', 1000)
+
+        operation, params = s3.connection.meta.client.calls[0]
+        assert operation == 'put_object'
+        assert params['Key'].startswith(f"media/users/{coach.id}/profile_images/")
+        assert params['ContentType'] == 'image/png'
+        assert upload['url'].startswith('https://minio.local/fitness/')
+
+        s3.objects[params['Key'].removeprefix('media/')] = 1000
+        MediaUploadService.confirm(coach, upload['token'])
+        coach.refresh_from_db()
+        assert f"media/{coach.profile_picture.name}" == params['Key']
+
+    def test_multipart_for_large_files(self, coach, s3):
+        program = WorkoutProgram.objects.create(title="Block", created_by=coach)
+        upload = MediaUploadService.start(coach, 'program_video', 'intro.mp4', 'video/mp4', MULTIPART_THRESHOLD + 1, program.id)
+        assert [part['number'] for part in upload['parts']] == [1, 2]
+
+        with pytest.raises(BadRequestException):
+            MediaUploadService.confirm(coach, upload['token'])
+        MediaUploadService.confirm(coach, upload['token'], parts=[
+            {'number': 2, 'etag': '"b"'}, {'number': 1, 'etag': '"a"'},
+        ])
+
+        operation, params = s3.connection.meta.client.calls[-1]
+        assert operation == 'complete_multipart_upload'
+        assert params['UploadId'] == 'upload-1'
+        assert [part['PartNumber'] for part in params['MultipartUpload']['Parts']] == [1, 2]
+        program.refresh_from_db()
+        assert program.video.name.startswith(f"users/{coach.id}/workout/programs/{program.id}/videos/")
+
+    def test_failed_confirm_cleans_up(self, coach, s3):
+        program = WorkoutProgram.objects.create(title="Block", created_by=coach)
+        upload = MediaUploadService.start(coach, 'program_video', 'intro.mp4', 'video/mp4', MULTIPART_THRESHOLD + 1, program.id)
+
+        with pytest.raises(BadRequestException):
+            MediaUploadService.confirm(coach, upload['token'], parts=[
+                {'number': 1, 'etag': '"a"'}, {'number': 2, 'etag': '"bad"'},
+            ])
+        operation, params = s3.connection.meta.client.calls[-1]
+        assert (operation, params['UploadId']) == ('abort_multipart_upload', 'upload-1')
+
+        upload = MediaUploadService.start(coach, 'profile_picture', 'me.png', 'image/png', 1000)
+        name = s3.connection.meta.client.calls[-1][1]['Key'].removeprefix('media/')
+        s3.objects[name] = 999
+        with pytest.raises(BadRequestException):
+            MediaUploadService.confirm(coach, upload['token'])
+        assert name not in s3.objects
@@ -0,0 +1,49 @@
+import pytest
+from django.core.cache import cache
+from apps.fitness.services.media_url_service import MediaUrlService
+
+
+class CountingStorage:
+    querystring_auth = True
+
+    def __init__(self):
+        self.signed = []
+
+    def url(self, name):
+        self.signed.append(name)
+        return f"https://minio.local/media/{name}?X-Amz-Signature=sig"
+
+
+class TestMediaUrlService:
+
+    @pytest.fixture(autouse=True)
+    def storage(self, monkeypatch, settings):
+        settings.MEDIA_PUBLIC_URL = ""
+        storage = CountingStorage()
+        monkeypatch.setattr(MediaUrlService, "storage", storage)
+        MediaUrlService.clear()
+        cache.clear()
+        return storage
+
+    def test_urls_are_signed_once(self, storage):
+        names = ["users/1/a.png", "users/1/b.png"]
+
+        first = MediaUrlService.urls(names)
+        second = MediaUrlService.urls(names + [""])
+
+        assert first == second
+        assert sorted(storage.signed) == names
+
+    def test_shared_cache_serves_other_processes(self, storage):
+        url = MediaUrlService.url("users/1/a.png")
+        MediaUrlService.clear()  # a fresh process
+
+        assert MediaUrlService.url("users/1/a.png") == url
+        assert storage.signed == ["users/1/a.png"]
+
+    def test_public_base_url_skips_signing(self, storage, settings):
+        settings.MEDIA_PUBLIC_URL = "https://cdn.example.com/media/"
+
+        assert MediaUrlService.url("users/1/my file.png") == "https://cdn.example.com/media/users/1/my%20file.png"
+        assert MediaUrlService.url("") is None
+        assert storage.signed == []
@@ -0,0 +1,58 @@
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.exceptions import ValidationError
+from apps.fitness.models.workout import Exercise, ExerciseMuscleGroup, MuscleGroup
+from apps.fitness.services.exercise_service import ExerciseService
+
+User = get_user_model()
+
+
+@pytest.mark.django_db
+class TestMuscleGroupHierarchy:
+
+    @pytest.fixture
+    def tree(self):
+        legs = MuscleGroup.objects.create(id="legs", title="Legs")
+        quads = MuscleGroup.objects.create(id="quads", title="Quads", parent=legs)
+        vastus = MuscleGroup.objects.create(id="vastus", title="Vastus", parent=quads)
+        chest = MuscleGroup.objects.create(id="chest", title="Chest")
+        return legs, quads, vastus, chest
+
+    def test_paths_are_materialized(self, tree):
+        legs, quads, vastus, chest = tree
+        assert vastus.path == "legs/quads/vastus/"
+        assert vastus.depth == 2
+        assert set(MuscleGroup.objects.subtree(["legs"]).values_list("id", flat=True)) == {"legs", "quads", "vastus"}
+
+    def test_moving_a_group_rewrites_descendants(self, tree):
+        legs, quads, vastus, chest = tree
+        quads.parent = chest
+        quads.save()
+
+        vastus.refresh_from_db()
+        assert vastus.path == "chest/quads/vastus/"
+        assert vastus.depth == 2
+        assert set(MuscleGroup.objects.subtree(["legs"]).values_list("id", flat=True)) == {"legs"}
+
+    def test_cannot_move_under_own_subtree(self, tree):
+        legs, quads, vastus, chest = tree
+        legs.parent = vastus
+        with pytest.raises(ValidationError):
+            legs.save()
+
+    def test_rebuild_paths(self, tree):
+        MuscleGroup.objects.update(path="", depth=0)
+        MuscleGroup.rebuild_paths()
+        assert MuscleGroup.objects.get(id="vastus").path == "legs/quads/vastus/"
+
+    def test_exercises_filtered_by_subtree(self, tree):
+        legs, quads, vastus, chest = tree
+        user = User.objects.create(username="coach1", email="coach1@example.com", is_coach=True)
+        squat = Exercise.objects.create(name="Squat", created_by=user)
+        press = Exercise.objects.create(name="Bench Press", created_by=user)
+        ExerciseMuscleGroup.objects.create(exercise=squat, muscle_group=vastus, is_primary=True)
+        ExerciseMuscleGroup.objects.create(exercise=press, muscle_group=chest, is_primary=True)
+
+        exercises = ExerciseService.list_exercises(user, muscle_group_ids=["legs"])
+        assert list(exercises) == [squat]
+        assert not ExerciseService.list_exercises(user, muscle_group_ids=["legs"], is_primary=False).exists()
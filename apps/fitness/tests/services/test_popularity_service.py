@@ -0,0 +1,101 @@
+import pytest
+from django.contrib.auth import get_user_model
+from apps.fitness.models.workout import Exercise, WorkoutProgram, WorkoutSession
+from apps.fitness.services.popularity_service import BufferedCounter, PopularityService, session_popularity
+
+User = get_user_model()
+
+
+@pytest.mark.django_db
+class TestBufferedCounter:
+
+    @pytest.fixture
+    def exercises(self):
+        user = User.objects.create(username="coach1", email="coach1@example.com", is_coach=True)
+        return [
+            Exercise.objects.create(name="Squat", created_by=user, popularity=10),
+            Exercise.objects.create(name="Lunge", created_by=user),
+        ]
+
+    def test_read_merges_unflushed_delta(self, exercises):
+        squat, lunge = exercises
+        counter = BufferedCounter(Exercise, "popularity", max_pending=100, flush_interval=3600)
+
+        counter.increment([squat.pk, squat.pk, lunge.pk])
+
+        squat.refresh_from_db()
+        assert squat.popularity == 10
+        assert counter.read([squat.pk, lunge.pk]) == {squat.pk: 12, lunge.pk: 1}
+
+    def test_flush_writes_all_deltas_in_one_statement(self, exercises, django_assert_num_queries):
+        squat, lunge = exercises
+        counter = BufferedCounter(Exercise, "popularity", max_pending=100, flush_interval=3600)
+        counter.increment([squat.pk, squat.pk, lunge.pk])
+
+        with django_assert_num_queries(1):
+            assert counter.flush() == 2
+
+        assert counter.pending(squat.pk) == 0
+        assert dict(Exercise.objects.values_list("name", "popularity")) == {"Squat": 12, "Lunge": 1}
+
+    def test_batch_in_flight_stays_visible(self, exercises, monkeypatch):
+        squat, _ = exercises
+        counter = BufferedCounter(Exercise, "popularity", max_pending=100, flush_interval=3600)
+        counter.increment([squat.pk])
+        write = counter._write
+        seen = []
+
+        def observed_write(batch):
+            seen.append(counter.read([squat.pk])[squat.pk])
+            write(batch)
+
+        monkeypatch.setattr(counter, "_write", observed_write)
+        counter.flush()
+
+        assert seen == [11]
+        assert counter.read([squat.pk]) == {squat.pk: 11}
+
+    def test_failed_flush_keeps_deltas(self, exercises, monkeypatch, django_capture_on_commit_callbacks):
+        squat, _ = exercises
+        counter = BufferedCounter(Exercise, "popularity", max_pending=1, flush_interval=3600)
+
+        def broken_write(batch):
+            raise RuntimeError("db down")
+
+        monkeypatch.setattr(counter, "_write", broken_write)
+        with django_capture_on_commit_callbacks() as callbacks:
+            counter.increment([squat.pk])
+        # the flush due at max_pending must not fail the caller's request
+        assert callbacks == [counter.flush_quietly]
+        callbacks[0]()
+        assert counter.pending(squat.pk) == 1
+
+        with pytest.raises(RuntimeError):
+            counter.flush()
+        assert counter.pending(squat.pk) == 1
+
+    def test_assignment_counts_only_once_committed(self, exercises, django_capture_on_commit_callbacks):
+        squat, _ = exercises
+        program = WorkoutProgram.objects.create(title="Block", created_by=squat.created_by)
+        session = WorkoutSession.objects.create(program=program, title="Day 1", created_by=squat.created_by)
+
+        with django_capture_on_commit_callbacks() as callbacks:
+            PopularityService.record_program_assignment(program)
+        assert session_popularity.pending(session.pk) == 0
+
+        callbacks[0]()
+        assert session_popularity.pending(session.pk) == 1
+
+
+@pytest.mark.django_db(transaction=True)
+def test_timer_flushes_pending_deltas():
+    user = User.objects.create(username="coach1", email="coach1@example.com", is_coach=True)
+    squat = Exercise.objects.create(name="Squat", created_by=user)
+    counter = BufferedCounter(Exercise, "popularity", max_pending=100, flush_interval=0.2)
+
+    counter.increment([squat.pk])
+    counter._timer.join(timeout=5)
+
+    squat.refresh_from_db()
+    assert squat.popularity == 1
+    assert counter.pending(squat.pk) == 0
@@ -0,0 +1,109 @@
+import pytest
+from django.contrib.auth import get_user_model
+from apps.fitness.models.coach_client import CoachClient
+from apps.fitness.models.workout import Exercise, WorkoutExercise, WorkoutProgram, WorkoutSession
+from apps.fitness.services.program_clone_service import ProgramCloneService
+from apps.jobs.models import Job
+from apps.jobs.services.job_service import JobService
+from config.utils.exceptions import BadRequestException, NotFoundException
+
+User = get_user_model()
+
+
+@pytest.mark.django_db
+class TestProgramCloneService:
+
+    @pytest.fixture
+    def coach(self):
+        return User.objects.create(username="coach1", email="coach1@example.com", is_coach=True, is_active=True)
+
+    @pytest.fixture
+    def other_coach(self):
+        return User.objects.create(username="coach2", email="coach2@example.com", is_coach=True, is_active=True)
+
+    def make_program(self, owner, weeks=2, **kwargs):
+        program = WorkoutProgram.objects.create(title="Template", created_by=owner, duration_weeks=weeks, **kwargs)
+        exercise = Exercise.objects.create(name="Squat", created_by=owner)
+        for week in range(1, weeks + 1):
+            session = WorkoutSession.objects.create(
+                program=program, title=f"Week {week}", week_number=week, created_by=owner, popularity=7
+            )
+            for reps in (5, 8, 10):
+                WorkoutExercise.objects.create(session=session, exercise=exercise, sets=3, reps=reps)
+        return program
+
+    @pytest.mark.parametrize("weeks", [1, 24])
+    def test_clone_query_count_is_constant(self, coach, weeks, django_assert_max_num_queries):
+        source = self.make_program(coach, weeks=weeks, is_public=True, is_published=True)
+
+        # savepoint + sources + program insert + one INSERT ... SELECT + release
+        with django_assert_max_num_queries(5):
+            copy = ProgramCloneService.clone_programs(coach, [source.id])[0]
+
+        assert copy.title == "Template (Copy)"
+        assert copy.duration_weeks == weeks
+        assert (copy.is_public, copy.is_published, copy.is_active) == (False, False, False)
+
+        sessions = list(copy.sessions.order_by('week_number'))
+        assert [s.title for s in sessions] == [f"Week {w}" for w in range(1, weeks + 1)]
+        assert {s.popularity for s in sessions} == {0}
+        assert not {s.id for s in sessions} & set(source.sessions.values_list('id', flat=True))
+        assert sorted(WorkoutExercise.objects.filter(session=sessions[0]).values_list('reps', flat=True)) == [5, 8, 10]
+        # the source is untouched
+        assert WorkoutExercise.objects.filter(session__program=source).count() == 3 * weeks
+
+    def test_clone_many_programs(self, coach, other_coach):
+        own = self.make_program(coach)
+        public = self.make_program(other_coach, is_public=True)
+
+        copies = ProgramCloneService.clone_programs(coach, [own.id, public.id])
+
+        assert [c.created_by_id for c in copies] == [coach.id, coach.id]
+        assert [c.sessions.count() for c in copies] == [2, 2]
+        assert WorkoutSession.objects.filter(program__in=copies, created_by=coach).count() == 4
+
+    def test_private_program_of_someone_else_is_not_found(self, coach, other_coach):
+        private = self.make_program(other_coach)
+
+        with pytest.raises(NotFoundException):
+            ProgramCloneService.clone_programs(coach, [private.id])
+
+    def test_clone_for_clients(self, coach):
+        source = self.make_program(coach)
+        clients = [
+            User.objects.create(username=f"client{i}", email=f"client{i}@example.com", is_active=True)
+            for i in range(3)
+        ]
+        for client in clients:
+            CoachClient.objects.create(coach=coach, client=client)
+
+        copies = ProgramCloneService.clone_program_for_clients(coach, source.id, [c.id for c in clients])
+
+        assert list(copies) == [c.id for c in clients]
+        assert copies[clients[0].id].title == "Template (client0)"
+        assert all(copy.is_custom for copy in copies.values())
+        assert WorkoutExercise.objects.filter(session__program__in=copies.values()).count() == 3 * 6
+
+    def test_clone_for_unrelated_client_is_rejected(self, coach):
+        source = self.make_program(coach)
+        stranger = User.objects.create(username="stranger", email="stranger@example.com")
+
+        with pytest.raises(BadRequestException):
+            ProgramCloneService.clone_program_for_clients(coach, source.id, [stranger.id])
+        assert WorkoutProgram.objects.count() == 1
+
+    def test_clone_in_background(self, coach, other_coach):
+        source = self.make_program(coach)
+
+        with pytest.raises(NotFoundException):
+            ProgramCloneService.enqueue_clone_programs(coach, [self.make_program(other_coach).id])
+
+        job = ProgramCloneService.enqueue_clone_programs(coach, [source.id])
+        assert WorkoutProgram.objects.filter(created_by=coach).count() == 1
+
+        JobService.run(JobService.claim('test-worker')[0])
+        job.refresh_from_db()
+        assert job.status == Job.Status.SUCCEEDED
+        copy = WorkoutProgram.objects.get(id=job.result['program_ids'][0])
+        assert copy.title == "Template (Copy)"
+        assert WorkoutExercise.objects.filter(session__program=copy).count() == 6
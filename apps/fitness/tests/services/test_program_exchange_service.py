@@ -0,0 +1,117 @@
+import io
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from rest_framework.test import APIRequestFactory, force_authenticate
+from apps.fitness.models.workout import Exercise, WorkoutExercise, WorkoutProgram, WorkoutSession
+from apps.fitness.services.program_exchange_service import ProgramExchangeService
+from apps.fitness.views.workout_program import WorkoutProgramImportView
+from config.utils.exceptions import BadRequestException
+
+User = get_user_model()
+
+
+@pytest.mark.django_db
+class TestProgramExchangeService:
+
+    @pytest.fixture
+    def coach(self):
+        return User.objects.create(username="coach1", email="coach1@example.com", is_coach=True)
+
+    @pytest.fixture
+    def other_coach(self):
+        return User.objects.create(username="coach2", email="coach2@example.com", is_coach=True)
+
+    @pytest.fixture
+    def programs(self, coach):
+        squat = Exercise.objects.create(name="Squat", created_by=coach, is_public=True)
+        programs = []
+        for n in range(5):
+            program = WorkoutProgram.objects.create(title=f"Block {n}", created_by=coach, price="19.90", level="advanced")
+            for week in (1, 2):
+                session = WorkoutSession.objects.create(program=program, title=f"Week {week}", week_number=week)
+                WorkoutExercise.objects.create(session=session, exercise=squat, sets=5, reps=week + 2, tempo="3010")
+            programs.append(program)
+        return programs
+
+    def export(self, coach, fmt, **kwargs):
+        return io.BytesIO(b''.join(ProgramExchangeService.export_programs(coach, fmt=fmt, **kwargs)))
+
+    @pytest.mark.parametrize("fmt", ["ndjson", "msgpack"])
+    def test_round_trip(self, coach, other_coach, programs, fmt):
+        stream = self.export(coach, fmt, batch_size=2)
+
+        created = ProgramExchangeService.import_programs(
+            other_coach, ProgramExchangeService.decode(stream, fmt), batch_size=2
+        )
+
+        assert created == 5
+        copies = WorkoutProgram.objects.filter(created_by=other_coach).order_by('title')
+        assert [p.title for p in copies] == [f"Block {n}" for n in range(5)]
+        assert all(p.session_count == 2 and not p.is_public for p in copies)
+        reps = WorkoutExercise.objects.filter(session__program=copies[0]).order_by('reps').values_list('reps', 'tempo')
+        assert list(reps) == [(3, "3010"), (4, "3010")]
+
+    def test_export_query_count_per_batch(self, coach, programs, django_assert_num_queries):
+        # per batch of 2: an id page and three flat queries; then one empty id page
+        with django_assert_num_queries(3 * (1 + 3) + 1):
+            self.export(coach, "ndjson", batch_size=2)
+
+    def test_unresolved_exercise_is_rejected(self, coach, other_coach, programs):
+        stream = self.export(coach, "ndjson", program_ids=[programs[0].id])
+        Exercise.objects.update(is_public=False)
+
+        with pytest.raises(BadRequestException):
+            ProgramExchangeService.import_programs(other_coach, ProgramExchangeService.decode(stream, "ndjson"))
+        assert not WorkoutProgram.objects.filter(created_by=other_coach).exists()
+
+    def test_rejects_foreign_streams(self, coach):
+        with pytest.raises(BadRequestException):
+            list(ProgramExchangeService.decode(io.BytesIO(b'{"title": "x"}\n'), "ndjson"))
+
+    @pytest.mark.parametrize("record", [
+        '["not", "a", "program"]',
+        '{"title": "x", "sessions": {"title": "Day 1"}}',
+        '{"title": "x", "sessions": [{"exercises": [{"sets": 3}]}]}',
+        '{"title": "x", "sessions": [{"exercises": [{"exercise": {"id": null}}]}]}',
+        '{"title": "x", "sessions": [{"exercises": [{"exercise": {"id": ["a"]}}]}]}',
+        '{"title": "x", "price": "free"}',
+        '{"title": "x", "duration_weeks": "many"}',
+        '{"title": "' + 'x' * 300 + '"}',
+        '{"title": "x", "sessions": [{"title": null}]}',
+        '{"title": "x", "sessions": [{"title": "Day 1", "exercises": [{"exercise": {"slug": "squat"}, "sets": 3}]}]}',
+    ])
+    def test_malformed_records_are_rejected(self, coach, record):
+        stream = io.BytesIO(b'{"format": "fitness-programs", "version": 1}\n' + record.encode() + b'\n')
+
+        with pytest.raises(BadRequestException):
+            ProgramExchangeService.import_programs(coach, ProgramExchangeService.decode(stream, "ndjson"))
+        assert not WorkoutProgram.objects.exists()
+
+    def test_slug_prefers_own_then_oldest_public_exercise(self, coach, other_coach):
+        public = [Exercise.objects.create(name="Lunge", created_by=coach, is_public=True) for _ in range(2)]
+        stream = io.BytesIO(
+            b'{"format": "fitness-programs", "version": 1}\n'
+            b'{"title": "x", "sessions": [{"title": "Day 1", "exercises": [{"exercise": {"id": null, "slug": "lunge"}, "sets": 3, "reps": 8}]}]}\n'
+        )
+        records = list(ProgramExchangeService.decode(stream, "ndjson"))
+
+        ProgramExchangeService.import_programs(other_coach, iter(records))
+        assert WorkoutExercise.objects.get(session__program__created_by=other_coach).exercise == public[0]
+
+        own = Exercise.objects.create(name="Lunge", created_by=other_coach)
+        ProgramExchangeService.import_programs(other_coach, iter(records))
+        used = WorkoutExercise.objects.filter(session__program__created_by=other_coach).values_list('exercise', flat=True)
+        assert sorted(used, key=str) == sorted([public[0].id, own.id], key=str)
+
+    def test_import_view_rejects_an_empty_body(self, coach):
+        request = APIRequestFactory().post("/workouts/programs/import/", content_type="application/x-ndjson")
+        force_authenticate(request, user=coach)
+        assert WorkoutProgramImportView.as_view()(request).status_code == 400
+
+    def test_commands(self, coach, other_coach, programs, tmp_path):
+        path = tmp_path / "programs.msgpack"
+        call_command('export_programs', owner=coach.email, output=str(path), format='msgpack', stderr=io.StringIO())
+        call_command('import_programs', str(path), owner=other_coach.email, stdout=io.StringIO())
+        assert WorkoutProgram.objects.filter(created_by=other_coach).count() == 5
@@ -0,0 +1,101 @@
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from apps.fitness.models.coach_client import CoachClient
+from apps.fitness.models.workout import ProgramAssignment, WorkoutProgram, WorkoutSession
+from apps.fitness.services.program_clone_service import ProgramCloneService
+from apps.fitness.services.program_assignment_service import ProgramAssignmentService
+from apps.fitness.services.program_marketplace_service import ProgramMarketplaceService
+from apps.fitness.services.workout_program_service import WorkoutProgramService
+from config.utils.exceptions import BadRequestException, ForbiddenException
+
+User = get_user_model()
+
+
+@pytest.mark.django_db
+class TestProgramMarketplaceService:
+
+    @pytest.fixture
+    def coach(self):
+        return User.objects.create(username="coach1", email="coach1@example.com", is_coach=True)
+
+    def make_program(self, coach, title, sessions=1, **kwargs):
+        program = WorkoutProgram.objects.create(title=title, created_by=coach, **kwargs)
+        for week in range(sessions):
+            WorkoutSession.objects.create(program=program, title=f"W{week}", week_number=week + 1)
+        WorkoutProgramService.publish_program(coach, program.id)
+        return program
+
+    def make_client(self, n):
+        return User.objects.create(username=f"client{n}", email=f"client{n}@example.com")
+
+    def test_filters_and_sorts(self, coach):
+        beginner = self.make_program(coach, "Start", level="beginner", price=0)
+        advanced = self.make_program(coach, "Peak", level="advanced", price=50, is_verified=True)
+        WorkoutProgram.objects.create(title="Draft", created_by=coach, is_public=True)
+
+        for n in range(2):
+            ProgramAssignment.objects.create(client=self.make_client(n), program=advanced, coach=coach)
+        ProgramMarketplaceService.refresh_stats([beginner.id, advanced.id])
+
+        programs, ordering = ProgramMarketplaceService.list_programs({})
+        assert list(programs.order_by(*ordering)) == [advanced, beginner]
+
+        programs, ordering = ProgramMarketplaceService.list_programs({'sort': 'newest'})
+        assert list(programs.order_by(*ordering)) == [advanced, beginner]
+
+        programs, _ = ProgramMarketplaceService.list_programs({'level': 'beginner'})
+        assert list(programs) == [beginner]
+        programs, _ = ProgramMarketplaceService.list_programs({'price_min': '10', 'is_verified': 'true'})
+        assert list(programs) == [advanced]
+
+        with pytest.raises(BadRequestException):
+            ProgramMarketplaceService.list_programs({'price_max': 'cheap'})
+        with pytest.raises(BadRequestException):
+            ProgramMarketplaceService.list_programs({'sort': 'random'})
+
+    def test_stats_follow_writes(self, coach):
+        program = WorkoutProgramService.create_program_with_sessions(coach, {
+            'title': "Block",
+            'sessions': [{'title': "Day 1", 'exercises': []}, {'title': "Day 2", 'exercises': []}],
+        })
+        program.refresh_from_db()
+        assert program.session_count == 2
+
+        client = self.make_client(1)
+        with pytest.raises(ForbiddenException):
+            ProgramMarketplaceService.review_program(actor=client, program_id=program.id, rating=5)
+
+        ProgramAssignment.objects.create(client=client, program=program, coach=coach)
+        ProgramMarketplaceService.review_program(actor=client, program_id=program.id, rating=4)
+        ProgramMarketplaceService.review_program(actor=client, program_id=program.id, rating=2)
+        program.refresh_from_db()
+        assert (program.assignment_count, program.rating_count, program.rating_avg) == (1, 1, 2.0)
+
+        copy = ProgramCloneService.clone_programs(coach, [program.id])[0]
+        copy.refresh_from_db()
+        assert (copy.session_count, copy.assignment_count, copy.rating_count) == (2, 0, 0)
+
+    def test_assignment_bumps_the_counter_after_commit(self, coach, django_capture_on_commit_callbacks):
+        program = self.make_program(coach, "Block")
+        client = self.make_client(1)
+        CoachClient.objects.create(coach=coach, client=client, is_active=True)
+
+        with django_capture_on_commit_callbacks() as callbacks:
+            ProgramAssignmentService.assign_program(actor=coach, client_id=client.id, program_id=program.id)
+            program.refresh_from_db()
+            # the program row is not written inside the assign transaction
+            assert program.assignment_count == 0
+
+        for callback in callbacks:
+            callback()
+        program.refresh_from_db()
+        assert program.assignment_count == 1
+
+    def test_rebuild_command(self, coach):
+        program = self.make_program(coach, "Block", sessions=3)
+        WorkoutProgram.objects.filter(id=program.id).update(session_count=0)
+
+        call_command('refresh_program_stats', batch_size=1, stdout=None)
+        program.refresh_from_db()
+        assert program.session_count == 3
@@ -0,0 +1,92 @@
+import json
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.utils import timezone
+from apps.fitness.models.workout import Exercise, ExerciseMuscleGroup, Modality, MuscleGroup, WorkoutExercise, WorkoutProgram, WorkoutSession
+from apps.fitness.services.program_snapshot_service import ProgramSnapshotService
+from config.utils.exceptions import NotFoundException
+from config.utils.response_state import EncodedSuccessResponse
+
+User = get_user_model()
+
+
+@pytest.mark.django_db
+class TestProgramSnapshotService:
+
+    @pytest.fixture
+    def program(self):
+        cache.clear()
+        coach = User.objects.create(username="coach1", email="coach1@example.com", is_coach=True)
+        chest = MuscleGroup.objects.create(id="chest", title="Chest")
+        program = WorkoutProgram.objects.create(title="Block", created_by=coach)
+        for week in (1, 2):
+            session = WorkoutSession.objects.create(program=program, title=f"Week {week}", week_number=week)
+            for i in range(3):
+                exercise = Exercise.objects.create(name=f"Press {week}.{i}", created_by=coach)
+                ExerciseMuscleGroup.objects.create(exercise=exercise, muscle_group=chest, is_primary=True)
+                WorkoutExercise.objects.create(session=session, exercise=exercise, sets=3, reps=10)
+        return program
+
+    def test_snapshot_is_served_from_cache(self, program, django_assert_num_queries):
+        document = ProgramSnapshotService.encoded(program.id)
+
+        with django_assert_num_queries(1):
+            assert ProgramSnapshotService.encoded(program.id) == document
+
+        data = json.loads(document)
+        assert [s["title"] for s in data["sessions"]] == ["Week 1", "Week 2"]
+        assert data["sessions"][0]["exercises"][0]["exercise"]["muscle_groups"][0]["muscle_group_title"] == "Chest"
+
+    def test_child_writes_change_the_snapshot(self, program):
+        before = ProgramSnapshotService.encoded(program.id)
+
+        workout_exercise = WorkoutExercise.objects.filter(session__program=program).first()
+        workout_exercise.reps = 12
+        workout_exercise.save()
+        edited = ProgramSnapshotService.encoded(program.id)
+        assert edited != before
+        assert b'"reps":12' in edited
+
+        WorkoutExercise.objects.filter(id=workout_exercise.id).delete()
+        assert ProgramSnapshotService.encoded(program.id) != edited
+
+    def test_bulk_workout_exercise_writes_change_the_snapshot(self, program):
+        before = ProgramSnapshotService.encoded(program.id)
+
+        # a queryset update fires no signal, so the program row is not touched
+        WorkoutExercise.objects.filter(session__program=program).update(reps=8, updated_at=timezone.now())
+        edited = ProgramSnapshotService.encoded(program.id)
+        assert edited != before
+        assert b'"reps":8' in edited
+
+    def test_modality_edits_change_the_snapshot(self, program):
+        before = ProgramSnapshotService.encoded(program.id)
+        barbell = Modality.objects.create(id="barbell", title="Barbell")
+        exercise = Exercise.objects.filter(workoutexercise__session__program=program).first()
+
+        exercise.modalities.add(barbell)
+        added = ProgramSnapshotService.encoded(program.id)
+        assert added != before
+
+        # from the modality side too
+        barbell.exercises.clear()
+        assert ProgramSnapshotService.encoded(program.id) != added
+
+    def test_program_tree_query_count_is_constant(self, program, django_assert_max_num_queries):
+        # program + sessions + exercises (with catalog rows) + images + videos + modalities + muscle entries
+        with django_assert_max_num_queries(7):
+            tree = ProgramSnapshotService.get_program_tree(program.id)
+            for session in tree.sessions.all():
+                for workout_exercise in session.exercises.all():
+                    list(workout_exercise.exercise.exercise_muscle_entries.all())
+
+    def test_missing_program(self, program):
+        program.delete()
+        with pytest.raises(NotFoundException):
+            ProgramSnapshotService.encoded(program.id)
+
+    def test_encoded_response_splices_extra_keys(self):
+        response = EncodedSuccessResponse(b'{"id":1}', extra={"changes": None})
+        assert json.loads(response.content) == {"message": "success", "data": {"id": 1, "changes": None}}
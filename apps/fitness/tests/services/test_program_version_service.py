@@ -0,0 +1,82 @@
+from io import StringIO
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from apps.fitness.models.coach_client import CoachClient
+from apps.fitness.models.workout import Exercise, ProgramAssignment, ProgramVersion, WorkoutExercise, WorkoutProgram, WorkoutSession
+from apps.fitness.services.program_assignment_service import ProgramAssignmentService
+from apps.fitness.services.program_version_service import ProgramVersionService
+from config.utils.exceptions import NotFoundException
+
+User = get_user_model()
+
+
+@pytest.mark.django_db
+class TestProgramVersionService:
+
+    @pytest.fixture
+    def coach(self):
+        return User.objects.create(username="coach1", email="coach1@example.com", is_coach=True, is_active=True)
+
+    @pytest.fixture
+    def program(self, coach):
+        program = WorkoutProgram.objects.create(title="Block", created_by=coach, is_active=True)
+        session = WorkoutSession.objects.create(program=program, title="Day 1", created_by=coach)
+        exercise = Exercise.objects.create(name="Squat", created_by=coach)
+        WorkoutExercise.objects.create(session=session, exercise=exercise, sets=5, reps=5)
+        return program
+
+    def make_client(self, coach, name):
+        client = User.objects.create(username=name, email=f"{name}@example.com", is_active=True)
+        CoachClient.objects.create(coach=coach, client=client)
+        return client
+
+    def reps(self, document):
+        return document['sessions'][0]['exercises'][0]['reps']
+
+    def test_assignment_keeps_its_version_after_edits(self, coach, program):
+        first = self.make_client(coach, "client1")
+        assignment = ProgramAssignmentService.assign_program(actor=coach, client_id=first.id, program_id=program.id)
+        assert assignment.program_version.number == 1
+
+        WorkoutExercise.objects.filter(session__program=program).update(reps=8)
+        second = self.make_client(coach, "client2")
+        later = ProgramAssignmentService.assign_program(actor=coach, client_id=second.id, program_id=program.id)
+
+        _, pinned = ProgramVersionService.get_client_program(first, assignment.id)
+        _, current = ProgramVersionService.get_client_program(second, later.id)
+        assert (pinned['version'], self.reps(pinned)) == (1, 5)
+        assert (current['version'], self.reps(current)) == (2, 8)
+
+    def test_unchanged_program_reuses_version(self, coach, program):
+        first = ProgramVersionService.freeze(program, coach)
+        assert ProgramVersionService.freeze(program, coach).id == first.id
+        assert ProgramVersion.objects.count() == 1
+
+    def test_client_read_is_a_single_row_fetch(self, coach, program, django_assert_max_num_queries):
+        client = self.make_client(coach, "client1")
+        assignment = ProgramAssignmentService.assign_program(actor=coach, client_id=client.id, program_id=program.id)
+
+        with django_assert_max_num_queries(1):
+            ProgramVersionService.get_client_program(client, assignment.id)
+
+    def test_legacy_assignment_reads_live_until_backfilled(self, coach, program):
+        client = self.make_client(coach, "client1")
+        assignment = ProgramAssignment.objects.create(client=client, program=program, coach=coach)
+
+        _, document = ProgramVersionService.get_client_program(client, assignment.id)
+        assert (document['title'], document['version']) == ("Block", None)
+        assignment.refresh_from_db()
+        assert assignment.program_version is None
+
+        call_command('pin_program_assignments', stdout=StringIO())
+        _, document = ProgramVersionService.get_client_program(client, assignment.id)
+        assert document['version'] == 1
+
+    def test_other_clients_cannot_read_the_assignment(self, coach, program):
+        client = self.make_client(coach, "client1")
+        assignment = ProgramAssignmentService.assign_program(actor=coach, client_id=client.id, program_id=program.id)
+
+        with pytest.raises(NotFoundException):
+            ProgramVersionService.get_client_program(coach, assignment.id)
@@ -0,0 +1,176 @@
+from datetime import timedelta
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.utils import timezone
+from apps.fitness.models.sync_tombstone import SyncTombstone
+from apps.fitness.models.workout import (
+    Exercise, ProgramAssignment, WorkoutExercise, WorkoutProgram, WorkoutSession,
+)
+from apps.fitness.services.program_assignment_service import ProgramAssignmentService
+from apps.fitness.services.program_version_service import ProgramVersionService
+from apps.fitness.services.sync_service import SYNC_TOMBSTONE_RETENTION, SyncService
+from apps.fitness.services.workout_program_service import WorkoutProgramService
+from config.utils.exceptions import BadRequestException
+
+User = get_user_model()
+
+
+@pytest.mark.django_db
+class TestSyncService:
+
+    @pytest.fixture
+    def coach(self):
+        return User.objects.create(username="coach1", email="coach1@example.com", is_coach=True)
+
+    @pytest.fixture
+    def client(self):
+        return User.objects.create(username="client1", email="client1@example.com")
+
+    @pytest.fixture
+    def program(self, coach, client):
+        exercises = [Exercise.objects.create(name=f"Exercise {i}", created_by=coach) for i in range(2)]
+        program = WorkoutProgramService.create_program_with_sessions(coach, {
+            'title': "Block",
+            'sessions': [
+                {'title': f"Day {day}", 'exercises': [
+                    {'exercise_id': exercise.id, 'sets': 3, 'reps': 10} for exercise in exercises
+                ]}
+                for day in range(1, 4)
+            ],
+        })
+        assignment = ProgramAssignment.objects.create(client=client, program=program, coach=coach)
+        ProgramVersionService.pin(assignment, coach)
+        return program
+
+    def age(self):
+        """Move every row an hour back, as if the last sync happened long after they were written."""
+        past = timezone.now() - timedelta(hours=1)
+        for model in (ProgramAssignment, WorkoutProgram, WorkoutSession, WorkoutExercise, Exercise):
+            model.objects.update(updated_at=past)
+        SyncTombstone.objects.update(deleted_at=past)
+
+    def ids(self, rows):
+        return {str(row['id']) for row in rows}
+
+    def test_full_then_empty_delta(self, client, program):
+        full = SyncService.changes(client)
+        assert full['full'] is True
+        assert full['programs'] == [] and full['exercises'] == []
+        # the assigned program travels as the version the assignment is pinned to
+        assignment, = full['assignments']
+        version, = full['versions']
+        assert assignment['program_version_id'] == version['id']
+        sessions = version['document']['sessions']
+        assert (len(sessions), sum(len(session['exercises']) for session in sessions)) == (3, 6)
+
+        self.age()
+        delta = SyncService.changes(client, full['cursor'])
+        assert delta['full'] is False
+        assert not any(delta[key] for key in ('assignments', 'versions', 'programs', 'sessions', 'workout_exercises'))
+        assert not any(delta['deleted'].values())
+
+    def test_builder_edits_reach_the_owner_live(self, coach, client, program):
+        coach_cursor = SyncService.changes(coach)['cursor']
+        client_cursor = SyncService.changes(client)['cursor']
+        self.age()
+
+        sessions = [
+            {'id': session.id, 'title': session.title, 'exercises': [
+                {'id': we.id, 'exercise_id': we.exercise_id, 'sets': we.sets, 'reps': we.reps}
+                for we in session.exercises.all()
+            ]}
+            for session in program.sessions.prefetch_related('exercises')
+        ]
+        sessions[0]['exercises'][0]['reps'] = 5
+        edited_id = str(sessions[0]['exercises'][0]['id'])
+        dropped_id = str(sessions[1]['exercises'].pop()['id'])
+        removed = sessions.pop()
+        removed_ids = {str(removed['id'])} | {str(we['id']) for we in removed['exercises']}
+        WorkoutProgramService.update_program_with_sessions(coach, program.id, {'sessions': sessions})
+
+        delta = SyncService.changes(coach, coach_cursor)
+        assert self.ids(delta['programs']) == {str(program.id)}
+        assert self.ids(delta['workout_exercises']) == {edited_id}
+        assert delta['workout_exercises'][0]['reps'] == 5
+        assert delta['sessions'] == []
+        assert set(delta['deleted']['sessions']) | set(delta['deleted']['workout_exercises']) == {
+            dropped_id, *removed_ids
+        }
+
+        # the client stays on the pinned version until the coach re-pins
+        delta = SyncService.changes(client, client_cursor)
+        assert not any(delta[key] for key in ('assignments', 'versions', 'programs', 'sessions', 'workout_exercises'))
+        assert not any(delta['deleted'].values())
+
+        ProgramVersionService.pin(ProgramAssignment.objects.get(client=client), coach)
+        version, = SyncService.changes(client, client_cursor)['versions']
+        assert version['number'] == 2
+        assert len(version['document']['sessions']) == 2
+
+    def test_unassign_and_program_delete_reach_the_client(self, coach, client, program):
+        cursor = SyncService.changes(client)['cursor']
+        assignment = ProgramAssignment.objects.get(client=client)
+        self.age()
+
+        ProgramAssignmentService.unassign_program(actor=coach, assignment_id=assignment.id)
+        delta = SyncService.changes(client, cursor)
+        assert delta['deleted']['assignments'] == [str(assignment.id)]
+        assert delta['versions'] == []
+
+        ProgramVersionService.pin(ProgramAssignment.objects.create(client=client, program=program, coach=coach), coach)
+        other = ProgramAssignment.objects.create(
+            client=User.objects.create(username="client2", email="client2@example.com"), program=program, coach=coach
+        )
+        delta = SyncService.changes(client, cursor)
+        # the new assignment brings the whole program back
+        version, = delta['versions']
+        assert len(version['document']['sessions']) == 3
+
+        WorkoutProgramService.delete_program(coach, program.id)
+        delta = SyncService.changes(other.client, cursor)
+        assert delta['deleted']['assignments'] == [str(other.id)]
+        assert str(program.id) in SyncService.changes(coach, cursor)['deleted']['programs']
+
+    def test_unpinned_assignment_syncs_live_until_backfilled(self, coach, client, program):
+        ProgramAssignment.objects.update(program_version=None)
+
+        full = SyncService.changes(client)
+        assert full['versions'] == []
+        assert self.ids(full['programs']) == {str(program.id)}
+        assert (len(full['sessions']), len(full['workout_exercises'])) == (3, 6)
+        assert ProgramAssignment.objects.get(client=client).program_version is None
+
+        self.age()
+        ProgramVersionService.pin_missing()
+        delta = SyncService.changes(client, full['cursor'])
+        version, = delta['versions']
+        assert len(version['document']['sessions']) == 3
+
+    def test_private_exercise_tombstones_reach_only_their_owner(self, coach, client, program):
+        cursors = {user: SyncService.changes(user)['cursor'] for user in (coach, client)}
+        self.age()
+        public = Exercise.objects.create(name="Open", created_by=coach, is_public=True)
+        private = Exercise.objects.create(name="Mine", created_by=coach)
+        public_id, private_id = str(public.id), str(private.id)
+        public.delete()
+        private.delete()
+
+        assert set(SyncService.changes(coach, cursors[coach])['deleted']['exercises']) == {public_id, private_id}
+        assert SyncService.changes(client, cursors[client])['deleted']['exercises'] == [public_id]
+
+        # deleting the owner takes their private exercises along without tombstones
+        Exercise.objects.create(name="Gone", created_by=client)
+        client_id = client.id
+        client.delete()
+        with connection.cursor() as cursor:
+            cursor.execute("SET CONSTRAINTS ALL IMMEDIATE")
+        assert not SyncTombstone.objects.filter(user_id=client_id).exists()
+
+    def test_cursor_validation(self, client):
+        with pytest.raises(BadRequestException):
+            SyncService.changes(client, "not-a-cursor")
+
+        expired = SyncService.encode_cursor(timezone.now() - SYNC_TOMBSTONE_RETENTION - timedelta(days=1))
+        assert SyncService.changes(client, expired)['full'] is True
@@ -0,0 +1,50 @@
+import pytest
+from apps.fitness.models.workout import Category, Equipment, MuscleGroup
+from apps.fitness.services.taxonomy_cache import TaxonomyCache
+from config.utils.exceptions import BadRequestException
+
+
+@pytest.mark.django_db
+class TestTaxonomyCache:
+
+    @pytest.fixture(autouse=True)
+    def taxonomy(self):
+        TaxonomyCache.clear()
+        Category.objects.create(id="strength", title="Strength")
+        Equipment.objects.create(id="barbell", title="Barbell")
+        MuscleGroup.objects.create(id="legs", title="Legs")
+        MuscleGroup.objects.create(id="quads", title="Quadriceps", parent_id="legs")
+
+    def test_lookups_hit_the_database_once(self, django_assert_num_queries):
+        TaxonomyCache.title(Category, "strength")
+
+        with django_assert_num_queries(0):
+            assert TaxonomyCache.title(Category, "strength") == "Strength"
+            assert TaxonomyCache.resolve(Category, " STRENGTH ") == "strength"
+            assert TaxonomyCache.get(Category, "missing") is None
+
+    def test_save_invalidates_table(self):
+        assert TaxonomyCache.title(Category, "strength") == "Strength"
+
+        Category.objects.filter(id="strength").first().delete()
+        Category.objects.create(id="cardio", title="Cardio")
+
+        assert TaxonomyCache.title(Category, "strength") is None
+        assert TaxonomyCache.resolve(Category, "cardio") == "cardio"
+
+    def test_resolve_unknown_value(self):
+        with pytest.raises(BadRequestException):
+            TaxonomyCache.resolve(Category, "Yoga")
+
+    def test_snapshot_tree_and_etag(self):
+        payload, etag = TaxonomyCache.snapshot()
+
+        assert payload["muscle_groups"] == [{
+            "id": "legs",
+            "title": "Legs",
+            "children": [{"id": "quads", "title": "Quadriceps", "children": []}],
+        }]
+        assert TaxonomyCache.snapshot()[1] == etag
+
+        MuscleGroup.objects.create(id="glutes", title="Glutes", parent_id="legs")
+        assert TaxonomyCache.snapshot()[1] != etag
@@ -0,0 +1,119 @@
+from datetime import datetime, timedelta
+from decimal import Decimal
+from uuid import uuid4
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+from apps.fitness.models.coach_client import CoachClient
+from apps.fitness.models.workout import (
+    Exercise, ExerciseMuscleGroup, MuscleGroup, ProgramAssignment, WorkoutExercise, WorkoutProgram, WorkoutSession,
+)
+from apps.fitness.models.workout_log import ExerciseDailyVolume, MuscleGroupWeeklyVolume, PersonalRecord
+from apps.fitness.services.taxonomy_cache import TaxonomyCache
+from apps.fitness.services.training_rollup_service import TrainingRollupService
+from apps.fitness.services.workout_log_service import WorkoutLogService
+from config.utils.exceptions import BadRequestException, ForbiddenException
+
+User = get_user_model()
+
+# A Monday
+MONDAY = timezone.make_aware(datetime(2026, 3, 2, 18, 0))
+
+
+@pytest.mark.django_db
+class TestTrainingRollupService:
+
+    @pytest.fixture
+    def coach(self):
+        return User.objects.create(username="coach1", email="coach1@example.com", is_coach=True)
+
+    @pytest.fixture
+    def client(self, coach):
+        client = User.objects.create(username="client1", email="client1@example.com")
+        CoachClient.objects.create(coach=coach, client=client, is_active=True)
+        return client
+
+    @pytest.fixture
+    def prescriptions(self, coach, client):
+        TaxonomyCache.clear()
+        MuscleGroup.objects.create(id="quads", title="Quadriceps")
+        MuscleGroup.objects.create(id="glutes", title="Glutes")
+        squat = Exercise.objects.create(name="Squat", created_by=coach)
+        ExerciseMuscleGroup.objects.create(exercise=squat, muscle_group_id="quads", is_primary=True)
+        ExerciseMuscleGroup.objects.create(exercise=squat, muscle_group_id="glutes")
+
+        program = WorkoutProgram.objects.create(title="Strength", created_by=coach)
+        ProgramAssignment.objects.create(client=client, program=program, coach=coach)
+        session = WorkoutSession.objects.create(program=program, title="Legs", created_by=coach)
+        return WorkoutExercise.objects.create(session=session, exercise=squat, sets=3, reps=5)
+
+    def upload(self, client, workout_exercise, when, sets):
+        WorkoutLogService.ingest(client, [{
+            'id': uuid4(),
+            'completed_at': when,
+            'sets': [
+                {'id': uuid4(), 'workout_exercise_id': workout_exercise.id, 'set_number': number,
+                 'weight': Decimal(weight), 'reps': reps}
+                for number, (weight, reps) in enumerate(sets, start=1)
+            ],
+        }])
+
+    def test_uploads_fold_into_rollups(self, client, prescriptions):
+        self.upload(client, prescriptions, MONDAY, [(100, 5), (100, 5)])
+        self.upload(client, prescriptions, MONDAY + timedelta(days=2), [(110, 3)])
+        self.upload(client, prescriptions, MONDAY + timedelta(days=2, hours=1), [(90, 12)])
+
+        daily = ExerciseDailyVolume.objects.order_by('day')
+        assert [(row.day.isoformat(), row.set_count, row.rep_count, row.volume) for row in daily] == [
+            ("2026-03-02", 2, 10, Decimal("1000.00")),
+            ("2026-03-04", 2, 15, Decimal("1410.00")),
+        ]
+        weekly = {row.muscle_group_id: row for row in MuscleGroupWeeklyVolume.objects.all()}
+        assert weekly["quads"].set_count == weekly["glutes"].set_count == 4
+        assert (weekly["quads"].primary_set_count, weekly["glutes"].primary_set_count) == (4, 0)
+        assert weekly["quads"].week == MONDAY.date()
+
+        record = PersonalRecord.objects.get(client=client)
+        assert (record.max_weight, record.max_weight_reps, record.max_reps) == (Decimal("110.00"), 3, 12)
+        # Epley: 90 x (1 + 12 / 30) beats 110 x (1 + 3 / 30)
+        assert record.best_e1rm == Decimal("126.00")
+        assert record.best_e1rm_at == MONDAY + timedelta(days=2, hours=1)
+
+    def test_records_only_move_up_and_rebuild_matches(self, client, prescriptions):
+        self.upload(client, prescriptions, MONDAY, [(120, 1)])
+        self.upload(client, prescriptions, MONDAY + timedelta(weeks=1), [(100, 5)])
+        record = PersonalRecord.objects.get(client=client)
+        assert (record.max_weight, record.max_weight_at) == (Decimal("120.00"), MONDAY)
+
+        snapshot = list(ExerciseDailyVolume.objects.order_by('day').values('day', 'set_count', 'volume'))
+        ExerciseDailyVolume.objects.update(volume=0)
+        assert TrainingRollupService.rebuild([client.id]) == 1
+        assert list(ExerciseDailyVolume.objects.order_by('day').values('day', 'set_count', 'volume')) == snapshot
+        assert PersonalRecord.objects.get(client=client).max_weight == Decimal("120.00")
+
+    def test_reads_are_coach_scoped(self, coach, client, prescriptions):
+        self.upload(client, prescriptions, MONDAY, [(100, 5)])
+        self.upload(client, prescriptions, MONDAY + timedelta(days=8), [(100, 5), (100, 5)])
+        start, end = MONDAY.date(), MONDAY.date() + timedelta(days=13)
+
+        weeks = TrainingRollupService.volume(coach, client.id, start, end)
+        assert [(row['period'], row['set_count']) for row in weeks] == [
+            (MONDAY.date(), 1), (MONDAY.date() + timedelta(weeks=1), 2),
+        ]
+        assert len(TrainingRollupService.volume(coach, client.id, start, end, period='day')) == 2
+        loads = TrainingRollupService.muscle_groups(coach, client.id, start + timedelta(days=3), end)
+        assert {row['muscle_group_title'] for row in loads} == {"Quadriceps", "Glutes"}
+        assert len(loads) == 4
+
+        stranger = User.objects.create(username="coach2", email="coach2@example.com", is_coach=True)
+        with pytest.raises(ForbiddenException):
+            TrainingRollupService.records(stranger, client.id)
+        with pytest.raises(BadRequestException):
+            TrainingRollupService.volume(coach, client.id, start, end, period='year')
+
+    def test_date_range(self):
+        start, end = TrainingRollupService.date_range(None, "2026-03-29")
+        assert (start.isoformat(), end.isoformat()) == ("2026-01-05", "2026-03-29")
+        with pytest.raises(BadRequestException):
+            TrainingRollupService.date_range("2025-01-01", "2026-03-01")
@@ -0,0 +1,73 @@
+from uuid import uuid4
+
+import pytest
+from django.contrib.auth import get_user_model
+from apps.fitness.models.sync_tombstone import SyncTombstone
+from apps.fitness.models.workout import Exercise, WorkoutExercise, WorkoutProgram, WorkoutSession
+from apps.fitness.services.workout_exercise_service import WorkoutExerciseService
+from config.utils.exceptions import BadRequestException, ForbiddenException
+
+User = get_user_model()
+
+
+@pytest.mark.django_db
+class TestWorkoutExerciseBatch:
+
+    @pytest.fixture
+    def coach(self):
+        return User.objects.create(username="coach1", email="coach1@example.com", is_coach=True)
+
+    @pytest.fixture
+    def exercises(self, coach):
+        return [Exercise.objects.create(name=name, created_by=coach) for name in ("Squat", "Press", "Row", "Curl")]
+
+    @pytest.fixture
+    def session(self, coach, exercises):
+        program = WorkoutProgram.objects.create(title="Block", created_by=coach)
+        session = WorkoutSession.objects.create(program=program, title="Day 1", created_by=coach)
+        for exercise in exercises[:3]:
+            WorkoutExerciseService.add_exercise(coach, {'session': session, 'exercise': exercise, 'sets': 3, 'reps': 10})
+        return session
+
+    def names(self, workout_exercises):
+        return [workout_exercise.exercise.name for workout_exercise in workout_exercises]
+
+    def test_add_appends(self, session):
+        assert self.names(session.exercises.select_related('exercise')) == ["Squat", "Press", "Row"]
+        assert list(session.exercises.values_list('position', flat=True)) == [0, 1, 2]
+
+    def test_operations_in_one_batch(self, coach, session, exercises, django_assert_max_num_queries):
+        squat, press, row = session.exercises.all()
+        curl_id = uuid4()
+        operations = [
+            {'op': 'add', 'id': curl_id, 'exercise_id': exercises[3].id, 'sets': 2, 'reps': 15, 'position': 0},
+            {'op': 'update', 'id': press.id, 'reps': 5},
+            {'op': 'update', 'id': row.id, 'reps': 10},
+            {'op': 'delete', 'id': squat.id},
+            {'op': 'reorder', 'ids': [press.id, curl_id, row.id]},
+        ]
+        # lock, exercise and id checks, load, insert, update, tombstone,
+        # delete (collect, detach performed sets, delete), touch program, reload
+        with django_assert_max_num_queries(14):
+            results, ordered = WorkoutExerciseService.apply_operations(coach, session.id, operations)
+
+        assert [result['status'] for result in results] == ['created', 'updated', 'unchanged', 'deleted', 'reordered']
+        assert self.names(ordered) == ["Press", "Curl", "Row"]
+        assert [workout_exercise.position for workout_exercise in ordered] == [0, 1, 2]
+        assert WorkoutExercise.objects.get(id=press.id).reps == 5
+        assert SyncTombstone.objects.filter(object_id=str(squat.id)).exists()
+
+    def test_batch_is_all_or_nothing(self, coach, session, exercises):
+        first = session.exercises.first()
+        with pytest.raises(BadRequestException):
+            WorkoutExerciseService.apply_operations(coach, session.id, [
+                {'op': 'delete', 'id': first.id},
+                {'op': 'update', 'id': first.id, 'reps': 1},
+            ])
+        with pytest.raises(BadRequestException):
+            WorkoutExerciseService.apply_operations(coach, session.id, [{'op': 'reorder', 'ids': [first.id]}])
+        assert session.exercises.count() == 3
+
+        stranger = User.objects.create(username="coach2", email="coach2@example.com", is_coach=True)
+        with pytest.raises(ForbiddenException):
+            WorkoutExerciseService.apply_operations(stranger, session.id, [{'op': 'delete', 'id': first.id}])
@@ -0,0 +1,120 @@
+from datetime import timedelta
+from uuid import uuid4
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from apps.fitness.models.workout import Exercise, ProgramAssignment, WorkoutExercise, WorkoutProgram, WorkoutSession
+from apps.fitness.models.workout_log import PerformedSet, WorkoutLog
+from apps.fitness.services.workout_log_service import WorkoutLogService
+from config.utils.exceptions import BadRequestException, NotFoundException
+
+User = get_user_model()
+
+
+@pytest.mark.django_db
+class TestWorkoutLogService:
+
+    @pytest.fixture
+    def coach(self):
+        return User.objects.create(username="coach1", email="coach1@example.com", is_coach=True)
+
+    @pytest.fixture
+    def client(self):
+        return User.objects.create(username="client1", email="client1@example.com")
+
+    @pytest.fixture
+    def sessions(self, coach, client):
+        program = WorkoutProgram.objects.create(title="Strength", created_by=coach)
+        ProgramAssignment.objects.create(client=client, program=program, coach=coach)
+        squat = Exercise.objects.create(name="Squat", created_by=coach)
+        press = Exercise.objects.create(name="Press", created_by=coach)
+        sessions = []
+        for week in (1, 2):
+            session = WorkoutSession.objects.create(program=program, title=f"W{week}", week_number=week, created_by=coach)
+            WorkoutExercise.objects.create(session=session, exercise=squat, sets=3, reps=5)
+            WorkoutExercise.objects.create(session=session, exercise=press, sets=3, reps=8)
+            sessions.append(session)
+        return sessions
+
+    def log(self, session, sets_per_exercise=3, **extra):
+        completed_at = timezone.now()
+        return {
+            'id': uuid4(),
+            'completed_at': completed_at,
+            'sets': [
+                {'id': uuid4(), 'workout_exercise_id': workout_exercise.id, 'set_number': number,
+                 'reps': 5, 'weight': 100, 'rpe': 8}
+                for workout_exercise in session.exercises.all()
+                for number in range(1, sets_per_exercise + 1)
+            ],
+            **extra,
+        }
+
+    def test_ingest_is_idempotent(self, client, sessions):
+        batch = [self.log(sessions[0]), self.log(sessions[1])]
+
+        summary = WorkoutLogService.ingest(client, batch)
+        assert summary == {'logs': {'created': 2, 'duplicates': 0}, 'sets': {'created': 12, 'duplicates': 0}}
+        log = WorkoutLog.objects.get(id=batch[0]['id'])
+        assert log.session_id == sessions[0].id
+        assert {s.exercise.name for s in log.sets.select_related('exercise')} == {"Squat", "Press"}
+
+        # The phone retries the same upload after a dropped connection
+        summary = WorkoutLogService.ingest(client, batch)
+        assert summary == {'logs': {'created': 0, 'duplicates': 2}, 'sets': {'created': 0, 'duplicates': 12}}
+        assert PerformedSet.objects.filter(client=client).count() == 12
+
+    def test_ingest_query_count_is_flat(self, client, sessions):
+        batch = [self.log(sessions[week % 2], sets_per_exercise=10) for week in range(20)]
+        with CaptureQueriesContext(connection) as queries:
+            WorkoutLogService.ingest(client, batch)
+        # lock, prescriptions, log owners, existing sets, two inserts,
+        # three rollup upserts (+ savepoint)
+        assert len(queries) <= 11
+        assert PerformedSet.objects.filter(client=client).count() == 400
+
+    def test_rejects_foreign_prescriptions(self, coach, client, sessions):
+        other = WorkoutProgram.objects.create(title="Not assigned", created_by=coach)
+        session = WorkoutSession.objects.create(program=other, title="Other", created_by=coach)
+        WorkoutExercise.objects.create(session=session, exercise=Exercise.objects.first(), sets=3, reps=5)
+
+        with pytest.raises(NotFoundException):
+            WorkoutLogService.ingest(client, [self.log(session)])
+        with pytest.raises(NotFoundException):
+            WorkoutLogService.ingest(client, [{**self.log(sessions[0]), 'sets': [], 'session_id': session.id}])
+        assert not WorkoutLog.objects.exists()
+
+    def test_rejects_mixed_sessions_and_taken_ids(self, coach, client, sessions):
+        mixed = self.log(sessions[0])
+        mixed['sets'] += self.log(sessions[1])['sets']
+        with pytest.raises(BadRequestException):
+            WorkoutLogService.ingest(client, [mixed])
+
+        log = self.log(sessions[0])
+        WorkoutLogService.ingest(client, [log])
+        with pytest.raises(BadRequestException):
+            WorkoutLogService.ingest(coach, [{**log, 'sets': []}])
+
+        # another client re-using a stored set id is rejected, not folded twice
+        other = User.objects.create(username="client2", email="client2@example.com")
+        ProgramAssignment.objects.create(client=other, program=sessions[0].program, coach=coach)
+        stolen = self.log(sessions[0])
+        stolen['sets'][0]['id'] = log['sets'][0]['id']
+        with pytest.raises(BadRequestException):
+            WorkoutLogService.ingest(other, [stolen])
+        assert not WorkoutLog.objects.filter(client=other).exists()
+
+    def test_list_logs_by_date(self, client, sessions):
+        today = timezone.localdate()
+        old = self.log(sessions[0], completed_at=timezone.now() - timedelta(days=10))
+        WorkoutLogService.ingest(client, [old, self.log(sessions[1])])
+
+        logs = WorkoutLogService.list_logs(client, start=today.isoformat())
+        assert [log.session_id for log in logs] == [sessions[1].id]
+        logs = WorkoutLogService.list_logs(client, end=(today - timedelta(days=5)).isoformat())
+        assert [len(log.sets.all()) for log in logs] == [6]
+        with pytest.raises(BadRequestException):
+            WorkoutLogService.list_logs(client, start="yesterday")
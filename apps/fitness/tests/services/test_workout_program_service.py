@@ -0,0 +1,127 @@
+import uuid
+
+import pytest
+from django.contrib.auth import get_user_model
+from apps.fitness.models.workout import Exercise, WorkoutExercise, WorkoutProgram, WorkoutSession
+from apps.fitness.services.workout_program_service import WorkoutProgramService
+from config.utils.exceptions import BadRequestException, ForbiddenException, NotFoundException
+
+User = get_user_model()
+
+
+@pytest.mark.django_db
+class TestWorkoutProgramBuilder:
+
+    @pytest.fixture
+    def coach(self):
+        return User.objects.create(username="coach1", email="coach1@example.com", is_coach=True, is_active=True)
+
+    @pytest.fixture
+    def exercises(self, coach):
+        return [Exercise.objects.create(name=f"Exercise {i}", created_by=coach) for i in range(4)]
+
+    def program_data(self, exercises, weeks):
+        return {
+            'title': "Strength Block",
+            'sessions': [
+                {
+                    'title': f"Week {week} Day {day}",
+                    'week_number': week,
+                    'exercises': [
+                        {'exercise_id': exercise.id, 'sets': 3, 'reps': 10}
+                        for exercise in exercises
+                    ],
+                }
+                for week in range(1, weeks + 1)
+                for day in range(1, 6)
+            ],
+        }
+
+    @pytest.mark.parametrize("weeks", [1, 4])
+    def test_create_query_count_is_constant(self, coach, exercises, weeks, django_assert_max_num_queries):
+        # savepoint + validate + program + sessions + workout exercises + release
+        with django_assert_max_num_queries(6):
+            program = WorkoutProgramService.create_program_with_sessions(coach, self.program_data(exercises, weeks))
+
+        assert program.sessions.count() == 5 * weeks
+        assert WorkoutExercise.objects.filter(session__program=program).count() == 20 * weeks
+        assert program.sessions.first().slug == "week-1-day-1"
+
+    def test_unknown_exercise_writes_nothing(self, coach, exercises):
+        data = self.program_data(exercises, 1)
+        data['sessions'][3]['exercises'][0]['exercise_id'] = uuid.uuid4()
+
+        with pytest.raises(NotFoundException):
+            WorkoutProgramService.create_program_with_sessions(coach, data)
+
+        assert not WorkoutProgram.objects.exists()
+        assert not WorkoutSession.objects.exists()
+
+    def test_update_replaces_sessions(self, coach, exercises):
+        program = WorkoutProgramService.create_program_with_sessions(coach, self.program_data(exercises, 2))
+
+        _, changes = WorkoutProgramService.update_program_with_sessions(
+            coach, program.id, self.program_data(exercises[:2], 1)
+        )
+
+        assert program.sessions.count() == 5
+        assert WorkoutExercise.objects.filter(session__program=program).count() == 10
+        assert changes['sessions'] == {'created': 5, 'updated': 0, 'deleted': 10, 'unchanged': 0}
+
+    def current_payload(self, program):
+        return [
+            {
+                'id': session.id,
+                'title': session.title,
+                'week_number': session.week_number,
+                'exercises': [
+                    {'id': we.id, 'exercise_id': we.exercise_id, 'sets': we.sets, 'reps': we.reps}
+                    for we in session.exercises.all()
+                ],
+            }
+            for session in program.sessions.prefetch_related('exercises')
+        ]
+
+    def test_update_only_writes_changes(self, coach, exercises, django_assert_max_num_queries):
+        program = WorkoutProgramService.create_program_with_sessions(coach, self.program_data(exercises, 2))
+        sessions = self.current_payload(program)
+        kept_ids = {we['id'] for session in sessions for we in session['exercises']}
+
+        edited = sessions[0]['exercises'][0]
+        edited['reps'] = 12
+        edited_id = edited['id']
+        dropped_id = sessions[1]['exercises'].pop()['id']
+        sessions[2]['exercises'].append({'exercise_id': exercises[0].id, 'sets': 5, 'reps': 5})
+        removed_session = sessions.pop()
+        removed_ids = {we['id'] for we in removed_session['exercises']}
+
+        # load + one statement per kind of change, plus the delete cascades
+        # (including detaching workout logs and performed sets) and the sync tombstones
+        with django_assert_max_num_queries(20):
+            _, changes = WorkoutProgramService.update_program_with_sessions(coach, program.id, {'sessions': sessions})
+
+        assert changes['sessions'] == {'created': 0, 'updated': 0, 'deleted': 1, 'unchanged': 9}
+        assert changes['exercises'] == {'created': 1, 'updated': 1, 'deleted': 5, 'unchanged': 34}
+        assert WorkoutExercise.objects.get(id=edited_id).reps == 12
+        assert not WorkoutExercise.objects.filter(id=dropped_id).exists()
+        assert not WorkoutSession.objects.filter(id=removed_session['id']).exists()
+        # untouched rows keep their ids
+        assert kept_ids - {dropped_id} - removed_ids <= set(
+            WorkoutExercise.objects.filter(session__program=program).values_list('id', flat=True)
+        )
+
+    def test_update_rejects_foreign_ids(self, coach, exercises):
+        program = WorkoutProgramService.create_program_with_sessions(coach, self.program_data(exercises, 1))
+        other = WorkoutProgramService.create_program_with_sessions(coach, self.program_data(exercises, 1))
+        sessions = self.current_payload(program)
+        sessions[0]['id'] = other.sessions.first().id
+
+        with pytest.raises(BadRequestException):
+            WorkoutProgramService.update_program_with_sessions(coach, program.id, {'sessions': sessions})
+
+    def test_update_requires_owner(self, coach, exercises):
+        program = WorkoutProgramService.create_program_with_sessions(coach, self.program_data(exercises, 1))
+        other = User.objects.create(username="coach2", email="coach2@example.com", is_coach=True)
+
+        with pytest.raises(ForbiddenException):
+            WorkoutProgramService.update_program_with_sessions(other, program.id, {'title': "Mine"})
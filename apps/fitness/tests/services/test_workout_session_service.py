@@ -0,0 +1,72 @@
+import pytest
+from django.contrib.auth import get_user_model
+from rest_framework.test import APIRequestFactory, force_authenticate
+from apps.fitness.models.workout import ProgramAssignment, WorkoutProgram, WorkoutSession
+from apps.fitness.services.workout_session_service import WorkoutSessionService
+from apps.fitness.views.workout_session import WorkoutSessionView
+from config.utils.exceptions import BadRequestException, NotFoundException
+
+User = get_user_model()
+
+
+@pytest.mark.django_db
+class TestWorkoutSessionService:
+
+    @pytest.fixture
+    def coach(self):
+        return User.objects.create(username="coach1", email="coach1@example.com", is_coach=True)
+
+    @pytest.fixture
+    def client(self):
+        return User.objects.create(username="client1", email="client1@example.com")
+
+    @pytest.fixture
+    def program(self, coach):
+        program = WorkoutProgram.objects.create(title="Private block", created_by=coach)
+        for week in (1, 2, 3):
+            WorkoutSession.objects.create(program=program, title=f"W{week} lift", week_number=week, created_by=coach)
+            WorkoutSession.objects.create(
+                program=program, title=f"W{week} rest", week_number=week, created_by=coach,
+                is_rest_day=True, session_type="recovery"
+            )
+        return program
+
+    def titles(self, sessions):
+        return [session.title for session in sessions]
+
+    def test_scope(self, coach, client, program):
+        public = WorkoutSession.objects.create(title="Open session", is_public=True, created_by=coach)
+
+        assert self.titles(WorkoutSessionService.list_sessions(actor=client)) == ["Open session"]
+        assert list(WorkoutSessionService.list_sessions(actor=client, program_id=program.id)) == []
+        with pytest.raises(NotFoundException):
+            WorkoutSessionService.get_session(actor=client, session_id=program.sessions.first().id)
+
+        ProgramAssignment.objects.create(client=client, program=program, coach=coach)
+        assert WorkoutSessionService.list_sessions(actor=client).count() == 7
+        assert WorkoutSessionService.list_sessions(actor=client, program_id=program.id).count() == 6
+        assert WorkoutSessionService.get_session(actor=client, session_id=public.id) == public
+
+    def test_filters(self, coach, program):
+        sessions = WorkoutSessionService.list_sessions(
+            actor=coach, program_id=program.id, filters={'week_from': '2', 'week_to': '3', 'is_rest_day': 'false'}
+        )
+        assert self.titles(sessions) == ["W2 lift", "W3 lift"]
+
+        sessions = WorkoutSessionService.list_sessions(actor=coach, filters={'session_type': 'recovery'})
+        assert self.titles(sessions) == ["W1 rest", "W2 rest", "W3 rest"]
+
+        with pytest.raises(BadRequestException):
+            WorkoutSessionService.list_sessions(actor=coach, filters={'week_from': 'two'})
+
+    def test_listing_is_a_plain_list_unless_cursor_paginated(self, coach, program):
+        def call(params):
+            request = APIRequestFactory().get("/workouts/sessions/", params)
+            force_authenticate(request, user=coach)
+            return WorkoutSessionView.as_view()(request).data["data"]
+
+        assert [session["title"] for session in call({"program_id": str(program.id)})] == [
+            "W1 lift", "W1 rest", "W2 lift", "W2 rest", "W3 lift", "W3 rest",
+        ]
+        page = call({"program_id": str(program.id), "pagination": "cursor", "page_size": 4})
+        assert len(page["results"]) == 4 and page["next"]
@@ -4,18 +4,24 @@ from apps.fitness.views.coach_clients import (
     CoachClientListCreateView,
     CoachClientDeleteView,
 )
-from apps.fitness.views.exercise import ExerciseDetailView, ExerciseView
+from apps.fitness.views.exercise import ExerciseDetailView, ExerciseFacetView, ExerciseSearchView, ExerciseView
 from apps.fitness.views.program_assignments import (
     AssignWorkoutProgramView,
     UnassignWorkoutProgramView,
     AssignmentHistoryView,
 )
+from apps.fitness.views.client_analytics import ClientMuscleGroupLoadView, ClientPersonalRecordView, ClientVolumeView
 from apps.fitness.views.client_coaches import ClientCoachListView
-from apps.fitness.views.client_programs import ClientAssignedProgramsView
+from apps.fitness.views.client_programs import ClientAssignedProgramDetailView, ClientAssignedProgramsView
+from apps.fitness.views.client_calendar import ClientCalendarView
 from apps.fitness.views.client_sessions import ClientWorkoutSessionsView
-from apps.fitness.views.workout_exercise import WorkoutExerciseDetailView, WorkoutExerciseView
-from apps.fitness.views.workout_program import WorkoutProgramBuilderView, WorkoutProgramDetailView, WorkoutProgramListView, WorkoutProgramCloneView, WorkoutProgramPublishView
+from apps.fitness.views.client_sync import ClientSyncView
+from apps.fitness.views.workout_log import ClientWorkoutLogView
+from apps.fitness.views.media_upload import MediaUploadConfirmView, MediaUploadLocalView, MediaUploadView
+from apps.fitness.views.workout_exercise import WorkoutExerciseBatchView, WorkoutExerciseDetailView, WorkoutExerciseView
+from apps.fitness.views.workout_program import WorkoutProgramBuilderView, WorkoutProgramDetailView, WorkoutProgramListView, WorkoutProgramCloneView, WorkoutProgramBulkCloneView, WorkoutProgramPublishView, WorkoutProgramMarketplaceView, WorkoutProgramReviewView, WorkoutProgramExportView, WorkoutProgramImportView
 from apps.fitness.views.workout_session import WorkoutSessionDetailView, WorkoutSessionView
+from apps.fitness.views.taxonomy import TaxonomyView
 
 urlpatterns = [
     # ---------------- COACH ----------------
@@ -30,20 +36,41 @@ urlpatterns = [
     # Client assignment history
     path('coach/assignment-history/<uuid:client_id>/', AssignmentHistoryView.as_view(), name='assignment-history'),
 
+    # Client training analytics (rollups)
+    path('coach/clients/<uuid:client_id>/analytics/volume/', ClientVolumeView.as_view(), name='client-volume'),
+    path('coach/clients/<uuid:client_id>/analytics/muscle-groups/', ClientMuscleGroupLoadView.as_view(), name='client-muscle-group-load'),
+    path('coach/clients/<uuid:client_id>/analytics/records/', ClientPersonalRecordView.as_view(), name='client-personal-records'),
+
     # ---------------- CLIENT ----------------
     path('client/coaches/', ClientCoachListView.as_view(), name='client-coach-list'),
     path('client/programs/', ClientAssignedProgramsView.as_view(), name='client-programs'),
+    path('client/programs/<int:assignment_id>/', ClientAssignedProgramDetailView.as_view(), name='client-program-detail'),
     path('client/sessions/', ClientWorkoutSessionsView.as_view(), name='client-sessions'),
+    path('client/calendar/', ClientCalendarView.as_view(), name='client-calendar'),
+    path('client/workout-logs/', ClientWorkoutLogView.as_view(), name='client-workout-logs'),
+    path('client/sync/', ClientSyncView.as_view(), name='client-sync'),
+
+    # ---------------- MEDIA ----------------
+    # Direct-to-storage uploads
+    path('media/uploads/', MediaUploadView.as_view(), name='media-upload'),
+    path('media/uploads/confirm/', MediaUploadConfirmView.as_view(), name='media-upload-confirm'),
+    path('media/uploads/local/<str:token>/', MediaUploadLocalView.as_view(), name='media-upload-local'),
+
     # ---------------- WORKOUTS ----------------
+    # Reference data
+    path('workouts/taxonomy/', TaxonomyView.as_view(), name='taxonomy'),
     # Exercise
     path('workouts/exercises/', ExerciseView.as_view()),
-    path('workouts/exercises/<uuid:pk>/', ExerciseDetailView.as_view()),
+    path('workouts/exercises/search/', ExerciseSearchView.as_view(), name='exercise-search'),
+    path('workouts/exercises/facets/', ExerciseFacetView.as_view(), name='exercise-facets'),
+    path('workouts/exercises/<uuid:exercise_id>/', ExerciseDetailView.as_view()),
     # Workout Exercises
     path('workouts/workout-exercises/', WorkoutExerciseView.as_view()),
     path('workouts/workout-exercises/<uuid:workout_exercise_id>/', WorkoutExerciseDetailView.as_view()),
     # Workout Sessions
     path('workouts/sessions/', WorkoutSessionView.as_view()),
     path('workouts/sessions/<uuid:session_id>/', WorkoutSessionDetailView.as_view()),
+    path('workouts/sessions/<uuid:session_id>/exercises/batch/', WorkoutExerciseBatchView.as_view(), name='session-exercise-batch'),
     # Workout Programs
     # Program builder (create/update)
     path('workouts/programs/builder/', WorkoutProgramBuilderView.as_view(), name='program-builder-create'),
@@ -52,6 +79,16 @@ urlpatterns = [
     # List programs
     path('workouts/programs/', WorkoutProgramListView.as_view(), name='program-list'),
 
+    # Bulk clone (several programs, or one program per client)
+    path('workouts/programs/clone/', WorkoutProgramBulkCloneView.as_view(), name='program-bulk-clone'),
+
+    # Marketplace of published programs
+    path('workouts/programs/marketplace/', WorkoutProgramMarketplaceView.as_view(), name='program-marketplace'),
+
+    # Streaming export / import (NDJSON or MessagePack)
+    path('workouts/programs/export/', WorkoutProgramExportView.as_view(), name='program-export'),
+    path('workouts/programs/import/', WorkoutProgramImportView.as_view(), name='program-import'),
+
     # Detail, delete
     path('workouts/programs/<uuid:program_id>/', WorkoutProgramDetailView.as_view(), name='program-detail'),
 
@@ -61,4 +98,7 @@ urlpatterns = [
     # Clone program
     path('workouts/programs/<uuid:program_id>/clone/', WorkoutProgramCloneView.as_view(), name='program-clone'),
 
+    # Rate a program
+    path('workouts/programs/<uuid:program_id>/review/', WorkoutProgramReviewView.as_view(), name='program-review'),
+
 ]
@@ -0,0 +1,85 @@
+from rest_framework.views import APIView
+from rest_framework.permissions import IsAuthenticated
+from drf_yasg.utils import swagger_auto_schema
+from drf_yasg import openapi
+
+from apps.fitness.serializers.training_rollup import PersonalRecordSerializer
+from apps.fitness.services.training_rollup_service import MAX_RANGE_DAYS, PERIODS, TrainingRollupService
+from config.utils.exceptions import BadRequestException, ForbiddenException
+from config.utils.response_state import SuccessResponse, BadRequestResponse, ForbiddenResponse
+
+RANGE_PARAMETERS = [
+    openapi.Parameter('from', openapi.IN_QUERY, type=openapi.TYPE_STRING, format=openapi.FORMAT_DATE,
+                      description="Default: twelve weeks before to"),
+    openapi.Parameter('to', openapi.IN_QUERY, type=openapi.TYPE_STRING, format=openapi.FORMAT_DATE,
+                      description="Inclusive; default: today"),
+]
+
+
+def _date_range(request):
+    return TrainingRollupService.date_range(request.query_params.get('from'), request.query_params.get('to'))
+
+
+class ClientVolumeView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    @swagger_auto_schema(
+        operation_summary="Client training volume",
+        operation_description=(
+            "Sets, reps and volume (weight x reps) per day or week, from the rollups. "
+            f"Ranges are limited to {MAX_RANGE_DAYS} days."
+        ),
+        manual_parameters=RANGE_PARAMETERS + [
+            openapi.Parameter('period', openapi.IN_QUERY, type=openapi.TYPE_STRING, enum=list(PERIODS),
+                              description="Default: week"),
+            openapi.Parameter('exercise_id', openapi.IN_QUERY, type=openapi.TYPE_STRING,
+                              format=openapi.FORMAT_UUID),
+        ],
+    )
+    def get(self, request, client_id):
+        try:
+            start, end = _date_range(request)
+            rows = TrainingRollupService.volume(
+                request.user, client_id, start, end,
+                period=request.query_params.get('period', 'week'),
+                exercise_id=request.query_params.get('exercise_id'),
+            )
+        except BadRequestException as e:
+            return BadRequestResponse(message=str(e))
+        except ForbiddenException as e:
+            return ForbiddenResponse(message=str(e))
+        return SuccessResponse({'from': start, 'to': end, 'periods': rows})
+
+
+class ClientMuscleGroupLoadView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    @swagger_auto_schema(
+        operation_summary="Client weekly load per muscle group",
+        operation_description="Sets (all and primary) and volume per muscle group and week, from the rollups.",
+        manual_parameters=RANGE_PARAMETERS,
+    )
+    def get(self, request, client_id):
+        try:
+            start, end = _date_range(request)
+            rows = TrainingRollupService.muscle_groups(request.user, client_id, start, end)
+        except BadRequestException as e:
+            return BadRequestResponse(message=str(e))
+        except ForbiddenException as e:
+            return ForbiddenResponse(message=str(e))
+        return SuccessResponse({'from': start, 'to': end, 'weeks': rows})
+
+
+class ClientPersonalRecordView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    @swagger_auto_schema(
+        operation_summary="Client personal records",
+        responses={200: PersonalRecordSerializer(many=True)}
+    )
+    def get(self, request, client_id):
+        try:
+            records = TrainingRollupService.records(request.user, client_id)
+        except ForbiddenException as e:
+            return ForbiddenResponse(message=str(e))
+        return SuccessResponse(PersonalRecordSerializer(records, many=True).data)
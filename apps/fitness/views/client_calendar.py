@@ -0,0 +1,42 @@
+from rest_framework.views import APIView
+from rest_framework.permissions import IsAuthenticated
+from drf_yasg.utils import swagger_auto_schema
+from drf_yasg import openapi
+
+from apps.fitness.serializers.client_sessions import ScheduledSessionSerializer
+from apps.fitness.services.client_calendar_service import MAX_RANGE_DAYS, ClientCalendarService
+from config.utils.exceptions import BadRequestException
+from config.utils.response_state import SuccessResponse, BadRequestResponse
+
+
+class ClientCalendarView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    @swagger_auto_schema(
+        operation_summary="My training calendar",
+        operation_description=(
+            "Dated sessions of your active programs, laid out from the assignment date "
+            f"by week number. Ranges are limited to {MAX_RANGE_DAYS} days."
+        ),
+        manual_parameters=[
+            openapi.Parameter('from', openapi.IN_QUERY, type=openapi.TYPE_STRING, format=openapi.FORMAT_DATE,
+                              description="Default: today"),
+            openapi.Parameter('to', openapi.IN_QUERY, type=openapi.TYPE_STRING, format=openapi.FORMAT_DATE,
+                              description="Inclusive; default: six days after from"),
+        ],
+        responses={200: ScheduledSessionSerializer(many=True)}
+    )
+    def get(self, request):
+        try:
+            start, end = ClientCalendarService.date_range(
+                request.query_params.get('from'), request.query_params.get('to')
+            )
+        except BadRequestException as e:
+            return BadRequestResponse(message=str(e))
+
+        sessions = ClientCalendarService.get_calendar(request.user, start, end)
+        return SuccessResponse({
+            'from': start,
+            'to': end,
+            'sessions': ScheduledSessionSerializer(sessions, many=True).data,
+        })
@@ -3,27 +3,60 @@ from rest_framework.permissions import IsAuthenticated
 
 from apps.fitness.models.workout import ProgramAssignment
 from apps.fitness.serializers.program_assignment import ProgramAssignmentSerializer
-from config.utils.pagination import StandardResultsSetPagination
-from config.utils.response_state import SuccessResponse, ServerErrorResponse
+from apps.fitness.services.program_assignment_service import ProgramAssignmentService
+from apps.fitness.services.program_version_service import ProgramVersionService
+from config.utils.conditional import latest, not_modified, version_etag, with_validators
+from config.utils.exceptions import NotFoundException
+from config.utils.pagination import get_paginator, wants_cursor_pagination
+from config.utils.response_state import SuccessResponse, NotFoundResponse, ServerErrorResponse
 
 
 class ClientAssignedProgramsView(APIView):
     permission_classes = [IsAuthenticated]
-    pagination_class = StandardResultsSetPagination
+    ordering = ("-assigned_at", "-id")
 
     def get(self, request):
         try:
+            stamp = ProgramAssignmentService.client_stamp(request.user)
+            etag = version_etag(request.get_full_path(), sorted(stamp.items()))
+            last_modified = latest(stamp["updated"], stamp["programs_updated"], stamp["requests_updated"])
+            response = not_modified(request, etag, last_modified)
+            if response is not None:
+                return response
+
             queryset = ProgramAssignment.objects.filter(
                 client=request.user,
                 is_active=True
+            ).select_related(
+                "program",
+                "coach",
+                "coach_service_request__service",
             )
 
-            paginator = self.pagination_class()
+            paginator = get_paginator(request, ordering=self.ordering)
             paginated = paginator.paginate_queryset(queryset, request, view=self)
             serializer = ProgramAssignmentSerializer(paginated, many=True)
 
-            return SuccessResponse(
-                data=paginator.get_paginated_response(serializer.data).data
-            )
+            response = paginator.get_paginated_response(serializer.data)
+            if not wants_cursor_pagination(request):
+                # Page-number clients keep the nested envelope they were built against
+                response = SuccessResponse(data=response.data)
+            return with_validators(response, etag, last_modified)
         except Exception as e:
             return ServerErrorResponse(message=str(e))
+
+
+class ClientAssignedProgramDetailView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, assignment_id):
+        """The program version the assignment is pinned to, not the live program."""
+        try:
+            assignment, program = ProgramVersionService.get_client_program(request.user, assignment_id)
+        except NotFoundException as e:
+            return NotFoundResponse(message=str(e))
+
+        return SuccessResponse({
+            'assignment': ProgramAssignmentSerializer(assignment).data,
+            'program': program,
+        })
@@ -1,8 +1,9 @@
 from rest_framework.views import APIView
 from rest_framework.permissions import IsAuthenticated
 
-from apps.fitness.models.workout import WorkoutSession, ProgramAssignment
-from apps.fitness.serializers.client_sessions import ClientWorkoutSessionSerializer
+from apps.fitness.services.program_assignment_service import ProgramAssignmentService
+from apps.fitness.services.program_version_service import ProgramVersionService
+from config.utils.conditional import not_modified, version_etag, with_validators
 from config.utils.response_state import SuccessResponse, ServerErrorResponse
 
 
@@ -10,18 +11,16 @@ class ClientWorkoutSessionsView(APIView):
     permission_classes = [IsAuthenticated]
 
     def get(self, request):
+        """Sessions of the program versions the client's assignments are pinned to."""
         try:
-            assigned_programs = ProgramAssignment.objects.filter(
-                client=request.user,
-                is_active=True
-            ).values_list("program_id", flat=True)
+            stamp = ProgramAssignmentService.client_sessions_stamp(request.user)
+            etag = version_etag(stamp["versions"])
+            response = not_modified(request, etag, stamp["updated"])
+            if response is not None:
+                return response
 
-            sessions = WorkoutSession.objects.filter(
-                program_id__in=assigned_programs
-            )
-
-            serializer = ClientWorkoutSessionSerializer(sessions, many=True)
-            return SuccessResponse(data=serializer.data)
+            sessions = ProgramVersionService.get_client_sessions(request.user)
+            return with_validators(SuccessResponse(data=sessions), etag, stamp["updated"])
 
         except Exception as e:
             return ServerErrorResponse(message=str(e))
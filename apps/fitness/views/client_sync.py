@@ -0,0 +1,36 @@
+from rest_framework.views import APIView
+from rest_framework.permissions import IsAuthenticated
+from drf_yasg.utils import swagger_auto_schema
+from drf_yasg import openapi
+
+from apps.fitness.services.sync_service import SyncService
+from config.utils.exceptions import BadRequestException
+from config.utils.response_state import SuccessResponse, BadRequestResponse
+
+
+class ClientSyncView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    @swagger_auto_schema(
+        operation_summary="Delta sync",
+        operation_description=(
+            "Changes since the cursor, and the ids deleted since then under `deleted`. Assigned "
+            "programs arrive as the version their assignment is pinned to: each changed assignment "
+            "brings its version document under `versions`. The user's own programs arrive as live "
+            "programs, sessions, workout exercises and exercises. Without a cursor (or with an "
+            "expired one) everything is returned and `full` is true. Store the returned cursor for "
+            "the next call; rows may repeat and are meant to be upserted. A deleted program, "
+            "session or exercise takes its children along, and a version no longer referenced by "
+            "an assignment can be dropped."
+        ),
+        manual_parameters=[
+            openapi.Parameter('cursor', openapi.IN_QUERY, type=openapi.TYPE_STRING,
+                              description="Cursor returned by the previous sync"),
+        ],
+    )
+    def get(self, request):
+        try:
+            changes = SyncService.changes(request.user, request.query_params.get('cursor'))
+        except BadRequestException as e:
+            return BadRequestResponse(message=str(e))
+        return SuccessResponse(changes)
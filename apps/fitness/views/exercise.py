@@ -2,23 +2,64 @@
 
 from rest_framework.views import APIView
 from drf_yasg.utils import swagger_auto_schema
+from drf_yasg import openapi
 
-from apps.fitness.serializers.exercise import ExerciseSerializer
+from apps.fitness.serializers.exercise import ExercisePopularitySerializer, ExerciseSerializer
 from apps.fitness.services.exercise_service import ExerciseService
-from config.utils.response_state import SuccessResponse
+from apps.fitness.services.exercise_facet_service import FACETS, ExerciseFacetService
+from apps.fitness.services.media_url_service import MediaUrlService
+from apps.fitness.services.popularity_service import PopularityService
+from config.utils.conditional import not_modified, version_etag, with_validators
+from config.utils.pagination import KeysetCursorPagination, StandardResultsSetPagination, wants_cursor_pagination
+from config.utils.exceptions import NotFoundException
+from config.utils.response_state import SuccessResponse, NotFoundResponse, BadRequestResponse
 
 
 class ExerciseView(APIView):
+    cursor_ordering = ('name', 'id')
 
     @swagger_auto_schema(
         operation_summary="List exercises",
         operation_description="List public exercises and exercises created by the user",
+        manual_parameters=[
+            openapi.Parameter(
+                'muscle_group', openapi.IN_QUERY, type=openapi.TYPE_STRING,
+                description="Comma separated muscle group ids; matches their whole subtree"
+            ),
+            openapi.Parameter(
+                'muscle_role', openapi.IN_QUERY, type=openapi.TYPE_STRING,
+                description="any (default) | primary | secondary"
+            ),
+            openapi.Parameter(
+                'pagination', openapi.IN_QUERY, type=openapi.TYPE_STRING,
+                description="Set to 'cursor' for keyset pagination (cursor, page_size, with_count)"
+            ),
+        ],
         responses={200: ExerciseSerializer(many=True)}
     )
     def get(self, request):
-        exercises = ExerciseService.list_exercises(request.user)
-        serializer = ExerciseSerializer(exercises, many=True)
-        return SuccessResponse(serializer.data)
+        stamp = ExerciseService.catalog_stamp(request.user)
+        etag = version_etag(request.get_full_path(), sorted(stamp.items()), MediaUrlService.epoch())
+        response = not_modified(request, etag, stamp['last_modified'])
+        if response is not None:
+            return response
+
+        muscle_group_ids = [m for m in request.query_params.get('muscle_group', '').split(',') if m]
+        is_primary = {'primary': True, 'secondary': False}.get(request.query_params.get('muscle_role'))
+
+        exercises = ExerciseService.list_exercises(
+            request.user,
+            muscle_group_ids=muscle_group_ids,
+            is_primary=is_primary
+        )
+
+        if wants_cursor_pagination(request):
+            paginator = KeysetCursorPagination(ordering=self.cursor_ordering)
+            page = paginator.paginate_queryset(exercises, request, view=self)
+            response = paginator.get_paginated_response(ExerciseSerializer(page, many=True).data)
+        else:
+            response = SuccessResponse(ExerciseSerializer(exercises, many=True).data)
+        return with_validators(response, etag, stamp['last_modified'])
 
     @swagger_auto_schema(
         operation_summary="Create exercise",
@@ -40,6 +81,75 @@ class ExerciseView(APIView):
         )
 
 
+class ExerciseSearchView(APIView):
+    max_limit = 100
+
+    @swagger_auto_schema(
+        operation_summary="Search exercises",
+        operation_description="Relevance-ranked full-text and fuzzy search over visible exercises",
+        manual_parameters=[
+            openapi.Parameter('q', openapi.IN_QUERY, description="Search text", type=openapi.TYPE_STRING, required=True),
+            openapi.Parameter('limit', openapi.IN_QUERY, description="Max results (default 20)", type=openapi.TYPE_INTEGER),
+        ],
+        responses={200: ExercisePopularitySerializer(many=True)}
+    )
+    def get(self, request):
+        try:
+            limit = min(int(request.query_params.get('limit', 20)), self.max_limit)
+        except ValueError:
+            return BadRequestResponse(message="limit must be an integer")
+
+        exercises = ExerciseService.search_exercises(
+            actor=request.user,
+            query=request.query_params.get('q', ''),
+            limit=max(limit, 1)
+        )
+        return SuccessResponse(ExercisePopularitySerializer(exercises, many=True).data)
+
+
+class ExerciseFacetView(APIView):
+    scopes = ('all', 'public', 'mine')
+
+    @swagger_auto_schema(
+        operation_summary="Filter exercises by facets",
+        operation_description=(
+            "Filter the catalog by category, modality, training system, level, intensity "
+            "and muscle group (any / primary / secondary). Values are comma separated. "
+            "The response includes a count for every facet value."
+        ),
+        manual_parameters=[
+            openapi.Parameter(facet, openapi.IN_QUERY, type=openapi.TYPE_STRING)
+            for facet in FACETS
+        ] + [
+            openapi.Parameter('scope', openapi.IN_QUERY, description="all | public | mine", type=openapi.TYPE_STRING),
+            openapi.Parameter('page', openapi.IN_QUERY, type=openapi.TYPE_INTEGER),
+            openapi.Parameter('page_size', openapi.IN_QUERY, type=openapi.TYPE_INTEGER),
+        ],
+    )
+    def get(self, request):
+        scope = request.query_params.get('scope', 'all')
+        if scope not in self.scopes:
+            return BadRequestResponse(message=f"scope must be one of {', '.join(self.scopes)}")
+
+        selections = {
+            facet: {value for value in request.query_params.get(facet, '').split(',') if value}
+            for facet in FACETS
+        }
+        exercise_ids, facet_counts = ExerciseFacetService.search(
+            actor=request.user,
+            selections=selections,
+            scope=scope
+        )
+
+        paginator = StandardResultsSetPagination()
+        page = paginator.paginate_queryset(exercise_ids, request, view=self)
+        exercises = ExerciseService.get_exercises_by_ids(page)
+
+        response = paginator.get_paginated_response(ExercisePopularitySerializer(exercises, many=True).data)
+        response.data['data']['facets'] = facet_counts
+        return response
+
+
 class ExerciseDetailView(APIView):
 
     @swagger_auto_schema(
@@ -47,12 +157,24 @@ class ExerciseDetailView(APIView):
         responses={200: ExerciseSerializer}
     )
     def get(self, request, exercise_id):
-        exercise = ExerciseService.update_exercise(
-            actor=request.user,
-            exercise_id=exercise_id,
-            data={}
-        )
-        return SuccessResponse(ExerciseSerializer(exercise).data)
+        stamp = ExerciseService.catalog_stamp(request.user, exercise_id)
+        etag = version_etag(exercise_id, sorted(stamp.items()), MediaUrlService.epoch())
+        if stamp['count']:
+            response = not_modified(request, etag, stamp['last_modified'])
+            if response is not None:
+                PopularityService.record_exercise_views([exercise_id])
+                return response
+
+        try:
+            exercise = ExerciseService.get_exercise(
+                actor=request.user,
+                exercise_id=exercise_id
+            )
+        except NotFoundException as e:
+            return NotFoundResponse(message=str(e))
+
+        PopularityService.record_exercise_views([exercise.pk])
+        return with_validators(SuccessResponse(ExerciseSerializer(exercise).data), etag, stamp['last_modified'])
 
     @swagger_auto_schema(
         operation_summary="Update exercise",
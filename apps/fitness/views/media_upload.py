@@ -0,0 +1,98 @@
+from rest_framework.views import APIView
+from rest_framework.permissions import AllowAny, IsAuthenticated
+from drf_yasg.utils import swagger_auto_schema
+
+from apps.fitness.serializers.media_upload import MediaUploadConfirmSerializer, MediaUploadSerializer
+from apps.fitness.services.media_upload_service import UPLOAD_TARGETS, MediaUploadService
+from apps.fitness.services.media_url_service import MediaUrlService
+from config.utils.exceptions import BadRequestException, ForbiddenException, NotFoundException
+from config.utils.response_state import (
+    SuccessResponse,
+    BadRequestResponse,
+    ForbiddenResponse,
+    NotFoundResponse,
+)
+
+
+class MediaUploadView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    @swagger_auto_schema(
+        operation_summary="Start a media upload",
+        operation_description=(
+            "Returns where to PUT the file: `url`, or one URL per `parts` entry (`part_size` bytes "
+            "each) for large files, with the headers to send. The file goes straight to storage. "
+            "Then call confirm with the returned `token` to attach it."
+        ),
+        request_body=MediaUploadSerializer,
+    )
+    def post(self, request):
+        serializer = MediaUploadSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        try:
+            upload = MediaUploadService.start(actor=request.user, **serializer.validated_data)
+        except BadRequestException as e:
+            return BadRequestResponse(message=str(e))
+        except ForbiddenException as e:
+            return ForbiddenResponse(message=str(e))
+        except NotFoundException as e:
+            return NotFoundResponse(message=str(e))
+
+        if 'url' in upload:
+            upload['url'] = request.build_absolute_uri(upload['url'])
+        return SuccessResponse(upload, status=201)
+
+
+class MediaUploadConfirmView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    @swagger_auto_schema(
+        operation_summary="Attach an uploaded file",
+        operation_description=(
+            "Checks the uploaded object and attaches it to the exercise, program, session or "
+            "profile. Multipart uploads send the ETag of every part. Safe to repeat."
+        ),
+        request_body=MediaUploadConfirmSerializer,
+    )
+    def post(self, request):
+        serializer = MediaUploadConfirmSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        try:
+            target, instance = MediaUploadService.confirm(actor=request.user, **serializer.validated_data)
+        except BadRequestException as e:
+            return BadRequestResponse(message=str(e))
+        except ForbiddenException as e:
+            return ForbiddenResponse(message=str(e))
+        except NotFoundException as e:
+            return NotFoundResponse(message=str(e))
+
+        file = getattr(instance, UPLOAD_TARGETS[target]['field'])
+        return SuccessResponse({
+            'target': target,
+            'id': instance.id,
+            'name': file.name,
+            'url': MediaUrlService.url(file),
+        })
+
+
+class MediaUploadLocalView(APIView):
+    """Upload URL for storages that cannot presign (local filesystem); the token is the credential."""
+    authentication_classes = []
+    permission_classes = [AllowAny]
+
+    @swagger_auto_schema(auto_schema=None)
+    def put(self, request, token):
+        try:
+            MediaUploadService.receive(
+                token,
+                request.stream,
+                request.content_type,
+                int(request.META.get('CONTENT_LENGTH') or 0),
+            )
+        except BadRequestException as e:
+            return BadRequestResponse(message=str(e))
+        except ForbiddenException as e:
+            return ForbiddenResponse(message=str(e))
+        return SuccessResponse(None, status=201)
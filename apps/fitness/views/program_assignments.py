@@ -6,7 +6,7 @@ from drf_yasg import openapi
 
 from apps.fitness.serializers.program_assignment import ProgramAssignmentSerializer
 from apps.account.permissions.workout import CanAssignWorkoutProgram
-from config.utils.pagination import StandardResultsSetPagination
+from config.utils.pagination import get_paginator
 from config.utils.response_state import (
     SuccessResponse,
     NotFoundResponse,
@@ -145,6 +145,24 @@ class AssignmentHistoryView(APIView):
                 description="Items per page",
                 type=openapi.TYPE_INTEGER,
             ),
+            openapi.Parameter(
+                "pagination",
+                openapi.IN_QUERY,
+                description="Set to 'cursor' for keyset pagination",
+                type=openapi.TYPE_STRING,
+            ),
+            openapi.Parameter(
+                "cursor",
+                openapi.IN_QUERY,
+                description="Opaque cursor from a previous next/previous link",
+                type=openapi.TYPE_STRING,
+            ),
+            openapi.Parameter(
+                "with_count",
+                openapi.IN_QUERY,
+                description="Include the total count in cursor mode",
+                type=openapi.TYPE_BOOLEAN,
+            ),
         ],
         responses={200: ProgramAssignmentSerializer(many=True)},
     )
@@ -163,7 +181,7 @@ class AssignmentHistoryView(APIView):
                 filters=filters,
             )
 
-            paginator = StandardResultsSetPagination()
+            paginator = get_paginator(request, ordering=("-assigned_at", "-id"))
             page = paginator.paginate_queryset(queryset, request)
 
             serializer = ProgramAssignmentSerializer(page, many=True)
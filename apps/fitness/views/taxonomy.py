@@ -0,0 +1,24 @@
+# apps/fitness/views/taxonomy.py
+
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.views import APIView
+from drf_yasg.utils import swagger_auto_schema
+
+from apps.fitness.services.taxonomy_cache import TaxonomyCache
+from config.utils.conditional import not_modified, with_validators
+from config.utils.response_state import SuccessResponse
+
+
+class TaxonomyView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    @swagger_auto_schema(
+        operation_summary="Taxonomy reference data",
+        operation_description=(
+            "Categories, modalities, equipment, training systems and the muscle group tree. "
+            "Send the returned ETag back in If-None-Match to get a 304 when nothing changed."
+        ),
+    )
+    def get(self, request):
+        payload, etag = TaxonomyCache.snapshot()
+        return not_modified(request, etag) or with_validators(SuccessResponse(payload), etag)
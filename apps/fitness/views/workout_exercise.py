@@ -3,9 +3,10 @@
 from rest_framework.views import APIView
 from drf_yasg.utils import swagger_auto_schema
 
-from apps.fitness.serializers.workout_exercise import WorkoutExerciseSerializer
+from apps.fitness.serializers.workout_exercise import WorkoutExerciseBatchSerializer, WorkoutExerciseSerializer
 from apps.fitness.services.workout_exercise_service import WorkoutExerciseService
-from config.utils.response_state import SuccessResponse
+from config.utils.exceptions import BadRequestException, ForbiddenException, NotFoundException
+from config.utils.response_state import SuccessResponse, BadRequestResponse, ForbiddenResponse, NotFoundResponse
 
 
 class WorkoutExerciseView(APIView):
@@ -60,3 +61,36 @@ class WorkoutExerciseDetailView(APIView):
             workout_exercise_id=workout_exercise_id
         )
         return SuccessResponse(message="Exercise removed from session")
+
+
+class WorkoutExerciseBatchView(APIView):
+
+    @swagger_auto_schema(
+        operation_summary="Edit a session's exercises in one call",
+        operation_description=(
+            "Operations (add, update, delete, reorder) are applied in order, all or nothing. "
+            "Returns a result per operation and the session's exercises in their new order."
+        ),
+        request_body=WorkoutExerciseBatchSerializer,
+    )
+    def post(self, request, session_id):
+        serializer = WorkoutExerciseBatchSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        try:
+            results, exercises = WorkoutExerciseService.apply_operations(
+                actor=request.user,
+                session_id=session_id,
+                operations=serializer.validated_data['operations']
+            )
+        except BadRequestException as e:
+            return BadRequestResponse(message=str(e))
+        except ForbiddenException as e:
+            return ForbiddenResponse(message=str(e))
+        except NotFoundException as e:
+            return NotFoundResponse(message=str(e))
+
+        return SuccessResponse({
+            'results': results,
+            'exercises': WorkoutExerciseSerializer(exercises, many=True).data,
+        })
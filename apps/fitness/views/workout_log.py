@@ -0,0 +1,58 @@
+from rest_framework.views import APIView
+from rest_framework.permissions import IsAuthenticated
+from drf_yasg.utils import swagger_auto_schema
+from drf_yasg import openapi
+
+from apps.fitness.serializers.workout_log import WorkoutLogBatchSerializer, WorkoutLogSerializer
+from apps.fitness.services.workout_log_service import WorkoutLogService
+from config.utils.exceptions import BadRequestException, NotFoundException
+from config.utils.pagination import KeysetCursorPagination
+from config.utils.response_state import SuccessResponse, BadRequestResponse, NotFoundResponse
+
+
+class ClientWorkoutLogView(APIView):
+    permission_classes = [IsAuthenticated]
+    cursor_ordering = ("-completed_at", "-id")
+
+    @swagger_auto_schema(
+        operation_summary="My workout logs",
+        operation_description="Newest first, keyset paginated (cursor, page_size, with_count).",
+        manual_parameters=[
+            openapi.Parameter('from', openapi.IN_QUERY, type=openapi.TYPE_STRING, format=openapi.FORMAT_DATE),
+            openapi.Parameter('to', openapi.IN_QUERY, type=openapi.TYPE_STRING, format=openapi.FORMAT_DATE,
+                              description="Inclusive"),
+        ],
+        responses={200: WorkoutLogSerializer(many=True)}
+    )
+    def get(self, request):
+        try:
+            logs = WorkoutLogService.list_logs(
+                request.user, request.query_params.get('from'), request.query_params.get('to')
+            )
+        except BadRequestException as e:
+            return BadRequestResponse(message=str(e))
+
+        paginator = KeysetCursorPagination(ordering=self.cursor_ordering)
+        page = paginator.paginate_queryset(logs, request, view=self)
+        return paginator.get_paginated_response(WorkoutLogSerializer(page, many=True).data)
+
+    @swagger_auto_schema(
+        operation_summary="Upload workout logs",
+        operation_description=(
+            "A batch of completed sessions with their performed sets, e.g. collected offline. "
+            "Ids are generated by the app; sending the same batch again creates nothing new."
+        ),
+        request_body=WorkoutLogBatchSerializer,
+        responses={201: "Created / duplicate counts for logs and sets"}
+    )
+    def post(self, request):
+        serializer = WorkoutLogBatchSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        try:
+            summary = WorkoutLogService.ingest(request.user, serializer.validated_data['logs'])
+        except BadRequestException as e:
+            return BadRequestResponse(message=str(e))
+        except NotFoundException as e:
+            return NotFoundResponse(message=str(e))
+        return SuccessResponse(summary, status=201)
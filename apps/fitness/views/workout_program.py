@@ -1,15 +1,37 @@
+from uuid import UUID
+
+from django.db import transaction
+from django.http import StreamingHttpResponse
 from rest_framework.views import APIView
 from rest_framework.permissions import IsAuthenticated
 from drf_yasg.utils import swagger_auto_schema
+from drf_yasg import openapi
 
 from apps.fitness.serializers.workout_program import (
+    ProgramBulkCloneSerializer,
+    ProgramMarketplaceSerializer,
+    ProgramReviewSerializer,
     WorkoutProgramBuilderSerializer,
     WorkoutProgramDeepSerializer,
     WorkoutProgramSerializer
 )
+from apps.fitness.services.program_clone_service import ProgramCloneService
+from apps.fitness.services.program_exchange_service import FORMATS, ProgramExchangeService
+from apps.fitness.services.program_marketplace_service import ProgramMarketplaceService
+from apps.fitness.services.program_snapshot_service import ProgramSnapshotService
 from apps.fitness.services.workout_program_service import WorkoutProgramService
 from apps.fitness.models.workout import WorkoutProgram
-from config.utils.response_state import SuccessResponse
+from apps.jobs.serializers import JobSerializer
+from config.utils.conditional import latest, not_modified, with_validators
+from config.utils.pagination import KeysetCursorPagination, wants_cursor_pagination
+from config.utils.exceptions import BadRequestException, ForbiddenException, NotFoundException
+from config.utils.response_state import (
+    SuccessResponse,
+    EncodedSuccessResponse,
+    BadRequestResponse,
+    NotFoundResponse,
+    ForbiddenResponse,
+)
 
 
 class WorkoutProgramBuilderView(APIView):
@@ -23,23 +45,42 @@ class WorkoutProgramBuilderView(APIView):
     def post(self, request):
         serializer = WorkoutProgramBuilderSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
-        program = WorkoutProgramService.create_program_with_sessions(request.user, serializer.validated_data)
-        return SuccessResponse(WorkoutProgramDeepSerializer(program).data, status=201)
+        try:
+            program = WorkoutProgramService.create_program_with_sessions(request.user, serializer.validated_data)
+        except NotFoundException as e:
+            return NotFoundResponse(message=str(e))
+        return EncodedSuccessResponse(ProgramSnapshotService.encoded(program.id), status=201)
 
     @swagger_auto_schema(
         operation_summary="Update program with sessions & exercises",
+        operation_description=(
+            "Sessions and exercises carrying an id are updated in place, those without one "
+            "are created and existing ones left out of the payload are deleted. "
+            "The response includes a `changes` summary."
+        ),
         request_body=WorkoutProgramBuilderSerializer,
         responses={200: WorkoutProgramDeepSerializer}
     )
     def put(self, request, program_id):
         serializer = WorkoutProgramBuilderSerializer(data=request.data, partial=True)
         serializer.is_valid(raise_exception=True)
-        program = WorkoutProgramService.update_program_with_sessions(request.user, program_id, serializer.validated_data)
-        return SuccessResponse(WorkoutProgramDeepSerializer(program).data)
+        try:
+            program, changes = WorkoutProgramService.update_program_with_sessions(
+                request.user, program_id, serializer.validated_data
+            )
+        except BadRequestException as e:
+            return BadRequestResponse(message=str(e))
+        except NotFoundException as e:
+            return NotFoundResponse(message=str(e))
+        except ForbiddenException as e:
+            return ForbiddenResponse(message=str(e))
+
+        return EncodedSuccessResponse(ProgramSnapshotService.encoded(program.id), extra={'changes': changes})
 
 
 class WorkoutProgramListView(APIView):
     permission_classes = [IsAuthenticated]
+    cursor_ordering = ("-created_at", "-id")
 
     @swagger_auto_schema(
         operation_summary="List all programs of the user",
@@ -47,6 +88,12 @@ class WorkoutProgramListView(APIView):
     )
     def get(self, request):
         programs = WorkoutProgram.objects.filter(created_by=request.user)
+
+        if wants_cursor_pagination(request):
+            paginator = KeysetCursorPagination(ordering=self.cursor_ordering)
+            page = paginator.paginate_queryset(programs, request, view=self)
+            return paginator.get_paginated_response(WorkoutProgramSerializer(page, many=True).data)
+
         return SuccessResponse(WorkoutProgramSerializer(programs, many=True).data)
 
 
@@ -58,8 +105,21 @@ class WorkoutProgramDetailView(APIView):
         responses={200: WorkoutProgramDeepSerializer}
     )
     def get(self, request, program_id):
-        program = WorkoutProgram.objects.get(id=program_id)
-        return SuccessResponse(WorkoutProgramDeepSerializer(program).data)
+        version = ProgramSnapshotService.version(program_id)
+        if version is None:
+            return NotFoundResponse(message="Workout program not found.")
+
+        etag = ProgramSnapshotService.etag(program_id, version)
+        last_modified = latest(version['updated_at'], version['sessions_updated'], version['exercises_updated'])
+        response = not_modified(request, etag, last_modified)
+        if response is not None:
+            return response
+
+        try:
+            document = ProgramSnapshotService.encoded(program_id, version)
+        except NotFoundException as e:
+            return NotFoundResponse(message=str(e))
+        return with_validators(EncodedSuccessResponse(document), etag, last_modified)
 
     @swagger_auto_schema(
         operation_summary="Delete a program",
@@ -79,7 +139,7 @@ class WorkoutProgramPublishView(APIView):
     )
     def post(self, request, program_id):
         program = WorkoutProgramService.publish_program(request.user, program_id)
-        return SuccessResponse(WorkoutProgramDeepSerializer(program).data)
+        return EncodedSuccessResponse(ProgramSnapshotService.encoded(program.id))
 
 
 class WorkoutProgramCloneView(APIView):
@@ -87,8 +147,180 @@ class WorkoutProgramCloneView(APIView):
 
     @swagger_auto_schema(
         operation_summary="Clone program (deep clone with sessions & exercises)",
-        responses={201: WorkoutProgramDeepSerializer}
+        manual_parameters=[
+            openapi.Parameter(
+                'background', openapi.IN_QUERY, type=openapi.TYPE_BOOLEAN,
+                description="Queue a job and return 202 with it instead of waiting"
+            ),
+        ],
+        responses={201: WorkoutProgramDeepSerializer, 202: JobSerializer}
     )
     def post(self, request, program_id):
-        program = WorkoutProgramService.clone_program(request.user, program_id)
-        return SuccessResponse(WorkoutProgramDeepSerializer(program).data, status=201)
+        try:
+            if request.query_params.get('background') == 'true':
+                job = WorkoutProgramService.enqueue_clone_program(request.user, program_id)
+                return SuccessResponse(JobSerializer(job).data, status=202)
+            program = WorkoutProgramService.clone_program(request.user, program_id)
+        except NotFoundException as e:
+            return NotFoundResponse(message=str(e))
+        return EncodedSuccessResponse(ProgramSnapshotService.encoded(program.id), status=201)
+
+
+class WorkoutProgramBulkCloneView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    @swagger_auto_schema(
+        operation_summary="Clone several programs, or one program for several clients",
+        operation_description=(
+            "`program_ids`: copy each program for the current user. "
+            "`program_id` + `client_ids`: one custom copy per client, owned by the coach. "
+            "Programs must be your own or public. "
+            "With `background: true` the copy runs as a job; poll it at jobs/<id>/."
+        ),
+        request_body=ProgramBulkCloneSerializer,
+        responses={201: WorkoutProgramSerializer(many=True), 202: JobSerializer}
+    )
+    def post(self, request):
+        serializer = ProgramBulkCloneSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+
+        try:
+            if data['background']:
+                if 'program_ids' in data:
+                    job = ProgramCloneService.enqueue_clone_programs(request.user, data['program_ids'])
+                else:
+                    job = ProgramCloneService.enqueue_clone_program_for_clients(
+                        request.user, data['program_id'], data['client_ids']
+                    )
+                return SuccessResponse(JobSerializer(job).data, status=202)
+
+            if 'program_ids' in data:
+                copies = ProgramCloneService.clone_programs(request.user, data['program_ids'])
+                return SuccessResponse(WorkoutProgramSerializer(copies, many=True).data, status=201)
+
+            copies = ProgramCloneService.clone_program_for_clients(
+                request.user, data['program_id'], data['client_ids']
+            )
+        except BadRequestException as e:
+            return BadRequestResponse(message=str(e))
+        except NotFoundException as e:
+            return NotFoundResponse(message=str(e))
+
+        return SuccessResponse(
+            [
+                {'client_id': client_id, 'program': WorkoutProgramSerializer(copy).data}
+                for client_id, copy in copies.items()
+            ],
+            status=201
+        )
+
+
+class WorkoutProgramMarketplaceView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    @swagger_auto_schema(
+        operation_summary="Browse published programs",
+        operation_description="Keyset paginated (cursor, page_size, with_count).",
+        manual_parameters=[
+            openapi.Parameter('level', openapi.IN_QUERY, type=openapi.TYPE_STRING),
+            openapi.Parameter('goal', openapi.IN_QUERY, type=openapi.TYPE_STRING),
+            openapi.Parameter('duration_weeks', openapi.IN_QUERY, type=openapi.TYPE_INTEGER),
+            openapi.Parameter('price_min', openapi.IN_QUERY, type=openapi.TYPE_NUMBER),
+            openapi.Parameter('price_max', openapi.IN_QUERY, type=openapi.TYPE_NUMBER),
+            openapi.Parameter('is_verified', openapi.IN_QUERY, type=openapi.TYPE_BOOLEAN),
+            openapi.Parameter(
+                'sort', openapi.IN_QUERY, type=openapi.TYPE_STRING,
+                description="popular (default) | newest | rating"
+            ),
+        ],
+        responses={200: ProgramMarketplaceSerializer(many=True)}
+    )
+    def get(self, request):
+        try:
+            programs, ordering = ProgramMarketplaceService.list_programs(request.query_params)
+        except BadRequestException as e:
+            return BadRequestResponse(message=str(e))
+
+        # Always keyset: OFFSET pages degrade on a catalog this size
+        paginator = KeysetCursorPagination(ordering=ordering)
+        page = paginator.paginate_queryset(programs, request, view=self)
+        return paginator.get_paginated_response(ProgramMarketplaceSerializer(page, many=True).data)
+
+
+class WorkoutProgramReviewView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    @swagger_auto_schema(
+        operation_summary="Rate a program assigned to you",
+        request_body=ProgramReviewSerializer,
+        responses={200: ProgramReviewSerializer}
+    )
+    def post(self, request, program_id):
+        serializer = ProgramReviewSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        try:
+            review = ProgramMarketplaceService.review_program(
+                actor=request.user, program_id=program_id, **serializer.validated_data
+            )
+        except ForbiddenException as e:
+            return ForbiddenResponse(message=str(e))
+        return SuccessResponse(ProgramReviewSerializer(review).data)
+
+
+class WorkoutProgramExportView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    @swagger_auto_schema(
+        operation_summary="Export programs (streamed)",
+        operation_description=(
+            "A header record, then one record per program with its sessions and exercises. "
+            "Exports all of your programs unless `ids` is given."
+        ),
+        manual_parameters=[
+            openapi.Parameter('ids', openapi.IN_QUERY, type=openapi.TYPE_STRING, description="Comma separated program ids"),
+            openapi.Parameter('format', openapi.IN_QUERY, type=openapi.TYPE_STRING, description="ndjson (default) | msgpack"),
+        ],
+    )
+    def get(self, request):
+        fmt = request.query_params.get('format') or 'ndjson'
+        try:
+            program_ids = [UUID(pk) for pk in request.query_params.get('ids', '').split(',') if pk]
+        except ValueError:
+            return BadRequestResponse(message="ids must be comma separated UUIDs")
+
+        try:
+            chunks = ProgramExchangeService.export_programs(request.user, program_ids, fmt)
+        except BadRequestException as e:
+            return BadRequestResponse(message=str(e))
+
+        response = StreamingHttpResponse(chunks, content_type=FORMATS[fmt])
+        response['Content-Disposition'] = f'attachment; filename="programs.{fmt}"'
+        return response
+
+
+class WorkoutProgramImportView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    @swagger_auto_schema(
+        operation_summary="Import programs from an export stream",
+        operation_description=(
+            "Send the export as the raw request body (Content-Type application/x-ndjson or "
+            "application/msgpack). Programs are created as private copies owned by you; "
+            "the import is all or nothing."
+        ),
+        responses={201: "Number of programs created"}
+    )
+    def post(self, request):
+        fmt = 'msgpack' if request.content_type.startswith(FORMATS['msgpack']) else 'ndjson'
+        if request.stream is None:
+            return BadRequestResponse(message="The request body is empty.")
+        try:
+            with transaction.atomic():
+                created = ProgramExchangeService.import_programs(
+                    request.user, ProgramExchangeService.decode(request.stream, fmt)
+                )
+        except BadRequestException as e:
+            return BadRequestResponse(message=str(e))
+        return SuccessResponse({'created': created}, status=201)
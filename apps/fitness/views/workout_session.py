@@ -1,3 +1,5 @@
+from uuid import UUID
+
 from rest_framework.views import APIView
 from rest_framework.permissions import IsAuthenticated
 from drf_yasg.utils import swagger_auto_schema
@@ -5,14 +7,19 @@ from drf_yasg import openapi
 
 from apps.fitness.serializers.workout_session import WorkoutSessionSerializer
 from apps.fitness.services.workout_session_service import WorkoutSessionService
-from config.utils.response_state import SuccessResponse
+from apps.fitness.services.popularity_service import PopularityService
+from config.utils.exceptions import BadRequestException, NotFoundException
+from config.utils.pagination import KeysetCursorPagination, wants_cursor_pagination
+from config.utils.response_state import SuccessResponse, BadRequestResponse, NotFoundResponse
 
 
 class WorkoutSessionView(APIView):
     permission_classes = [IsAuthenticated]
+    ordering = ("week_number", "created_at", "id")
 
     @swagger_auto_schema(
         operation_summary="List workout sessions",
+        operation_description="Sessions you own, are assigned, or that are public. ?pagination=cursor pages them.",
         manual_parameters=[
             openapi.Parameter(
                 'program_id',
@@ -20,19 +27,38 @@ class WorkoutSessionView(APIView):
                 description="Filter by program",
                 type=openapi.TYPE_STRING,
                 format=openapi.FORMAT_UUID
-            )
+            ),
+            openapi.Parameter('week_from', openapi.IN_QUERY, type=openapi.TYPE_INTEGER),
+            openapi.Parameter('week_to', openapi.IN_QUERY, type=openapi.TYPE_INTEGER),
+            openapi.Parameter('is_rest_day', openapi.IN_QUERY, type=openapi.TYPE_BOOLEAN),
+            openapi.Parameter('session_type', openapi.IN_QUERY, type=openapi.TYPE_STRING),
+            openapi.Parameter(
+                'pagination', openapi.IN_QUERY, type=openapi.TYPE_STRING,
+                description="Set to 'cursor' for keyset pagination (cursor, page_size, with_count)"
+            ),
         ],
         responses={200: WorkoutSessionSerializer(many=True)}
     )
     def get(self, request):
-        program_id = request.query_params.get('program_id')
-        sessions = WorkoutSessionService.list_sessions(
-            actor=request.user,
-            program_id=program_id
-        )
-        return SuccessResponse(
-            WorkoutSessionSerializer(sessions, many=True).data
-        )
+        try:
+            program_id = UUID(request.query_params['program_id']) if request.query_params.get('program_id') else None
+        except ValueError:
+            return BadRequestResponse(message="program_id must be a UUID")
+
+        try:
+            sessions = WorkoutSessionService.list_sessions(
+                actor=request.user,
+                program_id=program_id,
+                filters=request.query_params
+            )
+        except BadRequestException as e:
+            return BadRequestResponse(message=str(e))
+
+        if wants_cursor_pagination(request):
+            paginator = KeysetCursorPagination(ordering=self.ordering)
+            page = paginator.paginate_queryset(sessions, request, view=self)
+            return paginator.get_paginated_response(WorkoutSessionSerializer(page, many=True).data)
+        return SuccessResponse(WorkoutSessionSerializer(sessions, many=True).data)
 
     @swagger_auto_schema(
         operation_summary="Create workout session",
@@ -62,10 +88,14 @@ class WorkoutSessionDetailView(APIView):
         responses={200: WorkoutSessionSerializer}
     )
     def get(self, request, session_id):
-        session = WorkoutSessionService.get_session(
-            actor=request.user,
-            session_id=session_id
-        )
+        try:
+            session = WorkoutSessionService.get_session(
+                actor=request.user,
+                session_id=session_id
+            )
+        except NotFoundException as e:
+            return NotFoundResponse(message=str(e))
+        PopularityService.record_session_views([session.pk])
         return SuccessResponse(
             WorkoutSessionSerializer(session).data
         )
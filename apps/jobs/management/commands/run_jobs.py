@@ -0,0 +1,112 @@
+import os
+import signal
+import socket
+import threading
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections, connection
+
+from apps.jobs.services.job_service import JobService
+
+
+class Command(BaseCommand):
+    help = (
+        "Run background jobs from the Postgres queue. Each worker thread claims "
+        "jobs with SELECT ... FOR UPDATE SKIP LOCKED, so several processes can "
+        "run side by side. Stops after the current jobs on SIGINT / SIGTERM. "
+        "While serving, the locks of running jobs are refreshed and jobs of "
+        "dead workers are requeued every third of --stale-after."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--concurrency', type=int, default=1, help="Worker threads")
+        parser.add_argument('--poll-interval', type=float, default=1.0, help="Seconds to sleep when the queue is empty")
+        parser.add_argument('--once', action='store_true', help="Exit when no job is due instead of polling")
+        parser.add_argument('--stale-after', type=int, default=30 * 60,
+                            help="Requeue running jobs whose lock was not refreshed for this many seconds")
+
+    def handle(self, *args, **options):
+        self.stopping = threading.Event()
+        previous = {
+            sig: signal.signal(sig, lambda *_: self.stopping.set())
+            for sig in (signal.SIGINT, signal.SIGTERM)
+        }
+        try:
+            self.serve(options)
+        finally:
+            for sig, handler in previous.items():
+                signal.signal(sig, handler)
+
+    def serve(self, options):
+        stale_after = timedelta(seconds=options['stale_after'])
+        # Refresh well inside the window so a live job never looks stale
+        interval = max(1.0, stale_after.total_seconds() / 3)
+        self.running = {}
+        self.running_lock = threading.Lock()
+
+        prefix = f"{socket.gethostname()}:{os.getpid()}"
+        threads = [
+            threading.Thread(
+                target=self.work,
+                args=(f"{prefix}:{n}", options['poll_interval'], options['once']),
+                daemon=True,
+            )
+            for n in range(max(1, options['concurrency']))
+        ]
+        self.maintain(stale_after)
+        for thread in threads:
+            thread.start()
+
+        next_maintenance = time.monotonic() + interval
+        try:
+            while alive := [thread for thread in threads if thread.is_alive()]:
+                if time.monotonic() >= next_maintenance:
+                    self.maintain(stale_after)
+                    next_maintenance = time.monotonic() + interval
+                alive[0].join(timeout=0.5)
+        finally:
+            connection.close()
+
+    def maintain(self, stale_after):
+        """Heartbeat this process's running jobs and requeue those of dead workers."""
+        try:
+            close_old_connections()
+            with self.running_lock:
+                running = dict(self.running)
+            JobService.heartbeat(running)
+            requeued = JobService.requeue_stale(stale_after)
+        except Exception as e:
+            # A database hiccup must not take the pool down; the next round retries
+            self.stderr.write(f"Job maintenance failed: {e}")
+            return
+        if requeued:
+            self.stdout.write(f"Recovered {requeued} stale jobs")
+
+    def work(self, worker, poll_interval, once):
+        # Django connections are per thread; each worker owns one
+        try:
+            while not self.stopping.is_set():
+                close_old_connections()
+                jobs = JobService.claim(worker)
+                if not jobs:
+                    if once:
+                        return
+                    self.stopping.wait(poll_interval)
+                    continue
+
+                for job in jobs:
+                    started = time.monotonic()
+                    with self.running_lock:
+                        self.running[job.id] = worker
+                    try:
+                        JobService.run(job)
+                    finally:
+                        with self.running_lock:
+                            del self.running[job.id]
+                    self.stdout.write(
+                        f"[{worker}] {job.name} {job.id} {job.status} in {time.monotonic() - started:.2f}s"
+                    )
+        finally:
+            connection.close()
@@ -0,0 +1,62 @@
+import uuid
+
+from django.conf import settings
+from django.db import models
+from django.utils import timezone
+
+User = settings.AUTH_USER_MODEL
+
+
+class Job(models.Model):
+    """
+    A unit of background work. Workers claim queued rows with
+    SELECT ... FOR UPDATE SKIP LOCKED, so any number of them can poll the
+    table without handing the same job out twice.
+    """
+
+    class Status(models.TextChoices):
+        QUEUED = 'queued', 'Queued'
+        RUNNING = 'running', 'Running'
+        SUCCEEDED = 'succeeded', 'Succeeded'
+        FAILED = 'failed', 'Failed'
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    name = models.CharField(max_length=100)  # registered handler
+    payload = models.JSONField(default=dict, blank=True)
+    status = models.CharField(max_length=20, choices=Status.choices, default=Status.QUEUED)
+    priority = models.SmallIntegerField(default=0)
+
+    attempts = models.PositiveSmallIntegerField(default=0)
+    max_attempts = models.PositiveSmallIntegerField(default=5)
+    run_at = models.DateTimeField(default=timezone.now)
+    locked_at = models.DateTimeField(null=True, blank=True)
+    locked_by = models.CharField(max_length=255, blank=True)
+
+    result = models.JSONField(null=True, blank=True)
+    last_error = models.TextField(blank=True)
+
+    created_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name='jobs')
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            # the claim query: only queued rows, in pick-up order
+            models.Index(
+                fields=['-priority', 'run_at'],
+                name='job_queued_pickup',
+                condition=models.Q(status='queued'),
+            ),
+            # stale running jobs of crashed workers
+            models.Index(
+                fields=['locked_at'],
+                name='job_running_locked',
+                condition=models.Q(status='running'),
+            ),
+            models.Index(fields=['created_by', '-created_at'], name='job_owner_recent'),
+        ]
+
+    def __str__(self):
+        return f"{self.name} [{self.status}]"
@@ -0,0 +1,22 @@
+# apps/jobs/registry.py
+
+_handlers = {}
+
+
+def job_handler(name, max_attempts=5):
+    """
+    Register `func(job)` as the handler of jobs called `name`. It runs in a
+    worker, outside any request; whatever JSON-serializable value it returns
+    is stored as the job result. Raising marks the attempt failed.
+    """
+    def register(func):
+        if name in _handlers and _handlers[name][0] is not func:
+            raise ValueError(f"Job handler {name!r} is already registered.")
+        _handlers[name] = (func, max_attempts)
+        return func
+    return register
+
+
+def get_handler(name):
+    """(handler, max_attempts) for `name`, or None."""
+    return _handlers.get(name)
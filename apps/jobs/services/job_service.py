@@ -0,0 +1,174 @@
+# apps/jobs/services/job_service.py
+
+import logging
+import random
+import traceback
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from apps.jobs.models import Job
+from apps.jobs.registry import get_handler
+from config.utils.exceptions import AppException, BadRequestException, NotFoundException
+
+logger = logging.getLogger(__name__)
+
+# Retry delay: BACKOFF_BASE * 2 ** (attempt - 1) seconds, capped, with jitter
+BACKOFF_BASE = 10
+BACKOFF_CAP = 60 * 60
+# A running job whose lock has not been refreshed in this long is requeued
+STALE_AFTER = timedelta(minutes=30)
+
+
+class JobService:
+
+    @staticmethod
+    def enqueue(name, payload=None, actor=None, priority=0, run_at=None):
+        """
+        Queue a job for a registered handler. The row is written in the
+        caller's transaction, so a rolled back request never leaves work behind.
+        """
+        handler = get_handler(name)
+        if handler is None:
+            raise BadRequestException(f"Unknown job {name!r}.")
+
+        return Job.objects.create(
+            name=name,
+            payload=payload or {},
+            priority=priority,
+            run_at=run_at or timezone.now(),
+            max_attempts=handler[1],
+            created_by=actor,
+        )
+
+    @staticmethod
+    @transaction.atomic
+    def claim(worker, limit=1):
+        """
+        Lock up to `limit` due jobs for `worker` and mark them running.
+        Rows locked by another worker are skipped, not waited on.
+        """
+        now = timezone.now()
+        ids = list(
+            Job.objects.select_for_update(skip_locked=True).filter(
+                status=Job.Status.QUEUED, run_at__lte=now
+            ).order_by('-priority', 'run_at').values_list('id', flat=True)[:limit]
+        )
+        if not ids:
+            return []
+
+        Job.objects.filter(id__in=ids).update(
+            status=Job.Status.RUNNING,
+            attempts=F('attempts') + 1,
+            locked_at=now,
+            locked_by=worker,
+            updated_at=now,
+        )
+        jobs = Job.objects.in_bulk(ids)
+        return [jobs[pk] for pk in ids]
+
+    @staticmethod
+    def backoff(attempts):
+        """Seconds to wait before retrying after the `attempts`-th failure."""
+        delay = min(BACKOFF_CAP, BACKOFF_BASE * 2 ** (attempts - 1))
+        return delay + random.uniform(0, delay / 10)
+
+    @staticmethod
+    def run(job):
+        """
+        Execute a claimed job and record the outcome. Failures are retried
+        with exponential backoff until max_attempts. Returns the job.
+        """
+        handler = get_handler(job.name)
+        try:
+            if handler is None:
+                raise LookupError(f"No handler registered for {job.name!r}.")
+            result = handler[0](job)
+        except AppException as e:
+            # Domain errors (not found, forbidden, ...) fail the same way on every retry
+            logger.warning("Job %s (%s) rejected: %s", job.id, job.name, e)
+            JobService._finish(job, Job.Status.FAILED, last_error=str(e))
+        except Exception:
+            logger.exception("Job %s (%s) failed, attempt %s", job.id, job.name, job.attempts)
+            JobService._failed(job, traceback.format_exc())
+        else:
+            JobService._finish(job, Job.Status.SUCCEEDED, result=result)
+        return job
+
+    @staticmethod
+    def _release(job, **fields):
+        """
+        Record the outcome of this claim, only while the job is still ours:
+        running, locked by the same worker, on the same attempt. When
+        requeue_stale handed it out again meanwhile, the new run owns the row
+        and this outcome is dropped. Returns whether it was recorded.
+        """
+        fields = {**fields, 'locked_at': None, 'updated_at': timezone.now()}
+        updated = Job.objects.filter(
+            id=job.id, status=Job.Status.RUNNING, locked_by=job.locked_by, attempts=job.attempts
+        ).update(**fields)
+        if not updated:
+            logger.warning("Job %s (%s) lost its lease; attempt %s was not recorded", job.id, job.name, job.attempts)
+            return False
+        for field, value in fields.items():
+            setattr(job, field, value)
+        return True
+
+    @staticmethod
+    def _finish(job, status, **fields):
+        return JobService._release(job, status=status, finished_at=timezone.now(), **fields)
+
+    @staticmethod
+    def _failed(job, error):
+        if job.attempts >= job.max_attempts:
+            return JobService._finish(job, Job.Status.FAILED, last_error=error)
+        return JobService._release(
+            job,
+            status=Job.Status.QUEUED,
+            run_at=timezone.now() + timedelta(seconds=JobService.backoff(job.attempts)),
+            last_error=error,
+        )
+
+    @staticmethod
+    def requeue_stale(older_than=STALE_AFTER):
+        """
+        Put jobs of workers that died mid-run back in the queue, or fail
+        them when they used up their attempts. Returns how many were touched.
+        """
+        now = timezone.now()
+        stale = Job.objects.filter(status=Job.Status.RUNNING, locked_at__lt=now - older_than)
+        failed = stale.filter(attempts__gte=F('max_attempts')).update(
+            status=Job.Status.FAILED, locked_at=None, finished_at=now, updated_at=now,
+            last_error="Worker stopped before the job finished.",
+        )
+        return failed + stale.update(status=Job.Status.QUEUED, locked_at=None, run_at=now, updated_at=now)
+
+    @staticmethod
+    def heartbeat(running):
+        """
+        Refresh the lock of jobs still being run, given as {job id: worker},
+        so requeue_stale leaves long jobs alone. Jobs that finished or were
+        taken over in the meantime are skipped. Returns how many were touched.
+        """
+        if not running:
+            return 0
+        owned = Q()
+        for job_id, worker in running.items():
+            owned |= Q(id=job_id, locked_by=worker)
+        return Job.objects.filter(owned, status=Job.Status.RUNNING).update(locked_at=timezone.now())
+
+    @staticmethod
+    def list_jobs(actor, status=None):
+        queryset = Job.objects.filter(created_by=actor)
+        if status:
+            queryset = queryset.filter(status=status)
+        return queryset
+
+    @staticmethod
+    def get_job(actor, job_id):
+        job = Job.objects.filter(id=job_id, created_by=actor).first()
+        if not job:
+            raise NotFoundException("Job not found.")
+        return job
@@ -0,0 +1,138 @@
+from datetime import timedelta
+from io import StringIO
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.utils import timezone
+from apps.jobs.models import Job
+from apps.jobs.registry import job_handler
+from apps.jobs.services.job_service import JobService
+from config.utils.exceptions import BadRequestException, NotFoundException
+
+User = get_user_model()
+calls = []
+
+
+@job_handler('tests.echo')
+def echo(job):
+    calls.append(job.payload)
+    return {'echo': job.payload['value']}
+
+
+@job_handler('tests.flaky', max_attempts=2)
+def flaky(job):
+    raise RuntimeError("boom")
+
+
+@job_handler('tests.rejected')
+def rejected(job):
+    raise NotFoundException("Program not found.")
+
+
+@pytest.mark.django_db
+class TestJobService:
+
+    @pytest.fixture
+    def user(self):
+        calls.clear()
+        return User.objects.create(username="coach1", email="coach1@example.com", is_coach=True)
+
+    def test_claim_and_run(self, user):
+        low = JobService.enqueue('tests.echo', {'value': 1}, actor=user)
+        high = JobService.enqueue('tests.echo', {'value': 2}, actor=user, priority=5)
+        JobService.enqueue('tests.echo', {'value': 3}, run_at=timezone.now() + timedelta(hours=1))
+
+        claimed = JobService.claim('w1', limit=5)
+        assert [job.id for job in claimed] == [high.id, low.id]
+        assert all(job.status == Job.Status.RUNNING and job.attempts == 1 for job in claimed)
+        # running rows are not handed out again
+        assert JobService.claim('w2') == []
+
+        for job in claimed:
+            JobService.run(job)
+        high.refresh_from_db()
+        assert high.status == Job.Status.SUCCEEDED
+        assert high.result == {'echo': 2}
+        assert calls == [{'value': 2}, {'value': 1}]
+
+    def test_failures_back_off_then_fail(self, user):
+        job = JobService.enqueue('tests.flaky', actor=user)
+
+        JobService.run(JobService.claim('w1')[0])
+        job.refresh_from_db()
+        assert job.status == Job.Status.QUEUED
+        assert job.run_at > timezone.now() + timedelta(seconds=9)
+        assert 'boom' in job.last_error
+
+        Job.objects.filter(id=job.id).update(run_at=timezone.now())
+        JobService.run(JobService.claim('w1')[0])
+        job.refresh_from_db()
+        assert job.status == Job.Status.FAILED
+        assert job.attempts == 2
+
+    def test_domain_errors_are_not_retried(self, user):
+        job = JobService.enqueue('tests.rejected', actor=user)
+        JobService.run(JobService.claim('w1')[0])
+        job.refresh_from_db()
+        assert job.status == Job.Status.FAILED
+        assert job.attempts == 1
+        assert job.last_error == "Program not found."
+
+    def test_stale_jobs_are_recovered(self, user):
+        job = JobService.enqueue('tests.echo', {'value': 1}, actor=user)
+        JobService.claim('w1')
+        Job.objects.filter(id=job.id).update(locked_at=timezone.now() - timedelta(hours=1))
+
+        assert JobService.requeue_stale(timedelta(minutes=30)) == 1
+        assert JobService.claim('w2')[0].id == job.id
+
+    def test_late_finish_does_not_overwrite_the_new_run(self, user):
+        job = JobService.enqueue('tests.echo', {'value': 1}, actor=user)
+        first = JobService.claim('w1')[0]
+        Job.objects.filter(id=job.id).update(locked_at=timezone.now() - timedelta(hours=1))
+        JobService.requeue_stale(timedelta(minutes=30))
+        second = JobService.claim('w2')[0]
+
+        JobService.run(first)
+        job.refresh_from_db()
+        assert (job.status, job.locked_by, job.attempts) == (Job.Status.RUNNING, 'w2', 2)
+
+        JobService.run(second)
+        job.refresh_from_db()
+        assert job.status == Job.Status.SUCCEEDED
+
+    def test_heartbeat_keeps_running_jobs(self, user):
+        job = JobService.enqueue('tests.echo', {'value': 1}, actor=user)
+        done = JobService.enqueue('tests.echo', {'value': 2}, actor=user)
+        JobService.claim('w1', limit=2)
+        JobService.run(Job.objects.get(id=done.id))
+        Job.objects.filter(id=job.id).update(locked_at=timezone.now() - timedelta(hours=1))
+
+        # only the job's own worker refreshes it; finished jobs stay unlocked
+        assert JobService.heartbeat({job.id: 'w2'}) == 0
+        assert JobService.heartbeat({job.id: 'w1', done.id: 'w1'}) == 1
+        assert JobService.requeue_stale(timedelta(minutes=30)) == 0
+        job.refresh_from_db()
+        assert job.status == Job.Status.RUNNING
+
+    def test_unknown_job_and_ownership(self, user):
+        with pytest.raises(BadRequestException):
+            JobService.enqueue('tests.missing')
+
+        job = JobService.enqueue('tests.echo', {'value': 1}, actor=user)
+        other = User.objects.create(username="coach2", email="coach2@example.com", is_coach=True)
+        assert JobService.get_job(user, job.id) == job
+        with pytest.raises(NotFoundException):
+            JobService.get_job(other, job.id)
+
+
+@pytest.mark.django_db(transaction=True)
+def test_worker_command_drains_the_queue():
+    calls.clear()
+    jobs = [JobService.enqueue('tests.echo', {'value': value}) for value in range(4)]
+
+    call_command('run_jobs', '--once', '--concurrency', '2', stdout=StringIO())
+
+    assert sorted(call['value'] for call in calls) == [0, 1, 2, 3]
+    assert Job.objects.filter(id__in=[job.id for job in jobs], status=Job.Status.SUCCEEDED).count() == 4
@@ -0,0 +1,8 @@
+from django.urls import path
+
+from apps.jobs.views import JobDetailView, JobListView
+
+urlpatterns = [
+    path('jobs/', JobListView.as_view(), name='job-list'),
+    path('jobs/<uuid:job_id>/', JobDetailView.as_view(), name='job-detail'),
+]
@@ -0,0 +1,52 @@
+from rest_framework.views import APIView
+from rest_framework.permissions import IsAuthenticated
+from drf_yasg.utils import swagger_auto_schema
+from drf_yasg import openapi
+
+from apps.jobs.models import Job
+from apps.jobs.serializers import JobSerializer
+from apps.jobs.services.job_service import JobService
+from config.utils.exceptions import NotFoundException
+from config.utils.pagination import get_paginator
+from config.utils.response_state import SuccessResponse, NotFoundResponse, BadRequestResponse
+
+
+class JobListView(APIView):
+    permission_classes = [IsAuthenticated]
+    ordering = ("-created_at", "-id")
+
+    @swagger_auto_schema(
+        operation_summary="List my background jobs",
+        manual_parameters=[
+            openapi.Parameter(
+                'status', openapi.IN_QUERY, type=openapi.TYPE_STRING,
+                description="queued | running | succeeded | failed"
+            ),
+        ],
+        responses={200: JobSerializer(many=True)}
+    )
+    def get(self, request):
+        status = request.query_params.get('status')
+        if status and status not in Job.Status.values:
+            return BadRequestResponse(message=f"status must be one of {', '.join(Job.Status.values)}")
+
+        queryset = JobService.list_jobs(request.user, status=status)
+        paginator = get_paginator(request, ordering=self.ordering)
+        page = paginator.paginate_queryset(queryset, request, view=self)
+        return paginator.get_paginated_response(JobSerializer(page, many=True).data)
+
+
+class JobDetailView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    @swagger_auto_schema(
+        operation_summary="Background job status",
+        operation_description="Poll until status is succeeded or failed; `result` holds the handler output.",
+        responses={200: JobSerializer}
+    )
+    def get(self, request, job_id):
+        try:
+            job = JobService.get_job(request.user, job_id)
+        except NotFoundException as e:
+            return NotFoundResponse(message=str(e))
+        return SuccessResponse(JobSerializer(job).data)
@@ -37,3 +37,6 @@ class PaymentTransaction(models.Model):
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['user', '-created_at', '-id'], name='transaction_user_recent'),
+        ]
@@ -1,6 +1,7 @@
 from rest_framework.views import APIView
 from rest_framework.permissions import IsAuthenticated
 from drf_yasg.utils import swagger_auto_schema
+from config.utils.pagination import KeysetCursorPagination, wants_cursor_pagination
 from config.utils.response_state import SuccessResponse
 
 from apps.payments.serializers.payment_transaction import PaymentTransactionSerializer
@@ -10,10 +11,17 @@ from apps.payments.models.payment_transaction import PaymentTransaction
 
 class PaymentTransactionListView(APIView):
     permission_classes = [IsAuthenticated]
+    cursor_ordering = ("-created_at", "-id")
 
     @swagger_auto_schema(responses={200: PaymentTransactionSerializer(many=True)})
     def get(self, request):
         payments = PaymentTransaction.objects.filter(user=request.user)
+
+        if wants_cursor_pagination(request):
+            paginator = KeysetCursorPagination(ordering=self.cursor_ordering)
+            page = paginator.paginate_queryset(payments, request, view=self)
+            return paginator.get_paginated_response(PaymentTransactionSerializer(page, many=True).data)
+
         serializer = PaymentTransactionSerializer(payments, many=True)
         return SuccessResponse(serializer.data)
 
@@ -19,6 +19,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
 
     # 3rd-party apps
     'rest_framework',
@@ -32,6 +33,7 @@ INSTALLED_APPS = [
     'apps.account',
     'apps.fitness',
     'apps.payments',
+    'apps.jobs',
 ]
 
 MIDDLEWARE = [
@@ -78,6 +80,16 @@ DATABASES = {
     }
 }
 
+# CACHE
+# Use a shared backend (e.g. django.core.cache.backends.redis.RedisCache) in
+# production so version stamps reach every worker process.
+CACHES = {
+    'default': {
+        'BACKEND': config('CACHE_BACKEND', default='django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': config('CACHE_LOCATION', default=''),
+    }
+}
+
 # PASSWORD VALIDATION
 AUTH_PASSWORD_VALIDATORS = [
     {'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator'},
@@ -153,6 +165,9 @@ AWS_S3_ENDPOINT_URL = os.getenv("MINIO_ENDPOINT", "http://localhost:9000")
 AWS_S3_FILE_OVERWRITE = False
 AWS_DEFAULT_ACL = None
 AWS_S3_ADDRESSING_STYLE = "path"
+AWS_QUERYSTRING_EXPIRE = int(os.getenv("MINIO_URL_EXPIRE", 3600))
+# Base URL of a public bucket / CDN; when set, media URLs are not signed
+MEDIA_PUBLIC_URL = os.getenv("MINIO_PUBLIC_URL", "")
 
 # parler settings, uncomment if using Parler for translations
 # LANGUAGES = [
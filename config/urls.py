@@ -25,6 +25,7 @@ urlpatterns = [
     path('api/v1/', include('apps.account.urls')),
     # path('api/v1/', include('workout.urls')),
     path('api/v1/', include('apps.fitness.urls')),
+    path('api/v1/', include('apps.jobs.urls')),
 
     # Swagger JSON and YAML endpoints
     re_path(r'^swagger(?P<format>\.json|\.yaml)$', schema_view.without_ui(cache_timeout=0), name='schema-json'),
@@ -0,0 +1,42 @@
+# config/utils/conditional.py
+
+import hashlib
+
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, quote_etag
+
+
+def version_etag(*parts):
+    """Strong ETag from any repr-able version parts (counts, timestamps, stamps)."""
+    return quote_etag(hashlib.sha1(repr(parts).encode()).hexdigest())
+
+
+def latest(*timestamps):
+    """Most recent of the given datetimes, ignoring None (empty aggregates)."""
+    timestamps = [timestamp for timestamp in timestamps if timestamp is not None]
+    return max(timestamps) if timestamps else None
+
+
+def not_modified(request, etag, last_modified=None):
+    """
+    A 304 response when the request's If-None-Match matches `etag`, else
+    None. Call it before building the body.
+
+    Only the ETag decides: the stamps behind Last-Modified are aggregates
+    (Max('updated_at')) that do not move when a row is deleted, so
+    If-Modified-Since alone is not trusted. Last-Modified is still sent.
+    """
+    response = get_conditional_response(request, etag=etag)
+    if response is not None:
+        with_validators(response, etag, last_modified)
+    return response
+
+
+def with_validators(response, etag=None, last_modified=None):
+    """Attach ETag / Last-Modified and make clients revalidate before reuse."""
+    if etag:
+        response['ETag'] = etag
+    if last_modified:
+        response['Last-Modified'] = http_date(last_modified.timestamp())
+    patch_cache_control(response, private=True, no_cache=True)
+    return response
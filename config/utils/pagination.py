@@ -1,4 +1,10 @@
-from rest_framework.pagination import PageNumberPagination
+import base64
+import json
+
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.utils.urls import replace_query_param
 from config.utils.response_state import SuccessResponse
 
 
@@ -21,3 +27,166 @@ class StandardResultsSetPagination(PageNumberPagination):
                 "results": data,
             }
         )
+
+
+class KeysetCursorPagination(BasePagination):
+    """
+    Keyset (cursor) pagination over an explicit ordering, e.g.
+    ("-assigned_at", "id"). The opaque cursor carries the ordering values of
+    the edge row, so every page is a range scan on the matching index:
+    no OFFSET, and no COUNT(*) unless the client passes with_count=true.
+    The last ordering field must be unique to make positions unambiguous.
+    """
+    page_size = 10
+    page_size_query_param = "page_size"
+    max_page_size = 100
+    cursor_query_param = "cursor"
+    count_query_param = "with_count"
+
+    def __init__(self, ordering):
+        self.ordering = tuple(ordering)
+
+    # ---------------------------
+    # Cursor encoding
+    # ---------------------------
+    @staticmethod
+    def _encode_value(value):
+        if value is None or isinstance(value, (bool, int, float, str)):
+            return value
+        if hasattr(value, "isoformat"):
+            return value.isoformat()  # full precision, unlike DjangoJSONEncoder
+        return str(value)
+
+    def encode_cursor(self, values, reverse=False):
+        payload = {"v": [self._encode_value(v) for v in values], "r": reverse}
+        raw = json.dumps(payload, separators=(",", ":")).encode()
+        return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+    def decode_cursor(self, encoded, model):
+        try:
+            raw = base64.urlsafe_b64decode(encoded + "=" * (-len(encoded) % 4))
+            payload = json.loads(raw)
+            values = payload["v"]
+            if len(values) != len(self.ordering):
+                raise ValueError
+            values = [
+                model._meta.get_field(name.lstrip("-")).to_python(value)
+                for name, value in zip(self.ordering, values)
+            ]
+            return values, bool(payload.get("r"))
+        except Exception:
+            raise NotFound("Invalid cursor")
+
+    # ---------------------------
+    # Keyset filtering
+    # ---------------------------
+    @staticmethod
+    def _flip(ordering):
+        return tuple(name[1:] if name.startswith("-") else f"-{name}" for name in ordering)
+
+    @staticmethod
+    def _after(model, ordering, values):
+        """
+        Rows strictly after `values` in `ordering` (lexicographic, per-field
+        direction). NULLs sit where Postgres puts them by default: last when
+        ascending, first when descending.
+        """
+        condition = Q()
+        equal = Q()
+        for name, value in zip(ordering, values):
+            field = name.lstrip("-")
+            descending = name.startswith("-")
+            if value is None:
+                # only non-NULL rows follow a NULL, and only when descending
+                after = Q(**{f"{field}__isnull": False}) if descending else None
+                same = Q(**{f"{field}__isnull": True})
+            else:
+                after = Q(**{f"{field}__{'lt' if descending else 'gt'}": value})
+                if not descending and model._meta.get_field(field).null:
+                    after |= Q(**{f"{field}__isnull": True})
+                same = Q(**{field: value})
+            if after is not None:
+                condition |= equal & after
+            equal &= same
+        # nothing can follow the position: match no rows rather than all of them
+        return condition or Q(pk__in=[])
+
+    def _position(self, row):
+        return [getattr(row, name.lstrip("-")) for name in self.ordering]
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params.get(self.page_size_query_param, self.page_size))
+        except (TypeError, ValueError):
+            return self.page_size
+        return max(1, min(size, self.max_page_size))
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        page_size = self.get_page_size(request)
+
+        self.count = None
+        if str(request.query_params.get(self.count_query_param, "")).lower() == "true":
+            self.count = queryset.count()
+
+        encoded = request.query_params.get(self.cursor_query_param)
+        cursor = self.decode_cursor(encoded, queryset.model) if encoded else None
+        reverse = bool(cursor and cursor[1])
+
+        ordering = self._flip(self.ordering) if reverse else self.ordering
+        queryset = queryset.order_by(*ordering)
+        if cursor:
+            queryset = queryset.filter(self._after(queryset.model, ordering, cursor[0]))
+
+        rows = list(queryset[:page_size + 1])
+        has_more = len(rows) > page_size
+        rows = rows[:page_size]
+
+        if reverse:
+            rows.reverse()
+            has_next, has_previous = True, has_more
+        else:
+            has_next, has_previous = has_more, cursor is not None
+
+        self.next_cursor = self.encode_cursor(self._position(rows[-1])) if has_next and rows else None
+        self.previous_cursor = self.encode_cursor(self._position(rows[0]), reverse=True) if has_previous and rows else None
+        return rows
+
+    def _link(self, cursor):
+        if cursor is None:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, cursor)
+
+    def get_next_link(self):
+        return self._link(self.next_cursor)
+
+    def get_previous_link(self):
+        return self._link(self.previous_cursor)
+
+    def get_paginated_response(self, data):
+        payload = {
+            "next": self.get_next_link(),
+            "previous": self.get_previous_link(),
+            "results": data,
+        }
+        if self.count is not None:
+            payload["count"] = self.count
+        return SuccessResponse(data=payload)
+
+
+def wants_cursor_pagination(request):
+    return (
+        KeysetCursorPagination.cursor_query_param in request.query_params
+        or request.query_params.get("pagination") == "cursor"
+    )
+
+
+def get_paginator(request, ordering):
+    """
+    Page-number pagination unless the client opts into keyset pagination
+    with ?pagination=cursor (or by following a cursor link).
+    """
+    if wants_cursor_pagination(request):
+        return KeysetCursorPagination(ordering)
+    return StandardResultsSetPagination()
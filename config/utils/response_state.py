@@ -1,3 +1,5 @@
+from django.http import HttpResponse
+from rest_framework.renderers import JSONRenderer
 from rest_framework.response import Response
 from rest_framework import status
 
@@ -11,6 +13,22 @@ class SuccessResponse(Response):
         super().__init__(response_data, status=status, **kwargs)
 
 
+class EncodedSuccessResponse(HttpResponse):
+    """
+    SuccessResponse body for a `data` object that is already encoded JSON
+    (e.g. a cached snapshot): the bytes are spliced in, not re-rendered.
+    `extra` keys are appended to that object.
+    """
+    def __init__(self, encoded_data, message="success", status=status.HTTP_200_OK, extra=None, **kwargs):
+        renderer = JSONRenderer()
+        if extra:
+            encoded_data = encoded_data[:-1] + b',' + renderer.render(extra)[1:]
+        body = b''.join([
+            b'{"message":', renderer.render(message), b',"data":', encoded_data, b'}'
+        ])
+        super().__init__(body, status=status, content_type='application/json', **kwargs)
+
+
 class SuccessResponse201(SuccessResponse):
     def __init__(self, data=None, message="success", status=status.HTTP_201_CREATED, **kwargs):
         super().__init__(data=data, message=message, status=status, **kwargs)
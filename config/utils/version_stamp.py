@@ -0,0 +1,31 @@
+# config/utils/version_stamp.py
+
+import time
+
+from django.core.cache import cache
+
+
+class VersionStamp:
+    """
+    Monotonic version number shared through the cache.
+    In-process caches compare it with the version they were built from
+    and reload when it moved; writers bump it on save/delete.
+    """
+
+    def __init__(self, name):
+        self.key = f"version-stamp:{name}"
+
+    def get(self):
+        version = cache.get(self.key)
+        if version is None:
+            # Seed from the clock so an evicted stamp never goes backwards
+            cache.add(self.key, time.time_ns(), timeout=None)
+            version = cache.get(self.key)
+        return version
+
+    def bump(self):
+        try:
+            return cache.incr(self.key)
+        except ValueError:
+            cache.add(self.key, time.time_ns(), timeout=None)
+            return cache.get(self.key)